@@ -0,0 +1,249 @@
+use std::collections::HashMap;
+use std::sync::{Arc, OnceLock};
+
+use pyo3::prelude::*;
+use pyo3::types::{PyList, PySlice};
+
+use crate::buffer::ArrayBuffer;
+use crate::solver::AnswerPossibility;
+
+// ---------------------------------------------------------------------------
+// Shared ranking storage
+// ---------------------------------------------------------------------------
+
+/// A ranked answer list shared between a `Puzzle` and the views handed out
+/// to Python.  Views hold an `Arc` to this, so reading `puzzle.all_answers`
+/// never copies the ranking.
+#[derive(Debug)]
+pub struct Ranking {
+    pub answers: Vec<AnswerPossibility>,
+    /// Whether every candidate was scored, rather than stopping at a deadline.
+    pub exact: bool,
+    index: OnceLock<HashMap<String, usize>>,
+}
+
+impl Ranking {
+    pub fn new(answers: Vec<AnswerPossibility>) -> Self {
+        Self::with_exact(answers, true)
+    }
+
+    pub fn with_exact(answers: Vec<AnswerPossibility>, exact: bool) -> Self {
+        Ranking {
+            answers,
+            exact,
+            index: OnceLock::new(),
+        }
+    }
+
+    /// Position of `word` in the ranking.  The lookup table is built on first use.
+    pub fn position(&self, word: &str) -> Option<usize> {
+        self.index
+            .get_or_init(|| {
+                self.answers
+                    .iter()
+                    .enumerate()
+                    .map(|(i, ap)| (ap.word.clone(), i))
+                    .collect()
+            })
+            .get(word)
+            .copied()
+    }
+
+    pub fn get(&self, word: &str) -> Option<&AnswerPossibility> {
+        self.position(word).map(|i| &self.answers[i])
+    }
+}
+
+impl Default for Ranking {
+    /// An empty ranking, as before the first computation.
+    fn default() -> Self {
+        Ranking::new(vec![])
+    }
+}
+
+/// Resolve a Python-style (possibly negative) index against `len`.
+fn resolve_index(index: isize, len: usize) -> PyResult<usize> {
+    let resolved = if index < 0 {
+        index + len as isize
+    } else {
+        index
+    };
+    if resolved < 0 || resolved as usize >= len {
+        return Err(pyo3::exceptions::PyIndexError::new_err(
+            "answer index out of range",
+        ));
+    }
+    Ok(resolved as usize)
+}
+
+// ---------------------------------------------------------------------------
+// AnswerList
+// ---------------------------------------------------------------------------
+
+/// Read-only sequence view over a puzzle's ranked answers.
+///
+/// Supports `len()`, indexing, slicing and iteration.  Each
+/// `AnswerPossibility` is converted to a Python object only when accessed.
+#[pyclass(frozen, sequence)]
+pub struct AnswerList {
+    ranking: Arc<Ranking>,
+}
+
+impl AnswerList {
+    pub fn new(ranking: Arc<Ranking>) -> Self {
+        AnswerList { ranking }
+    }
+}
+
+#[pymethods]
+impl AnswerList {
+    fn __len__(&self) -> usize {
+        self.ranking.answers.len()
+    }
+
+    fn __getitem__(&self, py: Python<'_>, index: &Bound<'_, PyAny>) -> PyResult<PyObject> {
+        let answers = &self.ranking.answers;
+        if let Ok(slice) = index.downcast::<PySlice>() {
+            let indices = slice.indices(answers.len().try_into()?)?;
+            let mut position = indices.start;
+            let mut items = Vec::with_capacity(indices.slicelength as usize);
+            for _ in 0..indices.slicelength {
+                items.push(answers[position as usize].clone().into_py(py));
+                position += indices.step;
+            }
+            return Ok(PyList::new_bound(py, items).into_any().unbind());
+        }
+        let position = resolve_index(index.extract::<isize>()?, answers.len())?;
+        Ok(answers[position].clone().into_py(py))
+    }
+
+    fn __iter__(&self) -> AnswerListIterator {
+        AnswerListIterator {
+            ranking: Arc::clone(&self.ranking),
+            position: 0,
+        }
+    }
+
+    /// The top-ranked word, or `None` when the list is empty.
+    #[getter]
+    fn best_word(&self) -> Option<String> {
+        self.ranking.answers.first().map(|ap| ap.word.clone())
+    }
+
+    /// `False` when ranking stopped at a time budget before every candidate
+    /// was scored.
+    #[getter]
+    fn exact(&self) -> bool {
+        self.ranking.exact
+    }
+
+    /// Every ranked word, best first, without converting the groups.
+    fn words(&self) -> Vec<String> {
+        self.ranking
+            .answers
+            .iter()
+            .map(|ap| ap.word.clone())
+            .collect()
+    }
+
+    /// Number of groups for each ranked word, as a `uint32` buffer.
+    fn group_counts(&self) -> ArrayBuffer {
+        ArrayBuffer::from_u32(
+            self.ranking
+                .answers
+                .iter()
+                .map(|ap| ap.group_count() as u32)
+                .collect(),
+        )
+    }
+
+    /// Largest group size for each ranked word (-1 with no groups), as an
+    /// `int64` buffer.
+    fn max_group_sizes(&self) -> ArrayBuffer {
+        ArrayBuffer::from_i64(
+            self.ranking
+                .answers
+                .iter()
+                .map(|ap| ap.max_group_size())
+                .collect(),
+        )
+    }
+
+    fn __repr__(&self) -> String {
+        format!("AnswerList({} answers)", self.ranking.answers.len())
+    }
+}
+
+#[pyclass]
+pub struct AnswerListIterator {
+    ranking: Arc<Ranking>,
+    position: usize,
+}
+
+#[pymethods]
+impl AnswerListIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    fn __next__(&mut self) -> Option<AnswerPossibility> {
+        let ap = self.ranking.answers.get(self.position)?.clone();
+        self.position += 1;
+        Some(ap)
+    }
+}
+
+// ---------------------------------------------------------------------------
+// AnswerMap
+// ---------------------------------------------------------------------------
+
+/// Read-only mapping view from word to `AnswerPossibility`, returned by
+/// `Puzzle.all_answers_dict()`.  Entries are converted only when looked up.
+#[pyclass(frozen, mapping)]
+pub struct AnswerMap {
+    ranking: Arc<Ranking>,
+}
+
+impl AnswerMap {
+    pub fn new(ranking: Arc<Ranking>) -> Self {
+        AnswerMap { ranking }
+    }
+}
+
+#[pymethods]
+impl AnswerMap {
+    fn __len__(&self) -> usize {
+        self.ranking.answers.len()
+    }
+
+    fn __getitem__(&self, word: &str) -> PyResult<AnswerPossibility> {
+        self.ranking
+            .get(word)
+            .cloned()
+            .ok_or_else(|| pyo3::exceptions::PyKeyError::new_err(word.to_owned()))
+    }
+
+    fn __contains__(&self, word: &str) -> bool {
+        self.ranking.position(word).is_some()
+    }
+
+    fn __iter__<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyAny>> {
+        PyList::new_bound(py, self.keys()).call_method0("__iter__")
+    }
+
+    #[pyo3(signature = (word, default=None))]
+    fn get(&self, py: Python<'_>, word: &str, default: Option<PyObject>) -> PyObject {
+        match self.ranking.get(word) {
+            Some(ap) => ap.clone().into_py(py),
+            None => default.unwrap_or_else(|| py.None()),
+        }
+    }
+
+    fn keys(&self) -> Vec<String> {
+        self.ranking
+            .answers
+            .iter()
+            .map(|ap| ap.word.clone())
+            .collect()
+    }
+}
@@ -0,0 +1,176 @@
+use std::ops::Range;
+use std::os::raw::{c_char, c_int, c_void};
+use std::sync::Arc;
+
+use pyo3::exceptions::PyBufferError;
+use pyo3::ffi;
+use pyo3::prelude::*;
+
+use crate::table::PatternTable;
+
+/// Memory behind an [`ArrayBuffer`].
+enum Storage {
+    /// A slice of the shared pattern table; the table stays alive as long
+    /// as any view of it does.
+    Patterns(Arc<PatternTable>, Range<usize>),
+    U16(Vec<u16>),
+    U32(Vec<u32>),
+    I64(Vec<i64>),
+    F64(Vec<f64>),
+}
+
+impl Storage {
+    /// Pointer to the first item, struct-module format code and item size.
+    fn raw_parts(&self) -> (*const c_void, &'static [u8], usize) {
+        match self {
+            Storage::Patterns(table, range) => {
+                (table.patterns()[range.clone()].as_ptr().cast(), b"B\0", 1)
+            }
+            Storage::U16(values) => (values.as_ptr().cast(), b"H\0", 2),
+            Storage::U32(values) => (values.as_ptr().cast(), b"I\0", 4),
+            Storage::I64(values) => (values.as_ptr().cast(), b"q\0", 8),
+            Storage::F64(values) => (values.as_ptr().cast(), b"d\0", 8),
+        }
+    }
+}
+
+/// Read-only, C-contiguous array exported through the buffer protocol.
+///
+/// Wrap it with `memoryview(...)` or `numpy.asarray(...)` to read the values
+/// without copying them out of Rust.
+#[pyclass(frozen)]
+pub struct ArrayBuffer {
+    storage: Storage,
+    ndim: c_int,
+    shape: [ffi::Py_ssize_t; 2],
+    strides: [ffi::Py_ssize_t; 2],
+}
+
+impl ArrayBuffer {
+    fn new(storage: Storage, shape: &[usize]) -> Self {
+        let itemsize = storage.raw_parts().2;
+        let mut dims = [0; 2];
+        let mut strides = [0; 2];
+        let mut stride = itemsize;
+        for (axis, &len) in shape.iter().enumerate().rev() {
+            dims[axis] = len as ffi::Py_ssize_t;
+            strides[axis] = stride as ffi::Py_ssize_t;
+            stride *= len;
+        }
+        ArrayBuffer {
+            storage,
+            ndim: shape.len() as c_int,
+            shape: dims,
+            strides,
+        }
+    }
+
+    /// One-dimensional `uint8` view of `range` in `table`.
+    pub fn pattern_row(table: Arc<PatternTable>, range: Range<usize>) -> Self {
+        let len = range.len();
+        Self::new(Storage::Patterns(table, range), &[len])
+    }
+
+    /// Two-dimensional `uint8` view of the whole table, one row per word id.
+    pub fn pattern_table(table: Arc<PatternTable>, rows: usize) -> Self {
+        let cols = table.num_answers();
+        Self::new(Storage::Patterns(table, 0..rows * cols), &[rows, cols])
+    }
+
+    /// Two-dimensional `uint16` array of `rows` rows stored row by row.
+    pub fn from_u16_rows(values: Vec<u16>, rows: usize) -> Self {
+        let cols = if rows == 0 { 0 } else { values.len() / rows };
+        Self::new(Storage::U16(values), &[rows, cols])
+    }
+
+    pub fn from_u16(values: Vec<u16>) -> Self {
+        let len = values.len();
+        Self::new(Storage::U16(values), &[len])
+    }
+
+    pub fn from_u32(values: Vec<u32>) -> Self {
+        let len = values.len();
+        Self::new(Storage::U32(values), &[len])
+    }
+
+    pub fn from_i64(values: Vec<i64>) -> Self {
+        let len = values.len();
+        Self::new(Storage::I64(values), &[len])
+    }
+
+    pub fn from_f64(values: Vec<f64>) -> Self {
+        let len = values.len();
+        Self::new(Storage::F64(values), &[len])
+    }
+}
+
+#[pymethods]
+impl ArrayBuffer {
+    unsafe fn __getbuffer__(
+        slf: Bound<'_, Self>,
+        view: *mut ffi::Py_buffer,
+        flags: c_int,
+    ) -> PyResult<()> {
+        if view.is_null() {
+            return Err(PyBufferError::new_err("view is null"));
+        }
+        if flags & ffi::PyBUF_WRITABLE == ffi::PyBUF_WRITABLE {
+            return Err(PyBufferError::new_err("ArrayBuffer is read-only"));
+        }
+        let this = slf.get();
+        if this.ndim > 1 && flags & ffi::PyBUF_F_CONTIGUOUS == ffi::PyBUF_F_CONTIGUOUS {
+            return Err(PyBufferError::new_err("ArrayBuffer is C-contiguous"));
+        }
+        let (buf, format, itemsize) = this.storage.raw_parts();
+        let len: ffi::Py_ssize_t = this.shape[..this.ndim as usize].iter().product();
+
+        (*view).buf = buf as *mut c_void;
+        (*view).len = len * itemsize as ffi::Py_ssize_t;
+        (*view).itemsize = itemsize as ffi::Py_ssize_t;
+        (*view).readonly = 1;
+        (*view).ndim = this.ndim;
+        (*view).format = if flags & ffi::PyBUF_FORMAT == ffi::PyBUF_FORMAT {
+            format.as_ptr() as *mut c_char
+        } else {
+            std::ptr::null_mut()
+        };
+        (*view).shape = if flags & ffi::PyBUF_ND == ffi::PyBUF_ND {
+            this.shape.as_ptr() as *mut ffi::Py_ssize_t
+        } else {
+            std::ptr::null_mut()
+        };
+        (*view).strides = if flags & ffi::PyBUF_STRIDES == ffi::PyBUF_STRIDES {
+            this.strides.as_ptr() as *mut ffi::Py_ssize_t
+        } else {
+            std::ptr::null_mut()
+        };
+        (*view).suboffsets = std::ptr::null_mut();
+        (*view).internal = std::ptr::null_mut();
+        // The view keeps this object, and so the storage, alive.
+        (*view).obj = slf.into_any().into_ptr();
+        Ok(())
+    }
+
+    unsafe fn __releasebuffer__(&self, _view: *mut ffi::Py_buffer) {}
+
+    fn __len__(&self) -> usize {
+        self.shape[0] as usize
+    }
+
+    #[getter]
+    fn shape(&self) -> Vec<usize> {
+        self.shape[..self.ndim as usize]
+            .iter()
+            .map(|&n| n as usize)
+            .collect()
+    }
+
+    fn __repr__(&self) -> String {
+        let (_, format, _) = self.storage.raw_parts();
+        format!(
+            "ArrayBuffer(format='{}', shape={:?})",
+            format[0] as char,
+            self.shape()
+        )
+    }
+}
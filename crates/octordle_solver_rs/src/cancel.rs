@@ -0,0 +1,65 @@
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::Arc;
+
+use pyo3::prelude::*;
+
+pyo3::create_exception!(
+    octordle_solver_rs,
+    Cancelled,
+    pyo3::exceptions::PyException,
+    "Raised when a computation is stopped through its `CancelToken`."
+);
+
+/// Cooperative cancellation flag checked by long computations while they run
+/// without the GIL.
+///
+/// Has the `set`/`clear`/`is_set` methods of `threading.Event`, so it can be
+/// used wherever the UI expects one.  Clones share the same flag.
+#[pyclass]
+#[derive(Clone, Debug, Default)]
+pub struct CancelToken {
+    flag: Arc<AtomicBool>,
+}
+
+impl CancelToken {
+    /// The shared flag, for checking from worker threads.
+    pub fn flag(&self) -> Arc<AtomicBool> {
+        Arc::clone(&self.flag)
+    }
+}
+
+#[pymethods]
+impl CancelToken {
+    #[new]
+    fn py_new() -> Self {
+        Self::default()
+    }
+
+    /// Ask every computation holding this token to stop.
+    fn set(&self) {
+        self.flag.store(true, Ordering::Relaxed);
+    }
+
+    /// Reset the token so it can be passed to new computations.
+    fn clear(&self) {
+        self.flag.store(false, Ordering::Relaxed);
+    }
+
+    fn is_set(&self) -> bool {
+        self.flag.load(Ordering::Relaxed)
+    }
+
+    fn __repr__(&self) -> String {
+        format!("CancelToken(is_set={})", self.is_set())
+    }
+}
+
+/// Whether `cancel` has been set; `None` is never cancelled.
+pub fn is_cancelled(cancel: Option<&AtomicBool>) -> bool {
+    cancel.map_or(false, |flag| flag.load(Ordering::Relaxed))
+}
+
+/// The error raised for a cancelled computation.
+pub fn cancelled() -> PyErr {
+    Cancelled::new_err("computation cancelled")
+}
@@ -0,0 +1,264 @@
+use std::collections::HashMap;
+use std::sync::{Arc, OnceLock};
+
+use pyo3::prelude::*;
+
+use crate::buffer::ArrayBuffer;
+use crate::letters::LetterIndex;
+use crate::pattern::{group_stats, pack_word, score_pattern, PackedWord, Pattern};
+use crate::solver::str_to_word;
+use crate::table::{shared_table, PatternTable};
+use crate::wordset::WordSet;
+
+/// Compact identifier for a word in a [`DictionaryData`].
+pub type WordId = u16;
+
+// ---------------------------------------------------------------------------
+// Shared word storage
+// ---------------------------------------------------------------------------
+
+/// Immutable word lists shared by every puzzle created from the same
+/// [`Dictionary`].
+///
+/// Every distinct word gets a `u16` id.  Valid answers are numbered first,
+/// so ids `0..num_answers` are exactly the answer list in its original order;
+/// guesses that are not answers follow.
+#[derive(Debug)]
+pub struct DictionaryData {
+    /// Pre-encoded uppercase bytes, indexed by id.
+    pub words: Vec<[u8; 5]>,
+    /// The same words packed for the batched scoring kernel, indexed by id.
+    pub packed: Vec<PackedWord>,
+    /// Uppercase strings, indexed by id.  Only used when exporting to Python.
+    pub strings: Vec<String>,
+    /// Ids of `valid_guesses`, in their original order.
+    pub guesses: Vec<WordId>,
+    pub num_answers: usize,
+    index: HashMap<[u8; 5], WordId>,
+    /// Process-wide pattern table for these word lists, fetched on first use.
+    table: OnceLock<Arc<PatternTable>>,
+    /// Letter bitsets for hard mode, built on first use.
+    letters: OnceLock<LetterIndex>,
+}
+
+impl DictionaryData {
+    pub fn new(valid_answers: &[String], valid_guesses: &[String]) -> PyResult<Self> {
+        let mut data = DictionaryData {
+            words: Vec::with_capacity(valid_answers.len() + valid_guesses.len()),
+            packed: Vec::with_capacity(valid_answers.len() + valid_guesses.len()),
+            strings: Vec::with_capacity(valid_answers.len() + valid_guesses.len()),
+            guesses: Vec::with_capacity(valid_guesses.len()),
+            num_answers: 0,
+            index: HashMap::with_capacity(valid_answers.len() + valid_guesses.len()),
+            table: OnceLock::new(),
+            letters: OnceLock::new(),
+        };
+        for word in valid_answers {
+            data.intern(word)?;
+        }
+        data.num_answers = data.words.len();
+
+        let mut seen = WordSet::new(u16::MAX as usize + 1);
+        for word in valid_guesses {
+            let id = data.intern(word)?;
+            if seen.insert(id) {
+                data.guesses.push(id);
+            }
+        }
+        Ok(data)
+    }
+
+    fn intern(&mut self, word: &str) -> PyResult<WordId> {
+        let w = str_to_word(word)?;
+        if let Some(&id) = self.index.get(&w) {
+            return Ok(id);
+        }
+        let id = WordId::try_from(self.words.len()).map_err(|_| {
+            pyo3::exceptions::PyValueError::new_err(format!(
+                "dictionary cannot hold more than {} words",
+                WordId::MAX
+            ))
+        })?;
+        self.words.push(w);
+        self.packed.push(pack_word(&w));
+        self.strings
+            .push(String::from_utf8(w.to_vec()).expect("word bytes are always valid UTF-8"));
+        self.index.insert(w, id);
+        Ok(id)
+    }
+
+    pub fn len(&self) -> usize {
+        self.words.len()
+    }
+
+    /// Look up the id of `word`, if it is in the dictionary.
+    pub fn id_of(&self, word: &str) -> Option<WordId> {
+        let w = str_to_word(word).ok()?;
+        self.index.get(&w).copied()
+    }
+
+    /// Like [`DictionaryData::id_of`], but raises `ValueError` for unknown words.
+    pub fn require_id(&self, word: &str) -> PyResult<WordId> {
+        self.id_of(word).ok_or_else(|| {
+            pyo3::exceptions::PyValueError::new_err(format!("'{word}' is not in the dictionary"))
+        })
+    }
+
+    /// A fresh set containing the id of every valid guess.
+    pub fn guess_set(&self) -> WordSet {
+        let mut set = WordSet::new(self.len());
+        for &id in &self.guesses {
+            set.insert(id);
+        }
+        set
+    }
+
+    /// Letter bitsets over every word, for filtering hard-mode guesses.
+    pub fn letter_index(&self) -> &LetterIndex {
+        self.letters.get_or_init(|| LetterIndex::build(&self.words))
+    }
+
+    /// A fresh set containing every valid answer.
+    pub fn answer_set(&self) -> WordSet {
+        WordSet::with_prefix(self.len(), self.num_answers)
+    }
+
+    /// The guess × answer pattern table for this dictionary.  The first call
+    /// in the process builds it; later calls, from any dictionary with the
+    /// same word lists, reuse it.
+    pub fn pattern_table(&self) -> &PatternTable {
+        self.shared_pattern_table()
+    }
+
+    /// Like [`DictionaryData::pattern_table`], but returns the shared handle.
+    pub fn shared_pattern_table(&self) -> &Arc<PatternTable> {
+        self.table.get_or_init(|| shared_table(self))
+    }
+
+    /// Pattern `guess` produces against `answer`.  Answer ids come from the
+    /// table; other words (only reachable by assigning `remaining_words`)
+    /// are scored directly.
+    pub fn pattern(&self, guess: WordId, answer: WordId) -> Pattern {
+        if (answer as usize) < self.num_answers {
+            self.pattern_table().row(guess)[answer as usize]
+        } else {
+            score_pattern(&self.words[guess as usize], &self.words[answer as usize])
+        }
+    }
+
+    /// `(group count, largest group)` for `guess` over `remaining`, counted
+    /// from the pattern table without building the groups.
+    pub fn group_stats(&self, guess: WordId, remaining: &[WordId]) -> (usize, usize) {
+        let row = self.pattern_table().row(guess);
+        group_stats(remaining.iter().map(|&id| match row.get(id as usize) {
+            Some(&pattern) => pattern,
+            None => score_pattern(&self.words[guess as usize], &self.words[id as usize]),
+        }))
+    }
+
+    pub fn strings_for(&self, ids: impl IntoIterator<Item = WordId>) -> Vec<String> {
+        ids.into_iter()
+            .map(|id| self.strings[id as usize].clone())
+            .collect()
+    }
+}
+
+// ---------------------------------------------------------------------------
+// PyO3 wrapper
+// ---------------------------------------------------------------------------
+
+/// Reference-counted handle to an immutable word dictionary.
+///
+/// Build one per process and pass it to `Puzzle.from_dictionary` so every
+/// puzzle shares the same word storage instead of copying the word lists.
+#[pyclass(frozen)]
+#[derive(Clone)]
+pub struct Dictionary {
+    pub inner: Arc<DictionaryData>,
+}
+
+#[pymethods]
+impl Dictionary {
+    #[new]
+    fn new(valid_answers: Vec<String>, valid_guesses: Vec<String>) -> PyResult<Self> {
+        Ok(Dictionary {
+            inner: Arc::new(DictionaryData::new(&valid_answers, &valid_guesses)?),
+        })
+    }
+
+    #[getter]
+    fn valid_answers(&self) -> Vec<String> {
+        self.inner.strings[..self.inner.num_answers].to_vec()
+    }
+
+    #[getter]
+    fn valid_guesses(&self) -> Vec<String> {
+        self.inner.strings_for(self.inner.guesses.iter().copied())
+    }
+
+    /// Every word in id order: the valid answers, then the other guesses.
+    /// This is the row order of `pattern_table()`.
+    #[getter]
+    fn words(&self) -> Vec<String> {
+        self.inner.strings.clone()
+    }
+
+    /// Pattern codes `word` produces against each valid answer, in
+    /// `valid_answers` order, as a `uint8` buffer sharing the pattern table.
+    ///
+    /// Codes are base 3 with the first letter most significant, using
+    /// 0 = correct, 1 = misplaced, 2 = incorrect.
+    fn pattern_row(&self, py: Python<'_>, word: &str) -> PyResult<ArrayBuffer> {
+        let id = self.inner.require_id(word)?;
+        let table = py.allow_threads(|| Arc::clone(self.inner.shared_pattern_table()));
+        let range = table.row_range(id);
+        Ok(ArrayBuffer::pattern_row(table, range))
+    }
+
+    /// The whole pattern table as a `len(words) x len(valid_answers)`
+    /// `uint8` buffer.  Rows follow `words`; no data is copied.
+    fn pattern_table(&self, py: Python<'_>) -> ArrayBuffer {
+        let table = py.allow_threads(|| Arc::clone(self.inner.shared_pattern_table()));
+        ArrayBuffer::pattern_table(table, self.inner.len())
+    }
+
+    /// Id of `word`: its index in `words`.  Ids match the Python
+    /// `Vocabulary` built from the same word lists.
+    fn id_of(&self, word: &str) -> PyResult<WordId> {
+        self.inner.require_id(word)
+    }
+
+    /// The word with id `word_id`.
+    fn word(&self, word_id: usize) -> PyResult<String> {
+        self.inner
+            .strings
+            .get(word_id)
+            .cloned()
+            .ok_or_else(|| pyo3::exceptions::PyIndexError::new_err("word id out of range"))
+    }
+
+    /// Ids of `words` as a `uint16` buffer.
+    fn ids(&self, words: Vec<String>) -> PyResult<ArrayBuffer> {
+        let ids = words
+            .iter()
+            .map(|word| self.inner.require_id(word))
+            .collect::<PyResult<Vec<_>>>()?;
+        Ok(ArrayBuffer::from_u16(ids))
+    }
+
+    fn __len__(&self) -> usize {
+        self.inner.len()
+    }
+
+    fn __contains__(&self, word: &str) -> bool {
+        self.inner.id_of(word).is_some()
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "Dictionary({} answers, {} guesses)",
+            self.inner.num_answers,
+            self.inner.guesses.len()
+        )
+    }
+}
@@ -0,0 +1,135 @@
+use crate::dictionary::WordId;
+use crate::wordset::WordSet;
+
+const ALPHABET: usize = 26;
+const WORD_LENGTH: usize = 5;
+
+/// Per-position and per-count letter bitsets over every word in a
+/// dictionary, used to keep hard-mode guesses legal.
+///
+/// Applying a guess's hints is a handful of bitset intersections instead of
+/// a pass over every word.
+#[derive(Debug)]
+pub struct LetterIndex {
+    capacity: usize,
+    /// `at[position * 26 + letter]`: words with `letter` at `position`.
+    at: Vec<WordSet>,
+    /// `at_least[letter * 5 + n - 1]`: words containing `letter` at least
+    /// `n` times.
+    at_least: Vec<WordSet>,
+}
+
+fn letter_index(letter: u8) -> Option<usize> {
+    letter
+        .is_ascii_uppercase()
+        .then(|| (letter - b'A') as usize)
+}
+
+impl LetterIndex {
+    /// Index `words`, where word id `i` is `words[i]`.
+    pub fn build(words: &[[u8; 5]]) -> Self {
+        let capacity = words.len();
+        let mut at = vec![WordSet::new(capacity); WORD_LENGTH * ALPHABET];
+        let mut at_least = vec![WordSet::new(capacity); ALPHABET * WORD_LENGTH];
+        for (id, word) in words.iter().enumerate() {
+            let id = id as WordId;
+            let mut counts = [0usize; ALPHABET];
+            for (position, &letter) in word.iter().enumerate() {
+                if let Some(letter) = letter_index(letter) {
+                    at[position * ALPHABET + letter].insert(id);
+                    counts[letter] += 1;
+                    at_least[letter * WORD_LENGTH + counts[letter] - 1].insert(id);
+                }
+            }
+        }
+        LetterIndex {
+            capacity,
+            at,
+            at_least,
+        }
+    }
+
+    /// Remove from `allowed` every word that does not reuse the hints
+    /// revealed by `guess` with `feedback` (`b"YMN.."`): each green letter
+    /// in place, and each green or yellow letter at least as many times as
+    /// it was revealed.
+    pub fn restrict(&self, allowed: &mut WordSet, guess: &[u8; 5], feedback: &[u8]) {
+        let mut revealed = [0usize; ALPHABET];
+        for (position, (&letter, &result)) in guess.iter().zip(feedback).enumerate() {
+            let Some(letter) = letter_index(letter) else {
+                if result == b'Y' || result == b'M' {
+                    // A revealed letter no dictionary word can contain
+                    *allowed = WordSet::new(self.capacity);
+                    return;
+                }
+                continue;
+            };
+            if result == b'Y' {
+                allowed.intersect_with(&self.at[position * ALPHABET + letter]);
+            }
+            if result == b'Y' || result == b'M' {
+                revealed[letter] += 1;
+            }
+        }
+        for (letter, &count) in revealed.iter().enumerate() {
+            if count > 0 {
+                allowed.intersect_with(&self.at_least[letter * WORD_LENGTH + count - 1]);
+            }
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn word(s: &str) -> [u8; 5] {
+        s.as_bytes().try_into().unwrap()
+    }
+
+    fn legal(candidate: &[u8; 5], guess: &[u8; 5], feedback: &[u8]) -> bool {
+        let mut revealed = [0usize; ALPHABET];
+        for i in 0..5 {
+            if feedback[i] == b'Y' && candidate[i] != guess[i] {
+                return false;
+            }
+            if feedback[i] != b'N' {
+                revealed[(guess[i] - b'A') as usize] += 1;
+            }
+        }
+        (0..ALPHABET).all(|l| {
+            candidate
+                .iter()
+                .filter(|&&c| (c - b'A') as usize == l)
+                .count()
+                >= revealed[l]
+        })
+    }
+
+    #[test]
+    fn restrict_matches_rule() {
+        let words: Vec<[u8; 5]> = [
+            "SLATE", "CRANE", "TRACE", "EERIE", "CREEP", "ABBEY", "STEEL", "LEAST",
+        ]
+        .iter()
+        .map(|w| word(w))
+        .collect();
+        let index = LetterIndex::build(&words);
+        for (guess, feedback) in [
+            ("SLATE", "NNYMY"),
+            ("EERIE", "MNNNY"),
+            ("CREEP", "YYMYN"),
+            ("STEEL", "NMMNN"),
+            ("XXXXX", "NNNNN"),
+        ] {
+            let guess = word(guess);
+            let mut allowed = WordSet::with_prefix(words.len(), words.len());
+            index.restrict(&mut allowed, &guess, feedback.as_bytes());
+            let expected: Vec<WordId> = (0..words.len() as WordId)
+                .filter(|&id| legal(&words[id as usize], &guess, feedback.as_bytes()))
+                .collect();
+            assert_eq!(allowed.to_vec(), expected);
+            assert_eq!(allowed.len(), expected.len());
+        }
+    }
+}
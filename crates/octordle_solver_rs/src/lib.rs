@@ -1,6 +1,16 @@
 use pyo3::prelude::*;
 
+pub mod answers;
+pub mod buffer;
+pub mod cancel;
+pub mod dictionary;
+pub mod letters;
+pub mod pattern;
+pub mod progress;
+pub mod simulate;
 pub mod solver;
+pub mod table;
+pub mod wordset;
 
 /// Top-level module exported to Python as `octordle_solver_rs`.
 #[pymodule]
@@ -10,9 +20,17 @@ fn octordle_solver_rs(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(solver::calculate_fitness_score, m)?)?;
     m.add_function(wrap_pyfunction!(solver::get_all_answers, m)?)?;
     m.add_function(wrap_pyfunction!(solver::get_best_guess_multiple_puzzles, m)?)?;
+    m.add_function(wrap_pyfunction!(simulate::simulate_games, m)?)?;
     m.add_class::<solver::Group>()?;
     m.add_class::<solver::AnswerPossibility>()?;
     m.add_class::<solver::Guess>()?;
     m.add_class::<solver::Puzzle>()?;
+    m.add_class::<dictionary::Dictionary>()?;
+    m.add_class::<answers::AnswerList>()?;
+    m.add_class::<answers::AnswerMap>()?;
+    m.add_class::<buffer::ArrayBuffer>()?;
+    m.add_class::<simulate::SimulationResult>()?;
+    m.add_class::<cancel::CancelToken>()?;
+    m.add("Cancelled", m.py().get_type_bound::<cancel::Cancelled>())?;
     Ok(())
 }
@@ -0,0 +1,314 @@
+use crate::dictionary::WordId;
+
+/// Number of distinct feedback patterns for a 5-letter word (3^5).
+pub const NUM_PATTERNS: usize = 243;
+
+/// Feedback pattern encoded as a base-3 number, first letter most significant.
+/// Digits match `PossibilityState`: 0 = correct (Y), 1 = misplaced (M),
+/// 2 = incorrect (N).  "YYYYY" is therefore 0 and "NNNNN" is 242.
+pub type Pattern = u8;
+
+/// Pattern code for "YYYYY".
+pub const ALL_CORRECT: Pattern = 0;
+
+const FEEDBACK_BYTES: [u8; 3] = [b'Y', b'M', b'N'];
+
+/// Score `guess` against `answer` and return the feedback as a pattern code.
+///
+/// This is the reference algorithm; bulk scoring goes through
+/// [`PackedGuess`], which gives identical results.  Handles duplicate
+/// letters the same way Wordle does: exact matches are consumed first, then
+/// remaining answer letters are matched left-to-right for the misplaced
+/// check.
+pub fn score_pattern(guess: &[u8; 5], answer: &[u8; 5]) -> Pattern {
+    let mut digits = [2u8; 5];
+    // Count of each answer letter not consumed by an exact match.
+    let mut remaining = [0u8; 26];
+
+    for i in 0..5 {
+        if guess[i] == answer[i] {
+            digits[i] = 0;
+        } else {
+            remaining[(answer[i] - b'A') as usize] += 1;
+        }
+    }
+
+    for i in 0..5 {
+        if digits[i] == 0 {
+            continue;
+        }
+        let idx = (guess[i] - b'A') as usize;
+        if remaining[idx] > 0 {
+            digits[i] = 1;
+            remaining[idx] -= 1;
+        }
+    }
+
+    digits.iter().fold(0, |code, &d| code * 3 + d)
+}
+
+// ---------------------------------------------------------------------------
+// Batched kernel
+// ---------------------------------------------------------------------------
+
+/// A word packed as five 5-bit letter indices (`A` = 0), first letter in
+/// the lowest bits.
+pub type PackedWord = u32;
+
+/// `1` in the low bit of each of the five letter fields.
+const FIELD_ONES: u32 = 0x0010_8421;
+/// Low four bits of each letter field.
+const FIELD_LOW: u32 = FIELD_ONES * 0b01111;
+/// High bit of each letter field.
+const FIELD_HIGH: u32 = FIELD_ONES * 0b10000;
+/// Place value of each position in a pattern code.
+const PLACE: [Pattern; 5] = [81, 27, 9, 3, 1];
+
+/// Pack an uppercase word into a [`PackedWord`].
+pub fn pack_word(word: &[u8; 5]) -> PackedWord {
+    word.iter()
+        .rev()
+        .fold(0, |packed, &b| (packed << 5) | (b - b'A') as u32)
+}
+
+/// High bit set in every letter field of `x` that is zero.
+#[inline(always)]
+fn zero_fields(x: u32) -> u32 {
+    !(((x & FIELD_LOW) + FIELD_LOW) | x) & FIELD_HIGH
+}
+
+/// Number of field high bits set in `mask`.  A multiply sums the five
+/// fields into the top one, which vectorises without a popcount instruction.
+#[inline(always)]
+fn count_fields(mask: u32) -> u32 {
+    ((mask >> 4).wrapping_mul(FIELD_ONES) >> 20) & 0b11111
+}
+
+/// A guess prepared for scoring against many packed answers.
+///
+/// All the per-guess work (broadcasting each letter and finding earlier
+/// repeats of it) happens once here, so scoring an answer is a handful of
+/// branch-free bit operations.  Results are identical to [`score_pattern`].
+#[derive(Clone, Copy, Debug)]
+pub struct PackedGuess {
+    packed: PackedWord,
+    /// Letter `i` repeated in all five fields.
+    broadcast: [u32; 5],
+    /// Field high bits of the positions before `i` holding the same letter.
+    earlier_same: [u32; 5],
+}
+
+impl PackedGuess {
+    pub fn new(guess: &[u8; 5]) -> Self {
+        let mut broadcast = [0; 5];
+        let mut earlier_same = [0; 5];
+        for i in 0..5 {
+            broadcast[i] = (guess[i] - b'A') as u32 * FIELD_ONES;
+            for j in 0..i {
+                if guess[j] == guess[i] {
+                    earlier_same[i] |= 0b10000 << (5 * j);
+                }
+            }
+        }
+        PackedGuess {
+            packed: pack_word(guess),
+            broadcast,
+            earlier_same,
+        }
+    }
+
+    /// Score this guess against one packed answer.
+    ///
+    /// Position `i` is misplaced when its letter occurs in more unmatched
+    /// answer positions than there are unmatched earlier guess positions with
+    /// the same letter, which is the left-to-right rule of [`score_pattern`].
+    #[inline(always)]
+    pub fn score(&self, answer: PackedWord) -> Pattern {
+        let exact = zero_fields(self.packed ^ answer);
+        let open = !exact & FIELD_HIGH;
+        let mut pattern: u32 = 242;
+        for i in 0..5 {
+            let is_exact = (exact >> (5 * i + 4)) & 1;
+            let available = count_fields(zero_fields(self.broadcast[i] ^ answer) & open);
+            let earlier = count_fields(self.earlier_same[i] & open);
+            let is_misplaced = (earlier < available) as u32 & (is_exact ^ 1);
+            pattern -= PLACE[i] as u32 * (2 * is_exact + is_misplaced);
+        }
+        pattern as Pattern
+    }
+
+    /// Score this guess against every answer, writing one pattern per answer.
+    pub fn score_into(&self, answers: &[PackedWord], out: &mut [Pattern]) {
+        for (slot, &answer) in out.iter_mut().zip(answers) {
+            *slot = self.score(answer);
+        }
+    }
+}
+
+/// Expand a pattern code into 5 bytes of `b'Y'`, `b'M'` and `b'N'`.
+pub fn pattern_to_feedback(pattern: Pattern) -> [u8; 5] {
+    let mut feedback = [b'N'; 5];
+    let mut code = pattern;
+    for i in (0..5).rev() {
+        feedback[i] = FEEDBACK_BYTES[(code % 3) as usize];
+        code /= 3;
+    }
+    feedback
+}
+
+/// Encode Y/M/N feedback bytes as a pattern code.  Returns `None` for
+/// anything that is not exactly 5 of those letters.
+pub fn feedback_to_pattern(feedback: &[u8]) -> Option<Pattern> {
+    if feedback.len() != 5 {
+        return None;
+    }
+    let mut code: Pattern = 0;
+    for &b in feedback {
+        let digit = FEEDBACK_BYTES.iter().position(|&f| f == b)? as u8;
+        code = code * 3 + digit;
+    }
+    Some(code)
+}
+
+/// Number of non-empty groups and size of the largest group when words are
+/// bucketed by `patterns`, without storing the buckets.
+pub fn group_stats(patterns: impl IntoIterator<Item = Pattern>) -> (usize, usize) {
+    let mut counts = [0u32; NUM_PATTERNS];
+    let (mut groups, mut largest) = (0, 0);
+    for pattern in patterns {
+        let count = &mut counts[pattern as usize];
+        groups += (*count == 0) as usize;
+        *count += 1;
+        largest = largest.max(*count as usize);
+    }
+    (groups, largest)
+}
+
+/// `remaining` word ids bucketed by the pattern `guess` produces against them.
+///
+/// Ids are stored contiguously, sorted by pattern, so building a partition
+/// costs two small allocations regardless of the number of groups.
+#[derive(Clone, Debug, Default)]
+pub struct Partition {
+    ids: Vec<WordId>,
+    /// Non-empty groups in ascending pattern order, with their sizes.
+    groups: Vec<(Pattern, u32)>,
+}
+
+impl Partition {
+    /// Partition `remaining` by scoring `guess` against each packed word directly.
+    pub fn new(guess: &[u8; 5], words: &[PackedWord], remaining: &[WordId]) -> Self {
+        let guess = PackedGuess::new(guess);
+        Self::from_patterns(remaining, |id| guess.score(words[id as usize]))
+    }
+
+    /// Partition `remaining` using precomputed patterns, e.g. a
+    /// [`crate::table::PatternTable`] row.
+    pub fn from_patterns(remaining: &[WordId], pattern_of: impl Fn(WordId) -> Pattern) -> Self {
+        let mut counts = [0u32; NUM_PATTERNS];
+        let patterns: Vec<Pattern> = remaining
+            .iter()
+            .map(|&id| {
+                let pattern = pattern_of(id);
+                counts[pattern as usize] += 1;
+                pattern
+            })
+            .collect();
+
+        let mut offsets = [0u32; NUM_PATTERNS];
+        let mut groups = Vec::new();
+        let mut total = 0u32;
+        for (pattern, &count) in counts.iter().enumerate() {
+            offsets[pattern] = total;
+            total += count;
+            if count > 0 {
+                groups.push((pattern as Pattern, count));
+            }
+        }
+
+        let mut ids = vec![0; remaining.len()];
+        for (&id, &pattern) in remaining.iter().zip(&patterns) {
+            let slot = &mut offsets[pattern as usize];
+            ids[*slot as usize] = id;
+            *slot += 1;
+        }
+
+        Partition { ids, groups }
+    }
+
+    /// Number of non-empty groups.
+    pub fn len(&self) -> usize {
+        self.groups.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.groups.is_empty()
+    }
+
+    /// Size of the largest group, or `None` when there are no groups.
+    pub fn max_group_size(&self) -> Option<usize> {
+        self.groups.iter().map(|&(_, n)| n as usize).max()
+    }
+
+    /// Iterate `(pattern, ids)` for each non-empty group.
+    pub fn iter(&self) -> impl Iterator<Item = (Pattern, &[WordId])> + '_ {
+        let mut start = 0usize;
+        self.groups.iter().map(move |&(pattern, count)| {
+            let end = start + count as usize;
+            let ids = &self.ids[start..end];
+            start = end;
+            (pattern, ids)
+        })
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Every word over a small alphabet, so all duplicate-letter layouts occur.
+    fn small_words() -> Vec<[u8; 5]> {
+        let letters = [b'A', b'B', b'C', b'Z'];
+        (0..letters.len().pow(5))
+            .map(|mut n| {
+                let mut word = [0; 5];
+                for letter in &mut word {
+                    *letter = letters[n % letters.len()];
+                    n /= letters.len();
+                }
+                word
+            })
+            .collect()
+    }
+
+    #[test]
+    fn packed_kernel_matches_reference() {
+        let words = small_words();
+        let packed: Vec<PackedWord> = words.iter().map(pack_word).collect();
+        let mut out = vec![0; words.len()];
+        for guess in &words {
+            PackedGuess::new(guess).score_into(&packed, &mut out);
+            for (answer, &pattern) in words.iter().zip(&out) {
+                assert_eq!(
+                    pattern,
+                    score_pattern(guess, answer),
+                    "{guess:?} vs {answer:?}"
+                );
+            }
+        }
+    }
+
+    #[test]
+    fn feedback_round_trip() {
+        for pattern in 0..NUM_PATTERNS as Pattern {
+            assert_eq!(
+                feedback_to_pattern(&pattern_to_feedback(pattern)),
+                Some(pattern)
+            );
+        }
+        assert_eq!(
+            score_pattern(b"SPEED", b"ABIDE"),
+            feedback_to_pattern(b"NNMNM").unwrap()
+        );
+    }
+}
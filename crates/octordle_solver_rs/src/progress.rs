@@ -0,0 +1,127 @@
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::mpsc::{self, RecvTimeoutError};
+use std::thread;
+use std::time::Duration;
+
+use pyo3::prelude::*;
+
+/// Shortest time between two calls to a progress callback.
+const PROGRESS_INTERVAL: Duration = Duration::from_millis(100);
+
+/// Number of items a computation has completed out of its total, counted
+/// by its scoring threads.
+#[derive(Debug, Default)]
+pub struct Progress {
+    done: AtomicUsize,
+    total: AtomicUsize,
+}
+
+impl Progress {
+    /// Set the number of items to complete, once the computation knows it.
+    pub fn set_total(&self, total: usize) {
+        self.total.store(total, Ordering::Relaxed);
+    }
+
+    /// Items to complete; 0 until `set_total` is called.
+    pub fn total(&self) -> usize {
+        self.total.load(Ordering::Relaxed)
+    }
+
+    /// Record `count` more completed items.
+    pub fn advance(&self, count: usize) {
+        self.done.fetch_add(count, Ordering::Relaxed);
+    }
+
+    /// Items completed so far.
+    pub fn done(&self) -> usize {
+        self.done.load(Ordering::Relaxed)
+    }
+}
+
+/// Record one completed item; `None` counts nothing.
+pub fn advance(progress: Option<&Progress>) {
+    if let Some(progress) = progress {
+        progress.advance(1);
+    }
+}
+
+/// Set the total of an optional counter.
+pub fn set_total(progress: Option<&Progress>, total: usize) {
+    if let Some(progress) = progress {
+        progress.set_total(total);
+    }
+}
+
+/// Run `work` without the GIL, reporting its progress to `callback`.
+///
+/// `work` runs on a helper thread while the calling thread waits for it,
+/// calling `callback(done, total)` with the GIL at most every
+/// `PROGRESS_INTERVAL` once `work` has set the total and while the count
+/// changes, and once more when `work` returns, so the callback never runs
+/// on a scoring thread.  If it raises, it is not called again and its error
+/// is returned once `work` has finished.  Without a callback, `work` runs
+/// on the calling thread and counts nothing.
+pub fn run_with_progress<T, F>(py: Python<'_>, callback: Option<&PyObject>, work: F) -> PyResult<T>
+where
+    F: FnOnce(Option<&Progress>) -> T + Send,
+    T: Send,
+{
+    let Some(callback) = callback else {
+        return Ok(py.allow_threads(move || work(None)));
+    };
+    let progress = Progress::default();
+    let (result, error) = py.allow_threads(|| {
+        thread::scope(|scope| {
+            let progress = &progress;
+            let (finished, wait_finished) = mpsc::channel::<()>();
+            let worker = scope.spawn(move || {
+                let result = work(Some(progress));
+                // The receiver only goes away once the result is joined
+                let _ = finished.send(());
+                result
+            });
+
+            let mut error: Option<PyErr> = None;
+            let mut reported = None;
+            let mut report = |done: usize, total: usize| {
+                if error.is_some() || reported == Some((done, total)) {
+                    return;
+                }
+                reported = Some((done, total));
+                if let Err(err) = Python::with_gil(|py| callback.call1(py, (done, total))) {
+                    error = Some(err);
+                }
+            };
+            while let Err(RecvTimeoutError::Timeout) = wait_finished.recv_timeout(PROGRESS_INTERVAL)
+            {
+                if progress.total() > 0 {
+                    report(progress.done(), progress.total());
+                }
+            }
+            let result = worker
+                .join()
+                .unwrap_or_else(|panic| std::panic::resume_unwind(panic));
+            report(progress.done(), progress.total());
+            (result, error)
+        })
+    });
+    match error {
+        Some(error) => Err(error),
+        None => Ok(result),
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn advance_counts_items() {
+        let progress = Progress::default();
+        set_total(Some(&progress), 4);
+        advance(Some(&progress));
+        advance(None);
+        progress.advance(2);
+        assert_eq!((progress.done(), progress.total()), (3, 4));
+    }
+}
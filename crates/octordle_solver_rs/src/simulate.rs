@@ -0,0 +1,229 @@
+use std::cmp::Reverse;
+use std::sync::Arc;
+
+use pyo3::prelude::*;
+use rayon::prelude::*;
+
+use crate::buffer::ArrayBuffer;
+use crate::dictionary::{Dictionary, DictionaryData, WordId};
+use crate::pattern::{Partition, ALL_CORRECT};
+use crate::wordset::WordSet;
+
+/// Padding used in [`SimulationResult::paths`] after an answer is solved.
+const NO_GUESS: WordId = WordId::MAX;
+
+// ---------------------------------------------------------------------------
+// Strategy
+// ---------------------------------------------------------------------------
+
+/// The word a `Puzzle` would rank first for `remaining`: most groups, then
+/// smallest largest group, with remaining words ahead of other guesses.
+fn best_guess(dictionary: &DictionaryData, remaining: &[WordId]) -> WordId {
+    if remaining.len() == 1 {
+        return remaining[0];
+    }
+    let mut seen = WordSet::new(dictionary.len());
+    for &id in remaining {
+        seen.insert(id);
+    }
+    let mut candidates = remaining.to_vec();
+    candidates.extend(
+        dictionary
+            .guesses
+            .iter()
+            .copied()
+            .filter(|&id| seen.insert(id)),
+    );
+
+    candidates
+        .par_iter()
+        .enumerate()
+        .min_by_key(|&(position, &id)| {
+            let (groups, largest) = dictionary.group_stats(id, remaining);
+            (Reverse(groups), largest, position)
+        })
+        .map(|(_, &id)| id)
+        .expect("remaining is not empty")
+}
+
+/// Play `guess` against every word in `remaining` and follow the strategy
+/// down to each of `targets`.
+///
+/// Answers that produce the same feedback share the rest of their game, so
+/// each subtree of the decision tree is ranked once no matter how many
+/// targets pass through it.  Returns `(answer, guesses)` pairs.
+fn play(
+    dictionary: &DictionaryData,
+    guess: WordId,
+    remaining: &[WordId],
+    targets: &[WordId],
+    mut path: Vec<WordId>,
+) -> Vec<(WordId, Vec<WordId>)> {
+    path.push(guess);
+    let row = dictionary.pattern_table().row(guess);
+    let partition = Partition::from_patterns(remaining, |id| row[id as usize]);
+
+    let groups: Vec<_> = partition
+        .iter()
+        .filter_map(|(pattern, ids)| {
+            let group_targets: Vec<WordId> = targets
+                .iter()
+                .copied()
+                .filter(|&t| row[t as usize] == pattern)
+                .collect();
+            (!group_targets.is_empty()).then_some((pattern, ids, group_targets))
+        })
+        .collect();
+
+    groups
+        .into_par_iter()
+        .flat_map_iter(|(pattern, ids, group_targets)| {
+            if pattern == ALL_CORRECT {
+                return group_targets
+                    .into_iter()
+                    .map(|t| (t, path.clone()))
+                    .collect::<Vec<_>>();
+            }
+            let next = best_guess(dictionary, ids);
+            play(dictionary, next, ids, &group_targets, path.clone())
+        })
+        .collect()
+}
+
+/// Simulate every game in `answers`, returning paths in the same order.
+fn simulate(
+    dictionary: &Arc<DictionaryData>,
+    opener: WordId,
+    answers: &[WordId],
+) -> Vec<Vec<WordId>> {
+    let mut targets = WordSet::new(dictionary.len());
+    for &id in answers {
+        targets.insert(id);
+    }
+    let remaining: Vec<WordId> = (0..dictionary.num_answers as WordId).collect();
+    let mut paths = vec![Vec::new(); dictionary.len()];
+    for (answer, path) in play(
+        dictionary,
+        opener,
+        &remaining,
+        &targets.to_vec(),
+        Vec::new(),
+    ) {
+        paths[answer as usize] = path;
+    }
+    answers
+        .iter()
+        .map(|&id| paths[id as usize].clone())
+        .collect()
+}
+
+// ---------------------------------------------------------------------------
+// PyO3 wrapper
+// ---------------------------------------------------------------------------
+
+/// Outcome of [`simulate_games`]: one game per answer, in the order given.
+#[pyclass(frozen)]
+pub struct SimulationResult {
+    dictionary: Arc<DictionaryData>,
+    answers: Vec<WordId>,
+    paths: Vec<Vec<WordId>>,
+}
+
+#[pymethods]
+impl SimulationResult {
+    /// The simulated answers.
+    #[getter]
+    fn answers(&self) -> Vec<String> {
+        self.dictionary.strings_for(self.answers.iter().copied())
+    }
+
+    /// Number of guesses each game took, including the opener and the
+    /// winning guess, as a `uint32` buffer.
+    fn guess_counts(&self) -> ArrayBuffer {
+        ArrayBuffer::from_u32(self.paths.iter().map(|p| p.len() as u32).collect())
+    }
+
+    /// Every game's guesses as word ids in a `len(answers) x max_guesses`
+    /// `uint16` buffer, padded with 65535.  Ids index `Dictionary.words`.
+    fn paths(&self) -> ArrayBuffer {
+        let width = self.max_guesses();
+        let mut ids = Vec::with_capacity(self.paths.len() * width);
+        for path in &self.paths {
+            ids.extend_from_slice(path);
+            ids.extend(std::iter::repeat(NO_GUESS).take(width - path.len()));
+        }
+        ArrayBuffer::from_u16_rows(ids, self.paths.len())
+    }
+
+    /// The guesses played in game `index`.
+    fn path(&self, index: usize) -> PyResult<Vec<String>> {
+        let path = self
+            .paths
+            .get(index)
+            .ok_or_else(|| pyo3::exceptions::PyIndexError::new_err("game index out of range"))?;
+        Ok(self.dictionary.strings_for(path.iter().copied()))
+    }
+
+    /// Most guesses any game needed.
+    #[getter]
+    fn max_guesses(&self) -> usize {
+        self.paths.iter().map(Vec::len).max().unwrap_or(0)
+    }
+
+    /// Average number of guesses per game.
+    #[getter]
+    fn mean_guesses(&self) -> f64 {
+        if self.paths.is_empty() {
+            return 0.0;
+        }
+        let total: usize = self.paths.iter().map(Vec::len).sum();
+        total as f64 / self.paths.len() as f64
+    }
+
+    fn __len__(&self) -> usize {
+        self.paths.len()
+    }
+
+    fn __repr__(&self) -> String {
+        format!(
+            "SimulationResult({} games, mean {:.3} guesses)",
+            self.paths.len(),
+            self.mean_guesses()
+        )
+    }
+}
+
+/// Play the solver's strategy from `opener` against each of `answers`
+/// (default: every valid answer) without returning to Python between turns.
+///
+/// Each turn plays the top-ranked guess, exactly as `Puzzle.best_word` would.
+/// Games run in parallel without the GIL and share common subtrees.
+#[pyfunction]
+#[pyo3(signature = (dictionary, opener, answers=None))]
+pub fn simulate_games(
+    py: Python<'_>,
+    dictionary: &Dictionary,
+    opener: &str,
+    answers: Option<Vec<String>>,
+) -> PyResult<SimulationResult> {
+    let data = Arc::clone(&dictionary.inner);
+    let opener = data.require_id(opener)?;
+    let answers = match answers {
+        None => (0..data.num_answers as WordId).collect(),
+        Some(words) => words
+            .iter()
+            .map(|word| match data.id_of(word) {
+                Some(id) if (id as usize) < data.num_answers => Ok(id),
+                _ => Err(pyo3::exceptions::PyValueError::new_err(format!(
+                    "'{word}' is not a valid answer"
+                ))),
+            })
+            .collect::<PyResult<Vec<_>>>()?,
+    };
+    let paths = py.allow_threads(|| simulate(&data, opener, &answers));
+    Ok(SimulationResult {
+        dictionary: data,
+        answers,
+        paths,
+    })
+}
@@ -1,8 +1,23 @@
-use std::collections::{HashMap, HashSet};
+use std::cmp::Reverse;
+use std::collections::HashSet;
+use std::sync::atomic::AtomicBool;
+use std::sync::Arc;
+use std::time::{Duration, Instant};
 
 use pyo3::prelude::*;
 use rayon::prelude::*;
 
+use crate::answers::{AnswerList, AnswerMap, Ranking};
+use crate::buffer::ArrayBuffer;
+use crate::cancel::{cancelled, is_cancelled, CancelToken};
+use crate::dictionary::{Dictionary, DictionaryData, WordId};
+use crate::pattern::{
+    feedback_to_pattern, group_stats, pack_word, pattern_to_feedback, score_pattern, PackedGuess,
+    Partition, Pattern,
+};
+use crate::progress::{advance, run_with_progress, set_total, Progress};
+use crate::wordset::WordSet;
+
 // ---------------------------------------------------------------------------
 // Internal helpers
 // ---------------------------------------------------------------------------
@@ -29,36 +44,9 @@ pub fn str_to_word(s: &str) -> PyResult<[u8; 5]> {
 /// Score a guess against an answer.  Returns a 5-byte array where each byte
 /// is one of: `b'Y'` (correct position), `b'M'` (misplaced), `b'N'` (not present).
 ///
-/// Handles duplicate letters the same way Wordle does: exact matches are
-/// consumed first, then remaining answer letters are matched left-to-right
-/// for the misplaced check.
+/// Handles duplicate letters the same way Wordle does; see [`score_pattern`].
 pub fn score_guess_internal(guess: &[u8; 5], answer: &[u8; 5]) -> [u8; 5] {
-    let mut feedback = [b'N'; 5];
-    // Count of each answer letter not consumed by an exact match.
-    let mut remaining = [0u8; 26];
-
-    // First pass: mark exact matches.
-    for i in 0..5 {
-        if guess[i] == answer[i] {
-            feedback[i] = b'Y';
-        } else {
-            remaining[(answer[i] - b'A') as usize] += 1;
-        }
-    }
-
-    // Second pass: mark misplaced letters.
-    for i in 0..5 {
-        if feedback[i] == b'Y' {
-            continue;
-        }
-        let idx = (guess[i] - b'A') as usize;
-        if remaining[idx] > 0 {
-            feedback[i] = b'M';
-            remaining[idx] -= 1;
-        }
-    }
-
-    feedback
+    pattern_to_feedback(score_pattern(guess, answer))
 }
 
 /// Generate groups from a pre-parsed word, for use in internal Rust code.
@@ -66,21 +54,21 @@ pub fn generate_groups_internal(
     given: &[u8; 5],
     remaining_words: &[String],
 ) -> PyResult<Vec<Group>> {
-    let mut map: HashMap<[u8; 5], Vec<String>> = HashMap::new();
-
-    for word in remaining_words {
-        let w = str_to_word(word)?;
-        let feedback = score_guess_internal(given, &w);
-        map.entry(feedback).or_default().push(word.clone());
-    }
-
-    Ok(map
-        .into_iter()
-        .map(|(possibility, words)| Group {
-            words,
-            possibility: String::from_utf8(possibility.to_vec())
-                .expect("feedback bytes are always valid UTF-8"),
-        })
+    let words = remaining_words
+        .iter()
+        .map(|w| str_to_word(w).map(|w| pack_word(&w)))
+        .collect::<PyResult<Vec<_>>>()?;
+    let count = WordId::try_from(words.len()).map_err(|_| {
+        pyo3::exceptions::PyValueError::new_err(format!(
+            "cannot group more than {} words",
+            WordId::MAX
+        ))
+    })?;
+    let ids: Vec<WordId> = (0..count).collect();
+    let partition = Partition::new(given, &words, &ids);
+    Ok(partition
+        .iter()
+        .map(|(pattern, ids)| Group::from_ids(pattern, ids, remaining_words))
         .collect())
 }
 
@@ -100,6 +88,17 @@ pub struct Group {
     pub possibility: String,
 }
 
+impl Group {
+    /// Export a bucket of word ids, resolving them against `strings`.
+    pub fn from_ids(pattern: Pattern, ids: &[WordId], strings: &[String]) -> Self {
+        Group {
+            words: ids.iter().map(|&id| strings[id as usize].clone()).collect(),
+            possibility: String::from_utf8(pattern_to_feedback(pattern).to_vec())
+                .expect("feedback bytes are always valid UTF-8"),
+        }
+    }
+}
+
 #[pymethods]
 impl Group {
     #[new]
@@ -155,6 +154,20 @@ pub fn generate_groups(given_word: &str, remaining_words: Vec<String>) -> PyResu
 const PENALTY_WEIGHT: f64 = 0.1;
 const REMAINING_WORD_BONUS: f64 = 2.0;
 
+/// Groups held by an [`AnswerPossibility`].
+#[derive(Clone, Debug)]
+enum Groups {
+    /// Groups passed in from Python.
+    Exported(Vec<Group>),
+    /// Not built yet: ranking only keeps statistics.  The guess is scored
+    /// against the remaining word ids again when the groups are read.
+    Lazy {
+        dictionary: Arc<DictionaryData>,
+        guess: WordId,
+        remaining: Arc<[WordId]>,
+    },
+}
+
 /// A candidate guess together with the groups it would create over the
 /// remaining words.  Higher fitness = better guess.
 #[pyclass]
@@ -162,8 +175,8 @@ const REMAINING_WORD_BONUS: f64 = 2.0;
 pub struct AnswerPossibility {
     #[pyo3(get)]
     pub word: String,
-    #[pyo3(get)]
-    pub groups: Vec<Group>,
+    groups: Groups,
+    group_count: usize,
     /// Cached: size of the largest group (-1 when there are no groups).
     max_group_size_cached: i64,
 }
@@ -177,16 +190,46 @@ impl AnswerPossibility {
             .unwrap_or(-1);
         AnswerPossibility {
             word,
-            groups,
+            group_count: groups.len(),
+            groups: Groups::Exported(groups),
             max_group_size_cached,
         }
     }
 
+    /// A ranked candidate that only knows its statistics.  `remaining` is
+    /// shared by every candidate from the same ranking.
+    pub fn from_stats(
+        dictionary: &Arc<DictionaryData>,
+        guess: WordId,
+        remaining: &Arc<[WordId]>,
+        (group_count, max_group_size): (usize, usize),
+    ) -> Self {
+        AnswerPossibility {
+            word: dictionary.strings[guess as usize].clone(),
+            group_count,
+            max_group_size_cached: if group_count == 0 {
+                -1
+            } else {
+                max_group_size as i64
+            },
+            groups: Groups::Lazy {
+                dictionary: Arc::clone(dictionary),
+                guess,
+                remaining: Arc::clone(remaining),
+            },
+        }
+    }
+
+    /// Number of groups this guess splits the remaining words into.
+    pub fn group_count(&self) -> usize {
+        self.group_count
+    }
+
     /// True when `self` is a strictly better guess than `other`.
     /// Mirrors Python's `AnswerPossibility.__gt__`.
     pub fn is_better_than(&self, other: &AnswerPossibility) -> bool {
-        let sg = self.groups.len();
-        let og = other.groups.len();
+        let sg = self.group_count;
+        let og = other.group_count;
         if sg == og {
             if sg == 0 {
                 return true;
@@ -207,7 +250,32 @@ impl AnswerPossibility {
     }
 
     #[getter]
-    fn max_group_size(&self) -> i64 {
+    fn groups(&self) -> Vec<Group> {
+        match &self.groups {
+            Groups::Exported(groups) => groups.clone(),
+            Groups::Lazy {
+                dictionary,
+                guess,
+                remaining,
+            } => Partition::new(
+                &dictionary.words[*guess as usize],
+                &dictionary.packed,
+                remaining,
+            )
+            .iter()
+            .map(|(pattern, ids)| Group::from_ids(pattern, ids, &dictionary.strings))
+            .collect(),
+        }
+    }
+
+    /// Number of groups, available without building them.
+    #[getter(group_count)]
+    fn get_group_count(&self) -> usize {
+        self.group_count
+    }
+
+    #[getter]
+    pub fn max_group_size(&self) -> i64 {
         self.max_group_size_cached
     }
 
@@ -218,9 +286,7 @@ impl AnswerPossibility {
     fn __str__(&self) -> String {
         format!(
             "{}: {} groups, largest group {}",
-            self.word,
-            self.groups.len(),
-            self.max_group_size_cached
+            self.word, self.group_count, self.max_group_size_cached
         )
     }
 
@@ -235,8 +301,13 @@ impl AnswerPossibility {
 
 /// Internal: compute fitness score without going through PyO3.
 pub fn calculate_fitness_score_internal(ap: &AnswerPossibility, remaining_words: &[String]) -> f64 {
-    let fitness = ap.groups.len() as f64 - ap.max_group_size_cached as f64 * PENALTY_WEIGHT;
-    let bonus = if remaining_words.contains(&ap.word) {
+    fitness_score(ap, remaining_words.contains(&ap.word))
+}
+
+/// Fitness of `ap`, given whether its word is itself a remaining answer.
+pub fn fitness_score(ap: &AnswerPossibility, in_remaining_words: bool) -> f64 {
+    let fitness = ap.group_count as f64 - ap.max_group_size_cached as f64 * PENALTY_WEIGHT;
+    let bonus = if in_remaining_words {
         REMAINING_WORD_BONUS
     } else {
         0.0
@@ -255,75 +326,205 @@ pub fn calculate_fitness_score(ap: &AnswerPossibility, remaining_words: Vec<Stri
 // get_all_answers
 // ---------------------------------------------------------------------------
 
-/// Comparison for sorting: returns the ordering of `a` relative to `b` such
-/// that a higher-quality guess sorts first (descending).
-fn cmp_answer_possibilities(
-    a: &AnswerPossibility,
-    b: &AnswerPossibility,
-) -> std::cmp::Ordering {
-    let ag = a.groups.len();
-    let bg = b.groups.len();
-    if ag == bg {
-        if ag == 0 {
-            std::cmp::Ordering::Equal
-        } else {
-            // Smaller max_group_size is better → comes first.
-            a.max_group_size_cached.cmp(&b.max_group_size_cached)
-        }
-    } else {
-        // More groups is better → higher count comes first.
-        bg.cmp(&ag)
-    }
+/// Sort key for a candidate: more groups first, then a smaller largest
+/// group, then the candidate's original position.
+fn rank_key(position: usize, (groups, largest): (usize, usize)) -> (Reverse<usize>, usize, usize) {
+    (Reverse(groups), largest, position)
 }
 
 /// Internal: score every candidate and return sorted best-first, without
 /// going through PyO3 argument conversion.
+///
+/// The word lists here are arbitrary, so pairs are scored directly rather
+/// than through the process-wide pattern table.
 pub fn get_all_answers_core(
     remaining_words: &[String],
     valid_guesses: &[String],
+    limit: Option<usize>,
 ) -> PyResult<Vec<AnswerPossibility>> {
-    if remaining_words.is_empty() {
-        return Ok(vec![]);
+    // Answers are numbered first, so the remaining words are ids
+    // `0..num_answers` and `0..len` is remaining + guesses, de-duplicated.
+    let dictionary = Arc::new(DictionaryData::new(remaining_words, valid_guesses)?);
+    let remaining: Vec<WordId> = (0..dictionary.num_answers as WordId).collect();
+    let candidates: Vec<WordId> = (0..dictionary.len() as WordId).collect();
+    let answers = &dictionary.packed[..dictionary.num_answers];
+    let (ranked, _) = rank_candidates(
+        &dictionary,
+        &remaining,
+        &candidates,
+        limit,
+        None,
+        None,
+        |id| {
+            let guess = PackedGuess::new(&dictionary.words[id as usize]);
+            group_stats(answers.iter().map(|&answer| guess.score(answer)))
+        },
+    )?;
+    Ok(ranked)
+}
+
+/// Score `candidates` against the `remaining` answer ids and return the best
+/// `limit` (default: all) sorted best-first.  Candidate order breaks ties.
+/// Patterns come from the dictionary's pattern table, so no pair is scored
+/// twice in a process.
+///
+/// With a `deadline`, candidates are scored in [`priority_order`] and scoring
+/// stops once it passes; the flag returned is `false` when some candidates
+/// were skipped.  Setting `cancel` stops scoring and returns `Cancelled`.
+/// Each candidate scored is counted on `progress`.
+pub fn get_all_answers_ids(
+    dictionary: &Arc<DictionaryData>,
+    remaining: &[WordId],
+    candidates: &[WordId],
+    limit: Option<usize>,
+    deadline: Option<Instant>,
+    cancel: Option<&AtomicBool>,
+    progress: Option<&Progress>,
+) -> PyResult<(Vec<AnswerPossibility>, bool)> {
+    set_total(progress, candidates.len());
+    rank_candidates(
+        dictionary,
+        remaining,
+        candidates,
+        limit,
+        deadline,
+        cancel,
+        |id| {
+            let stats = dictionary.group_stats(id, remaining);
+            advance(progress);
+            stats
+        },
+    )
+}
+
+/// Candidates scored between deadline checks.  The first block is always
+/// scored, so a deadline never yields an empty ranking.
+const DEADLINE_BLOCK: usize = 512;
+
+/// Positions in `candidates`, most promising first: remaining words (which
+/// can win outright), then the others by coverage, the number of remaining
+/// words containing each of their distinct letters, summed.  Ties keep
+/// candidate order.
+pub fn priority_order(
+    words: &[[u8; 5]],
+    remaining: &[WordId],
+    candidates: &[WordId],
+) -> Vec<usize> {
+    let letters = |id: WordId| {
+        words[id as usize].iter().fold(0u32, |mask, &letter| {
+            mask | 1 << (letter.wrapping_sub(b'A') % 32)
+        })
+    };
+    let mut letter_counts = [0usize; 32];
+    for &id in remaining {
+        let mask = letters(id);
+        for (bit, count) in letter_counts.iter_mut().enumerate() {
+            *count += (mask >> bit & 1) as usize;
+        }
+    }
+    let remaining: HashSet<WordId> = remaining.iter().copied().collect();
+    let mut order: Vec<usize> = (0..candidates.len()).collect();
+    order.sort_by_cached_key(|&position| {
+        let id = candidates[position];
+        let mask = letters(id);
+        let coverage: usize = (0..32)
+            .filter(|bit| mask >> bit & 1 == 1)
+            .map(|bit| letter_counts[bit])
+            .sum();
+        (!remaining.contains(&id), Reverse(coverage), position)
+    });
+    order
+}
+
+/// Rank `candidates` by their `(group count, largest group)` statistics.
+///
+/// Only the statistics are kept while ranking; groups are built when a
+/// caller reads them.  With a `limit` only that many candidates are sorted
+/// and turned into [`AnswerPossibility`] values.  Every scoring thread
+/// checks `cancel` before each candidate, so setting it frees the cores
+/// within one candidate's scoring time.
+fn rank_candidates(
+    dictionary: &Arc<DictionaryData>,
+    remaining: &[WordId],
+    candidates: &[WordId],
+    limit: Option<usize>,
+    deadline: Option<Instant>,
+    cancel: Option<&AtomicBool>,
+    stats: impl Fn(WordId) -> (usize, usize) + Sync,
+) -> PyResult<(Vec<AnswerPossibility>, bool)> {
+    if remaining.is_empty() || limit == Some(0) {
+        return Ok((vec![], true));
     }
+    let shared: Arc<[WordId]> = remaining.into();
 
-    if remaining_words.len() == 1 {
-        let word = &remaining_words[0];
-        let given = str_to_word(word)?;
-        let groups = generate_groups_internal(&given, remaining_words)?;
-        return Ok(vec![AnswerPossibility::new(word.clone(), groups)]);
+    if remaining.len() == 1 {
+        let id = remaining[0];
+        let answer = AnswerPossibility::from_stats(dictionary, id, &shared, stats(id));
+        return Ok((vec![answer], true));
     }
 
-    let mut seen: HashSet<&str> = HashSet::new();
-    let mut guesses: Vec<&str> =
-        Vec::with_capacity(remaining_words.len() + valid_guesses.len());
-    for word in remaining_words.iter().chain(valid_guesses.iter()) {
-        if seen.insert(word.as_str()) {
-            guesses.push(word.as_str());
+    // `None` once cancelled; collecting stops at the first one
+    let score = |position: usize| {
+        (!is_cancelled(cancel))
+            .then(|| (position, candidates[position], stats(candidates[position])))
+    };
+    let mut exact = true;
+    let mut ranked: Vec<(usize, WordId, (usize, usize))> = match deadline {
+        None => (0..candidates.len())
+            .into_par_iter()
+            .map(score)
+            .collect::<Option<_>>()
+            .ok_or_else(cancelled)?,
+        Some(deadline) => {
+            let order = priority_order(&dictionary.words, remaining, candidates);
+            let mut ranked = Vec::with_capacity(candidates.len());
+            for block in order.chunks(DEADLINE_BLOCK) {
+                let scored: Option<Vec<_>> =
+                    block.par_iter().map(|&position| score(position)).collect();
+                ranked.extend(scored.ok_or_else(cancelled)?);
+                if ranked.len() < candidates.len() && Instant::now() >= deadline {
+                    exact = false;
+                    break;
+                }
+            }
+            ranked
         }
+    };
+
+    let key = |&(position, _, stats): &(usize, WordId, (usize, usize))| rank_key(position, stats);
+    if let Some(limit) = limit.filter(|&limit| limit < ranked.len()) {
+        ranked.select_nth_unstable_by_key(limit, key);
+        ranked.truncate(limit);
     }
+    ranked.sort_unstable_by_key(key);
 
-    let mut all_possibilities: Vec<AnswerPossibility> = guesses
-        .par_iter()
-        .map(|word| {
-            let given = str_to_word(word).expect("word list contains invalid word");
-            let groups = generate_groups_internal(&given, remaining_words)
-                .expect("generate_groups failed");
-            AnswerPossibility::new((*word).to_owned(), groups)
-        })
+    let answers = ranked
+        .into_iter()
+        .map(|(_, id, stats)| AnswerPossibility::from_stats(dictionary, id, &shared, stats))
         .collect();
+    Ok((answers, exact))
+}
 
-    all_possibilities.sort_by(cmp_answer_possibilities);
-    Ok(all_possibilities)
+/// The moment a `time_budget_ms` starting now runs out.  A budget too large
+/// to represent, e.g. an infinite one, sets no deadline.
+fn deadline_after(time_budget_ms: Option<f64>) -> Option<Instant> {
+    let budget = Duration::try_from_secs_f64(time_budget_ms?.max(0.0) / 1000.0).ok()?;
+    Instant::now().checked_add(budget)
 }
 
 /// Score every candidate guess against the current set of remaining words and
 /// return them sorted best-first.  Uses Rayon for data-parallel scoring.
+///
+/// Pass `limit` to keep only the best `limit` guesses.
 #[pyfunction]
+#[pyo3(signature = (remaining_words, valid_guesses, limit=None))]
 pub fn get_all_answers(
+    py: Python<'_>,
     remaining_words: Vec<String>,
     valid_guesses: Vec<String>,
+    limit: Option<usize>,
 ) -> PyResult<Vec<AnswerPossibility>> {
-    get_all_answers_core(&remaining_words, &valid_guesses)
+    py.allow_threads(move || get_all_answers_core(&remaining_words, &valid_guesses, limit))
 }
 
 // ---------------------------------------------------------------------------
@@ -392,8 +593,8 @@ fn sanitize_result(result: &Bound<'_, PyAny>) -> PyResult<String> {
             2 => s.push('N'),
             _ => {
                 return Err(pyo3::exceptions::PyValueError::new_err(format!(
-                    "invalid result value {v}: expected 0 (correct), 1 (misplaced), or 2 (incorrect)"
-                )))
+                "invalid result value {v}: expected 0 (correct), 1 (misplaced), or 2 (incorrect)"
+            )))
             }
         }
     }
@@ -406,73 +607,227 @@ fn sanitize_result(result: &Bound<'_, PyAny>) -> PyResult<String> {
 
 /// Holds the state of a single Wordle puzzle: remaining candidates,
 /// guess history, and the ranked list of best next guesses.
+///
+/// Word lists live in a shared [`Dictionary`]; the puzzle itself only keeps a
+/// bitset of remaining answer ids, so creating and resetting puzzles is cheap.
 #[pyclass]
+#[derive(Clone)]
 pub struct Puzzle {
-    #[pyo3(get, set)]
-    pub remaining_words: Vec<String>,
-    #[pyo3(get)]
-    pub valid_guesses: Vec<String>,
-    #[pyo3(get)]
-    pub all_answers: Vec<AnswerPossibility>,
+    dictionary: Arc<DictionaryData>,
+    remaining: WordSet,
+    all_answers: Arc<Ranking>,
     #[pyo3(get)]
     pub guesses: Vec<Guess>,
     get_best_answer: bool,
-    // Preserved for reset().
-    initial_remaining_words: Vec<String>,
-    initial_valid_guesses: Vec<String>,
+    /// Keep only this many ranked answers after each guess (`None` keeps
+    /// all).  Multi-puzzle scoring only sees the kept answers.
+    #[pyo3(get, set)]
+    pub answer_limit: Option<usize>,
+    /// Stop ranking after this many milliseconds after each guess and keep
+    /// the best guesses scored so far (`None` ranks every candidate).
+    #[pyo3(get, set)]
+    pub time_budget_ms: Option<f64>,
+    /// Only rank guesses that reuse every revealed hint.
+    #[pyo3(get)]
+    pub hard_mode: bool,
+    /// Guess ids still legal; every valid guess unless in hard mode.
+    allowed_guesses: WordSet,
 }
 
 #[pymethods]
 impl Puzzle {
-    /// Create a new Puzzle.
+    /// Create a new Puzzle from explicit word lists.
     ///
     /// Unlike the Python version this constructor requires the word lists
     /// explicitly so the Rust crate has no implicit dictionary dependency.
+    /// Prefer [`Puzzle::from_dictionary`] when creating many puzzles.
     #[new]
-    #[pyo3(signature = (valid_answers, valid_guesses, get_best_answer=true))]
+    #[pyo3(signature = (valid_answers, valid_guesses, get_best_answer=true, hard_mode=false))]
     pub fn new(
         valid_answers: Vec<String>,
         valid_guesses: Vec<String>,
         get_best_answer: bool,
-    ) -> Self {
-        Puzzle {
-            remaining_words: valid_answers.clone(),
-            valid_guesses: valid_guesses.clone(),
-            all_answers: vec![],
-            guesses: vec![],
+        hard_mode: bool,
+    ) -> PyResult<Self> {
+        let dictionary = Arc::new(DictionaryData::new(&valid_answers, &valid_guesses)?);
+        Ok(Self::with_dictionary(
+            dictionary,
             get_best_answer,
-            initial_remaining_words: valid_answers,
-            initial_valid_guesses: valid_guesses,
+            hard_mode,
+        ))
+    }
+
+    /// Create a new Puzzle sharing the word storage of `dictionary`.
+    #[staticmethod]
+    #[pyo3(signature = (dictionary, get_best_answer=true, hard_mode=false))]
+    pub fn from_dictionary(
+        dictionary: &Dictionary,
+        get_best_answer: bool,
+        hard_mode: bool,
+    ) -> Self {
+        Self::with_dictionary(Arc::clone(&dictionary.inner), get_best_answer, hard_mode)
+    }
+
+    /// The dictionary this puzzle draws its words from.
+    #[getter]
+    fn dictionary(&self) -> Dictionary {
+        Dictionary {
+            inner: Arc::clone(&self.dictionary),
+        }
+    }
+
+    /// Words still consistent with every guess, in dictionary order.
+    #[getter]
+    fn remaining_words(&self) -> Vec<String> {
+        self.dictionary.strings_for(self.remaining.iter())
+    }
+
+    /// Ids of the remaining words, in dictionary order, as a `uint16`
+    /// buffer.  Ids index `Dictionary.words`.
+    fn remaining_ids(&self) -> ArrayBuffer {
+        ArrayBuffer::from_u16(self.remaining.iter().collect())
+    }
+
+    /// Replace the remaining words.  Every word must be in the dictionary;
+    /// duplicates are dropped and the original order is not preserved.
+    #[setter]
+    fn set_remaining_words(&mut self, words: Vec<String>) -> PyResult<()> {
+        let mut remaining = WordSet::new(self.dictionary.len());
+        for word in &words {
+            remaining.insert(self.dictionary.require_id(word)?);
         }
+        self.remaining = remaining;
+        Ok(())
+    }
+
+    /// Valid guesses, in their original order.  In hard mode only the
+    /// guesses that reuse every revealed hint are included.
+    #[getter]
+    fn valid_guesses(&self) -> Vec<String> {
+        self.dictionary.strings_for(self.legal_guesses())
     }
 
     /// Apply a guess and its feedback, filter remaining words, and
     /// (optionally) recompute the ranked answer list.
     ///
     /// `result` may be a `str` ("YYYMN") or a `list[int]`
-    /// (0=correct, 1=misplaced, 2=incorrect).
-    fn make_guess(&mut self, word: String, result: &Bound<'_, PyAny>) -> PyResult<()> {
+    /// (0=correct, 1=misplaced, 2=incorrect).  Setting `cancel` stops the
+    /// ranking and raises `Cancelled`; the guess stays applied and
+    /// `all_answers` is left empty.  `progress(done, total)` is called with
+    /// the number of candidates scored, at most every 100 ms.
+    ///
+    /// The puzzle is not borrowed while filtering and ranking run without
+    /// the GIL, so other threads can read it in the meantime.
+    #[pyo3(signature = (word, result, cancel=None, progress=None))]
+    fn make_guess(
+        slf: Py<Self>,
+        py: Python<'_>,
+        word: String,
+        result: &Bound<'_, PyAny>,
+        cancel: Option<CancelToken>,
+        progress: Option<PyObject>,
+    ) -> PyResult<()> {
         let result_str = sanitize_result(result)?;
-        let guess = Guess {
-            word: word.clone(),
-            result: result_str.clone(),
+        let (dictionary, mut remaining, mut allowed_guesses, hard_mode) = {
+            let this = slf.borrow(py);
+            (
+                Arc::clone(&this.dictionary),
+                this.remaining.clone(),
+                this.allowed_guesses.clone(),
+                this.hard_mode,
+            )
         };
-        self.guesses.push(guess);
-        self.filter_remaining(&word, &result_str);
-        if self.get_best_answer {
-            self.all_answers = get_all_answers_core(&self.remaining_words, &self.valid_guesses)?;
+        // The first filter in a process may build the pattern table.
+        py.allow_threads(|| {
+            filter_remaining(&dictionary, &mut remaining, &word, &result_str);
+            if hard_mode {
+                filter_guesses(&dictionary, &mut allowed_guesses, &word, &result_str);
+            }
+        });
+        let (get_best_answer, limit, deadline) = {
+            let mut this = slf.borrow_mut(py);
+            this.guesses.push(Guess {
+                word,
+                result: result_str,
+            });
+            this.remaining = remaining;
+            this.allowed_guesses = allowed_guesses;
+            (
+                this.get_best_answer,
+                this.answer_limit,
+                deadline_after(this.time_budget_ms),
+            )
+        };
+        if get_best_answer {
+            Self::rerank(&slf, py, limit, deadline, cancel, progress)?;
         }
         Ok(())
     }
 
     /// Recompute and return the ranked answer list for the current state.
-    fn get_all_answers(&mut self) -> PyResult<Vec<AnswerPossibility>> {
-        if self.remaining_words.is_empty() {
-            return Ok(vec![]);
-        }
-        self.all_answers =
-            get_all_answers_core(&self.remaining_words, &self.valid_guesses)?;
-        Ok(self.all_answers.clone())
+    ///
+    /// `limit` keeps only the best `limit` answers; it defaults to
+    /// `answer_limit`.  `time_budget_ms` (default: `time_budget_ms`) stops
+    /// scoring once the budget runs out; `AnswerList.exact` tells whether
+    /// every candidate was scored.  Setting `cancel` stops scoring and
+    /// raises `Cancelled`.  `progress(done, total)` is called with the
+    /// number of candidates scored, at most every 100 ms.
+    #[pyo3(signature = (limit=None, time_budget_ms=None, cancel=None, progress=None))]
+    fn get_all_answers(
+        slf: Py<Self>,
+        py: Python<'_>,
+        limit: Option<usize>,
+        time_budget_ms: Option<f64>,
+        cancel: Option<CancelToken>,
+        progress: Option<PyObject>,
+    ) -> PyResult<AnswerList> {
+        let (limit, deadline) = {
+            let mut this = slf.borrow_mut(py);
+            if this.remaining.is_empty() {
+                // A ranking from before the last guess would offer stale answers
+                this.all_answers = Arc::default();
+                return Ok(AnswerList::new(Arc::default()));
+            }
+            (
+                limit.or(this.answer_limit),
+                deadline_after(time_budget_ms.or(this.time_budget_ms)),
+            )
+        };
+        let ranking = Self::rerank(&slf, py, limit, deadline, cancel, progress)?;
+        Ok(AnswerList::new(ranking))
+    }
+
+    /// Ranked answers from the last computation, best first.
+    ///
+    /// Returns a lightweight view: entries are converted to Python objects
+    /// only when indexed or iterated.
+    #[getter]
+    fn all_answers(&self) -> AnswerList {
+        AnswerList::new(Arc::clone(&self.all_answers))
+    }
+
+    /// The top-ranked guess, or `None` before any answers are computed.
+    #[getter]
+    fn best_word(&self) -> Option<String> {
+        self.all_answers.answers.first().map(|ap| ap.word.clone())
+    }
+
+    /// Fitness score of each word in `all_answers`, in ranking order, as a
+    /// `float64` buffer.
+    fn fitness_scores(&self) -> ArrayBuffer {
+        ArrayBuffer::from_f64(
+            self.all_answers
+                .answers
+                .iter()
+                .map(|ap| {
+                    let in_remaining = self
+                        .dictionary
+                        .id_of(&ap.word)
+                        .map_or(false, |id| self.remaining.contains(id));
+                    fitness_score(ap, in_remaining)
+                })
+                .collect(),
+        )
     }
 
     /// `True` once a guess with result "YYYYY" has been recorded.
@@ -481,28 +836,42 @@ impl Puzzle {
         self.guesses.iter().any(|g| g.result == "YYYYY")
     }
 
+    /// An independent puzzle with the same state, sharing the dictionary and
+    /// the current ranking.  Guessing on the copy leaves this puzzle
+    /// unchanged.
+    fn copy(&self) -> Self {
+        self.clone()
+    }
+
+    fn __copy__(&self) -> Self {
+        self.clone()
+    }
+
     /// Reset the puzzle back to its initial state.
     fn reset(&mut self) {
-        self.remaining_words = self.initial_remaining_words.clone();
-        self.valid_guesses = self.initial_valid_guesses.clone();
-        self.all_answers = vec![];
+        self.remaining = self.dictionary.answer_set();
+        self.allowed_guesses = self.dictionary.guess_set();
+        self.all_answers = Arc::default();
         self.guesses = vec![];
     }
 
     /// Filter `remaining_words` to only those consistent with `guess`.
     /// Accepts a [`Guess`] object (mirrors the Python API).
-    fn filter_words(&mut self, guess: &Guess) {
-        self.filter_remaining(&guess.word, &guess.result);
+    fn filter_words(slf: Py<Self>, py: Python<'_>, guess: &Guess) {
+        let (dictionary, mut remaining) = {
+            let this = slf.borrow(py);
+            (Arc::clone(&this.dictionary), this.remaining.clone())
+        };
+        py.allow_threads(|| {
+            filter_remaining(&dictionary, &mut remaining, &guess.word, &guess.result)
+        });
+        slf.borrow_mut(py).remaining = remaining;
     }
 
-    /// Build and return `all_answers_dict` as a Python `dict[str, AnswerPossibility]`.
-    /// Computed on demand so the Rust struct doesn't need to cache it.
-    fn all_answers_dict<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, pyo3::types::PyDict>> {
-        let dict = pyo3::types::PyDict::new_bound(py);
-        for ap in &self.all_answers {
-            dict.set_item(&ap.word, ap.clone().into_py(py))?;
-        }
-        Ok(dict)
+    /// Return `all_answers_dict` as a read-only `word -> AnswerPossibility` mapping.
+    /// Entries are converted only when looked up.
+    fn all_answers_dict(&self) -> AnswerMap {
+        AnswerMap::new(Arc::clone(&self.all_answers))
     }
 
     fn __str__(&self) -> String {
@@ -510,7 +879,7 @@ impl Puzzle {
         for guess in &self.guesses {
             result.push_str(&format!("\t{}\n", guess.__str__()));
         }
-        result.push_str(&format!("{} remaining words", self.remaining_words.len()));
+        result.push_str(&format!("{} remaining words", self.remaining.len()));
         result
     }
 
@@ -520,14 +889,182 @@ impl Puzzle {
 }
 
 impl Puzzle {
-    /// Internal filter, shared by `make_guess` and `filter_words`.
-    fn filter_remaining(&mut self, word: &str, result: &str) {
-        let Ok(given) = str_to_word(word) else { return };
-        self.remaining_words.retain(|w| {
-            let Ok(answer) = str_to_word(w) else { return false };
-            let feedback = score_guess_internal(&given, &answer);
-            std::str::from_utf8(&feedback).map_or(false, |s| s == result)
-        });
+    fn with_dictionary(
+        dictionary: Arc<DictionaryData>,
+        get_best_answer: bool,
+        hard_mode: bool,
+    ) -> Self {
+        Puzzle {
+            remaining: dictionary.answer_set(),
+            allowed_guesses: dictionary.guess_set(),
+            dictionary,
+            all_answers: Arc::default(),
+            guesses: vec![],
+            get_best_answer,
+            answer_limit: None,
+            time_budget_ms: None,
+            hard_mode,
+        }
+    }
+
+    /// Legal guess ids, in `valid_guesses` order.
+    fn legal_guesses(&self) -> impl Iterator<Item = WordId> + '_ {
+        self.dictionary
+            .guesses
+            .iter()
+            .copied()
+            .filter(|&id| self.allowed_guesses.contains(id))
+    }
+
+    /// Candidate guesses: remaining words first, then the other legal
+    /// guesses.  Remaining words are always legal in hard mode.
+    fn candidates(&self) -> Vec<WordId> {
+        let mut seen = self.remaining.clone();
+        let mut candidates = self.remaining.to_vec();
+        candidates.extend(self.legal_guesses().filter(|&id| seen.insert(id)));
+        candidates
+    }
+
+    fn rank_input(&self) -> RankInput {
+        RankInput {
+            dictionary: Arc::clone(&self.dictionary),
+            remaining: self.remaining.to_vec(),
+            candidates: self.candidates(),
+        }
+    }
+
+    /// Replace `all_answers` of `slf` with a new ranking and return it.  The
+    /// puzzle is only borrowed to copy its state and to store the ranking, so
+    /// Python code can read it while the ranking runs without the GIL.  A
+    /// cancelled ranking leaves it empty rather than holding the ranking of
+    /// an earlier state.
+    fn rerank(
+        slf: &Py<Self>,
+        py: Python<'_>,
+        limit: Option<usize>,
+        deadline: Option<Instant>,
+        cancel: Option<CancelToken>,
+        progress: Option<PyObject>,
+    ) -> PyResult<Arc<Ranking>> {
+        let input = slf.borrow(py).rank_input();
+        let ranking = input.rank(py, limit, deadline, cancel, progress);
+        let mut this = slf.borrow_mut(py);
+        match ranking {
+            Ok(ranking) => {
+                this.all_answers = Arc::new(ranking);
+                Ok(Arc::clone(&this.all_answers))
+            }
+            Err(error) => {
+                this.all_answers = Arc::default();
+                Err(error)
+            }
+        }
+    }
+
+    fn snapshot(&self) -> BoardSnapshot {
+        BoardSnapshot {
+            dictionary: Arc::clone(&self.dictionary),
+            remaining: self.remaining.clone(),
+            ranking: Arc::clone(&self.all_answers),
+        }
+    }
+}
+
+/// Narrow the legal hard-mode guesses in `allowed_guesses` to those reusing
+/// the hints revealed by `word`.  Each guess is a few bitset intersections.
+fn filter_guesses(
+    dictionary: &DictionaryData,
+    allowed_guesses: &mut WordSet,
+    word: &str,
+    result: &str,
+) {
+    let Ok(given) = str_to_word(word) else { return };
+    dictionary
+        .letter_index()
+        .restrict(allowed_guesses, &given, result.as_bytes());
+}
+
+/// Keep the words of `remaining` consistent with `word` and `result`,
+/// shared by `make_guess` and `filter_words`.
+///
+/// Dictionary words are looked up in the pattern table; anything else is
+/// scored directly.  A malformed `result` matches nothing.
+fn filter_remaining(
+    dictionary: &DictionaryData,
+    remaining: &mut WordSet,
+    word: &str,
+    result: &str,
+) {
+    let Ok(given) = str_to_word(word) else { return };
+    let Some(expected) = feedback_to_pattern(result.as_bytes()) else {
+        remaining.retain(|_| false);
+        return;
+    };
+    match dictionary.id_of(word) {
+        Some(guess) => remaining.retain(|id| dictionary.pattern(guess, id) == expected),
+        None => {
+            let given = PackedGuess::new(&given);
+            remaining.retain(|id| given.score(dictionary.packed[id as usize]) == expected)
+        }
+    }
+}
+
+/// Owned copy of the state a puzzle ranking reads, so the ranking can run
+/// without holding the GIL or a borrow on the puzzle.
+struct RankInput {
+    dictionary: Arc<DictionaryData>,
+    remaining: Vec<WordId>,
+    candidates: Vec<WordId>,
+}
+
+impl RankInput {
+    /// Rank the candidates.  The GIL is released while ranking runs, so
+    /// other Python threads (including other puzzles' `make_guess` calls)
+    /// keep running.  `progress` is called from this thread, see
+    /// [`run_with_progress`].
+    fn rank(
+        self,
+        py: Python<'_>,
+        limit: Option<usize>,
+        deadline: Option<Instant>,
+        cancel: Option<CancelToken>,
+        progress: Option<PyObject>,
+    ) -> PyResult<Ranking> {
+        let RankInput {
+            dictionary,
+            remaining,
+            candidates,
+        } = self;
+        let cancel = cancel.map(|token| token.flag());
+        let (answers, exact) = run_with_progress(py, progress.as_ref(), move |counter| {
+            get_all_answers_ids(
+                &dictionary,
+                &remaining,
+                &candidates,
+                limit,
+                deadline,
+                cancel.as_deref(),
+                counter,
+            )
+        })??;
+        Ok(Ranking::with_exact(answers, exact))
+    }
+}
+
+/// Owned copy of the puzzle state used by multi-puzzle scoring, so the
+/// scoring can run without holding the GIL or a borrow on the puzzle.
+struct BoardSnapshot {
+    dictionary: Arc<DictionaryData>,
+    remaining: WordSet,
+    ranking: Arc<Ranking>,
+}
+
+impl BoardSnapshot {
+    /// Whether `word` is still a possible answer.
+    fn remaining_contains(&self, word: &str) -> bool {
+        self.dictionary
+            .id_of(word)
+            .map_or(false, |id| self.remaining.contains(id))
     }
 }
 
@@ -537,9 +1074,17 @@ impl Puzzle {
 
 /// Choose the best single guess to play across all active Octordle puzzles.
 /// Mirrors Python's `get_best_guess_multiple_puzzles`.
+///
+/// The weighted scoring pass runs without the GIL.  Setting `cancel` stops
+/// it and raises `Cancelled`.  `progress(done, total)` is called with the
+/// number of words scored, at most every 100 ms.
 #[pyfunction]
+#[pyo3(signature = (puzzles, cancel=None, progress=None))]
 pub fn get_best_guess_multiple_puzzles(
+    py: Python<'_>,
     puzzles: Vec<PyRef<'_, Puzzle>>,
+    cancel: Option<CancelToken>,
+    progress: Option<PyObject>,
 ) -> PyResult<String> {
     if puzzles.is_empty() {
         return Err(pyo3::exceptions::PyValueError::new_err(
@@ -551,6 +1096,7 @@ pub fn get_best_guess_multiple_puzzles(
     if puzzles.len() == 1 {
         return puzzles[0]
             .all_answers
+            .answers
             .first()
             .map(|ap| ap.word.clone())
             .ok_or_else(|| {
@@ -562,9 +1108,10 @@ pub fn get_best_guess_multiple_puzzles(
 
     // A puzzle with exactly 1 remaining word can be solved this turn.
     for p in puzzles.iter() {
-        if p.remaining_words.len() == 1 {
+        if p.remaining.len() == 1 {
             return p
                 .all_answers
+                .answers
                 .first()
                 .map(|ap| ap.word.clone())
                 .ok_or_else(|| {
@@ -577,50 +1124,116 @@ pub fn get_best_guess_multiple_puzzles(
 
     // An answer with max_group_size == 1 guarantees a solve in the next turn.
     for p in puzzles.iter() {
-        for ap in &p.all_answers {
+        for ap in &p.all_answers.answers {
             if ap.max_group_size_cached == 1 {
                 return Ok(ap.word.clone());
             }
         }
     }
 
-    // Weighted scoring across all puzzles.
+    let boards: Vec<BoardSnapshot> = puzzles.iter().map(|p| p.snapshot()).collect();
+    drop(puzzles);
+    let cancel = cancel.map(|token| token.flag());
+    run_with_progress(py, progress.as_ref(), move |counter| {
+        best_weighted_guess(&boards, cancel.as_deref(), counter)
+    })??
+    .ok_or_else(|| pyo3::exceptions::PyValueError::new_err("no valid guesses found"))
+}
+
+/// Weighted scoring across all puzzles.  Ties go to the alphabetically
+/// last word, matching Python's `max()` over `(score, word)` tuples.
+/// Words not yet scored when `cancel` is set are skipped.  Each word scored
+/// is counted on `progress`.
+fn best_weighted_guess(
+    boards: &[BoardSnapshot],
+    cancel: Option<&AtomicBool>,
+    progress: Option<&Progress>,
+) -> PyResult<Option<String>> {
     // Puzzles with fewer remaining words (closer to solved) get higher weight,
     // matching Python: weight = (total_remaining - puzzle_remaining) / total_remaining
-    let total_remaining: usize = puzzles.iter().map(|p| p.remaining_words.len()).sum();
+    let total_remaining: usize = boards.iter().map(|b| b.remaining.len()).sum();
 
     // Collect the union of all candidate words across all puzzles.
     let mut all_words: HashSet<&str> = HashSet::new();
-    for p in puzzles.iter() {
-        for ap in &p.all_answers {
+    for b in boards {
+        for ap in &b.ranking.answers {
             all_words.insert(ap.word.as_str());
         }
     }
+    let all_words: Vec<&str> = all_words.into_iter().collect();
+    set_total(progress, all_words.len());
+
+    let best = all_words
+        .par_iter()
+        .filter(|_| !is_cancelled(cancel))
+        .map(|&word| {
+            let mut total_score = 0.0f64;
+            for b in boards {
+                let Some(ap) = b.ranking.get(word) else {
+                    continue;
+                };
+                let weight = (total_remaining - b.remaining.len()) as f64 / total_remaining as f64;
+                total_score += fitness_score(ap, b.remaining_contains(word)) * weight;
+            }
+            advance(progress);
+            (total_score, word)
+        })
+        .max_by(|a, b| a.0.total_cmp(&b.0).then_with(|| a.1.cmp(b.1)))
+        .map(|(_, word)| word.to_owned());
+    if is_cancelled(cancel) {
+        return Err(cancelled());
+    }
+    Ok(best)
+}
 
-    let mut best_score = f64::NEG_INFINITY;
-    let mut best_word = String::new();
+#[cfg(test)]
+mod tests {
+    use super::*;
 
-    for word in &all_words {
-        let mut total_score = 0.0f64;
-        for p in puzzles.iter() {
-            let Some(ap) = p.all_answers.iter().find(|a| a.word == *word) else {
-                continue;
-            };
-            let weight = (total_remaining - p.remaining_words.len()) as f64
-                / total_remaining as f64;
-            total_score +=
-                calculate_fitness_score_internal(ap, &p.remaining_words) * weight;
-        }
-        if total_score > best_score {
-            best_score = total_score;
-            best_word = (*word).to_owned();
-        }
+    #[test]
+    fn priority_order_puts_remaining_words_then_coverage_first() {
+        let words = [*b"CRANE", *b"TRACE", *b"ZZZZZ", *b"CRATE", *b"FUZZY"];
+        // Candidate positions 0..5 hold ids 2, 4, 3, 0, 1
+        let order = priority_order(&words, &[0, 1], &[2, 4, 3, 0, 1]);
+        assert_eq!(order, vec![3, 4, 2, 0, 1]);
     }
 
-    if best_word.is_empty() {
-        return Err(pyo3::exceptions::PyValueError::new_err(
-            "no valid guesses found",
-        ));
+    #[test]
+    fn setting_cancel_stops_ranking() {
+        let words: Vec<String> = ["CRANE", "TRACE", "CRATE"].map(String::from).to_vec();
+        let dictionary = Arc::new(DictionaryData::new(&words, &words).unwrap());
+        let ids: Vec<WordId> = (0..3).collect();
+        let cancel = AtomicBool::new(true);
+        let deadline = Some(Instant::now() + Duration::from_secs(60));
+        assert!(
+            get_all_answers_ids(&dictionary, &ids, &ids, None, None, Some(&cancel), None).is_err()
+        );
+        assert!(
+            get_all_answers_ids(&dictionary, &ids, &ids, None, deadline, Some(&cancel), None)
+                .is_err()
+        );
+        cancel.store(false, std::sync::atomic::Ordering::Relaxed);
+        let (answers, exact) =
+            get_all_answers_ids(&dictionary, &ids, &ids, None, None, Some(&cancel), None).unwrap();
+        assert_eq!((answers.len(), exact), (3, true));
+    }
+
+    #[test]
+    fn unrepresentable_budgets_set_no_deadline() {
+        assert!(deadline_after(None).is_none());
+        assert!(deadline_after(Some(0.0)).is_some());
+        assert!(deadline_after(Some(f64::INFINITY)).is_none());
+        assert!(deadline_after(Some(f64::MAX)).is_none());
+        assert!(deadline_after(Some(1e300)).is_none());
+    }
+
+    #[test]
+    fn ranking_counts_scored_candidates() {
+        let words: Vec<String> = ["CRANE", "TRACE", "CRATE"].map(String::from).to_vec();
+        let dictionary = Arc::new(DictionaryData::new(&words, &words).unwrap());
+        let ids: Vec<WordId> = (0..3).collect();
+        let progress = Progress::default();
+        get_all_answers_ids(&dictionary, &ids, &ids, None, None, None, Some(&progress)).unwrap();
+        assert_eq!((progress.done(), progress.total()), (3, 3));
     }
-    Ok(best_word)
 }
@@ -0,0 +1,140 @@
+use std::collections::HashMap;
+use std::ops::Range;
+use std::sync::{Arc, Mutex, OnceLock, Weak};
+
+use rayon::prelude::*;
+
+use crate::dictionary::{DictionaryData, WordId};
+use crate::pattern::{PackedGuess, Pattern};
+
+/// Every guess scored against every answer of a dictionary.
+///
+/// Row `g` holds the pattern word id `g` produces against each answer id
+/// `0..num_answers`, so a lookup is a single index into one allocation.
+/// For the bundled word lists this is about 44 MB.
+#[derive(Debug)]
+pub struct PatternTable {
+    num_answers: usize,
+    patterns: Vec<Pattern>,
+}
+
+impl PatternTable {
+    /// Score every word in `dictionary` against every answer.  Rows are
+    /// filled in parallel with the batched [`PackedGuess`] kernel.
+    pub fn build(dictionary: &DictionaryData) -> Self {
+        let num_answers = dictionary.num_answers;
+        let answers = &dictionary.packed[..num_answers];
+        let mut patterns = vec![0; dictionary.len() * num_answers];
+        if num_answers > 0 {
+            patterns
+                .par_chunks_mut(num_answers)
+                .zip(dictionary.words.par_iter())
+                .for_each(|(row, guess)| PackedGuess::new(guess).score_into(answers, row));
+        }
+        PatternTable {
+            num_answers,
+            patterns,
+        }
+    }
+
+    /// Number of answer columns.
+    pub fn num_answers(&self) -> usize {
+        self.num_answers
+    }
+
+    /// Patterns `guess` produces against each answer id, indexed by answer id.
+    pub fn row(&self, guess: WordId) -> &[Pattern] {
+        &self.patterns[self.row_range(guess)]
+    }
+
+    /// Position of `guess`'s row within [`PatternTable::patterns`].
+    pub fn row_range(&self, guess: WordId) -> Range<usize> {
+        let start = guess as usize * self.num_answers;
+        start..start + self.num_answers
+    }
+
+    /// Every row, concatenated in word id order.
+    pub fn patterns(&self) -> &[Pattern] {
+        &self.patterns
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Process-wide cache
+// ---------------------------------------------------------------------------
+
+/// Dictionary content a table was built from: the answer count and every
+/// word in id order.
+type TableKey = (usize, Vec<[u8; 5]>);
+
+/// Slot for one dictionary's table, holding it only while something else
+/// does.  Its lock is held while the table is built, so concurrent puzzles
+/// wait for a single build instead of scoring the same pairs twice.
+type TableSlot = Arc<Mutex<Weak<PatternTable>>>;
+
+/// Tables built so far in this process that are still in use.
+static TABLES: OnceLock<Mutex<HashMap<TableKey, TableSlot>>> = OnceLock::new();
+
+/// Return the table for `dictionary`'s word lists, building it on first use.
+///
+/// Dictionaries with identical contents share one table, even when they were
+/// constructed separately.  A table is dropped once no dictionary or buffer
+/// holds it, so custom word lists do not pin theirs for the life of the
+/// process.
+pub fn shared_table(dictionary: &DictionaryData) -> Arc<PatternTable> {
+    let key = (dictionary.num_answers, dictionary.words.clone());
+    let slot = {
+        let mut tables = TABLES
+            .get_or_init(Default::default)
+            .lock()
+            .unwrap_or_else(|poisoned| poisoned.into_inner());
+        if !tables.contains_key(&key) {
+            // Forget the tables nothing holds; a slot that is locked is being built
+            tables.retain(|_, slot| {
+                Arc::strong_count(slot) > 1
+                    || slot
+                        .try_lock()
+                        .map_or(true, |table| table.strong_count() > 0)
+            });
+        }
+        Arc::clone(tables.entry(key).or_default())
+    };
+    let mut table = slot.lock().unwrap_or_else(|poisoned| poisoned.into_inner());
+    if let Some(table) = table.upgrade() {
+        return table;
+    }
+    let built = Arc::new(PatternTable::build(dictionary));
+    *table = Arc::downgrade(&built);
+    built
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn dictionary(words: &[&str]) -> DictionaryData {
+        let words: Vec<String> = words.iter().map(|word| word.to_string()).collect();
+        DictionaryData::new(&words, &words).unwrap()
+    }
+
+    fn is_cached(dictionary: &DictionaryData) -> bool {
+        let key = (dictionary.num_answers, dictionary.words.clone());
+        TABLES
+            .get()
+            .map_or(false, |tables| tables.lock().unwrap().contains_key(&key))
+    }
+
+    #[test]
+    fn tables_are_shared_until_dropped() {
+        let first = dictionary(&["QAJAQ", "ZOPPO"]);
+        let table = shared_table(&first);
+        let same = shared_table(&dictionary(&["QAJAQ", "ZOPPO"]));
+        assert!(Arc::ptr_eq(&table, &same));
+        drop((table, same));
+
+        // Building a table for other word lists forgets the one nothing holds
+        let other = shared_table(&dictionary(&["XYLYL", "ZOPPO"]));
+        assert!(!is_cached(&first));
+        assert_eq!(other.num_answers(), 2);
+    }
+}
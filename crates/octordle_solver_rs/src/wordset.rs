@@ -0,0 +1,106 @@
+/// Fixed-capacity bitset over dictionary word ids.
+///
+/// Puzzles use this to track which words are still possible answers, so
+/// creating, resetting and filtering a puzzle never copies word strings.
+#[derive(Clone, Debug, PartialEq, Eq, Hash)]
+pub struct WordSet {
+    bits: Vec<u64>,
+    len: usize,
+}
+
+impl WordSet {
+    /// An empty set able to hold ids in `0..capacity`.
+    pub fn new(capacity: usize) -> Self {
+        WordSet {
+            bits: vec![0; capacity.div_ceil(64)],
+            len: 0,
+        }
+    }
+
+    /// A set holding every id in `0..end`.
+    pub fn with_prefix(capacity: usize, end: usize) -> Self {
+        let mut set = WordSet::new(capacity);
+        for id in 0..end {
+            set.insert(id as u16);
+        }
+        set
+    }
+
+    /// Insert `id`, returning `true` if it was not already present.
+    pub fn insert(&mut self, id: u16) -> bool {
+        let (block, bit) = (id as usize / 64, id as usize % 64);
+        let mask = 1u64 << bit;
+        if self.bits[block] & mask != 0 {
+            return false;
+        }
+        self.bits[block] |= mask;
+        self.len += 1;
+        true
+    }
+
+    pub fn contains(&self, id: u16) -> bool {
+        let (block, bit) = (id as usize / 64, id as usize % 64);
+        self.bits
+            .get(block)
+            .map_or(false, |b| b & (1u64 << bit) != 0)
+    }
+
+    pub fn len(&self) -> usize {
+        self.len
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.len == 0
+    }
+
+    /// Iterate ids in ascending order.
+    pub fn iter(&self) -> impl Iterator<Item = u16> + '_ {
+        self.bits.iter().enumerate().flat_map(|(block, &bits)| {
+            let mut remaining = bits;
+            std::iter::from_fn(move || {
+                if remaining == 0 {
+                    return None;
+                }
+                let bit = remaining.trailing_zeros() as usize;
+                remaining &= remaining - 1;
+                Some((block * 64 + bit) as u16)
+            })
+        })
+    }
+
+    /// Keep only the ids for which `keep` returns `true`.
+    pub fn retain(&mut self, mut keep: impl FnMut(u16) -> bool) {
+        for block in 0..self.bits.len() {
+            let mut bits = self.bits[block];
+            let mut remaining = bits;
+            while remaining != 0 {
+                let bit = remaining.trailing_zeros() as usize;
+                remaining &= remaining - 1;
+                if !keep((block * 64 + bit) as u16) {
+                    bits &= !(1u64 << bit);
+                    self.len -= 1;
+                }
+            }
+            self.bits[block] = bits;
+        }
+    }
+
+    /// Keep only the ids that are also in `other`.
+    pub fn intersect_with(&mut self, other: &WordSet) {
+        let mut len = 0;
+        for (bits, &other_bits) in self.bits.iter_mut().zip(&other.bits) {
+            *bits &= other_bits;
+            len += bits.count_ones() as usize;
+        }
+        for bits in self.bits.iter_mut().skip(other.bits.len()) {
+            *bits = 0;
+        }
+        self.len = len;
+    }
+
+    pub fn to_vec(&self) -> Vec<u16> {
+        let mut ids = Vec::with_capacity(self.len);
+        ids.extend(self.iter());
+        ids
+    }
+}
@@ -0,0 +1,212 @@
+"""asyncio facade for ranking guesses without blocking the event loop.
+
+`AsyncSolver` runs the solver on executors it owns. Concurrent requests for the same game state share one
+computation, and the computation is cancelled once every task awaiting it has been cancelled::
+
+    async with AsyncSolver() as solver:
+        answers = await solver.best_guesses([("SLATE", "NNYMY")])
+        print(answers[0].word)
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Optional, Sequence
+
+from . import backend
+from .solver import (
+    Puzzle,
+    RankedAnswers,
+    make_batch_args,
+    process_word_batch,
+    rank_batch_results,
+    start_cancellable_pool,
+)
+
+# Guesses made so far as (word, result) pairs, e.g. (("SLATE", "NNYMY"),)
+GameState = tuple[tuple[str, str], ...]
+RequestKey = tuple[GameState, Optional[int], bool]
+
+
+class _Computation:
+    """A running computation, the number of tasks awaiting it and the token that stops its Rust ranking."""
+
+    __slots__ = ("task", "waiters", "cancel")
+
+    def __init__(self, task: "asyncio.Task[Any]", cancel: Optional[Any] = None) -> None:
+        """Initialize the _Computation."""
+        self.task = task
+        self.waiters = 0
+        self.cancel = cancel
+
+
+def normalize_state(guesses: Sequence[tuple[str, str]]) -> GameState:
+    """Return `guesses` as a hashable game state with uppercase words and results.
+
+    Args:
+        guesses (Sequence[tuple[str, str]]): (word, result) pairs, e.g. [("slate", "nnymy")].
+
+    Returns:
+        GameState: The normalized state.
+    """
+    return tuple((word.upper(), result.upper()) for word, result in guesses)
+
+
+class AsyncSolver:
+    """Rank guesses for game states from asyncio code.
+
+    The Rust backend runs on a thread pool, since it releases the GIL while ranking. The Python backend filters on
+    the thread pool and scores batches of guesses on a process pool owned by this object, instead of starting a new
+    pool for every ranking.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, use_rust: Optional[bool] = None) -> None:
+        """Initialize the AsyncSolver.
+
+        Args:
+            max_workers (int, optional): Workers per executor. Defaults to the CPU count.
+            use_rust (bool, optional): Force a backend. Defaults to the Rust backend when it is available.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_rust = backend.use_rust() if use_rust is None else use_rust
+        self._threads: Optional[Executor] = None
+        self._processes: Optional[Executor] = None
+        # Checked by the process pool's workers between words
+        self._worker_cancel: Optional[Any] = None
+        self._inflight: dict[RequestKey, _Computation] = {}
+
+    async def __aenter__(self) -> "AsyncSolver":
+        """Enter the async context manager."""
+        return self
+
+    async def __aexit__(self, err_type, value, traceback) -> None:
+        """Shut down the executors."""
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the executors, cancelling work that has not started."""
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+    @property
+    def threads(self) -> Executor:
+        """Thread pool for filtering and Rust ranking, created on first use."""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="octordle-solver")
+        return self._threads
+
+    @property
+    def processes(self) -> Executor:
+        """Process pool for Python ranking, created on first use."""
+        if self._processes is None:
+            self._processes, self._worker_cancel = start_cancellable_pool(self.max_workers)
+        return self._processes
+
+    @property
+    def pending(self) -> int:
+        """Return the number of distinct computations in progress."""
+        return len(self._inflight)
+
+    async def best_guesses(
+        self, guesses: Sequence[tuple[str, str]] = (), limit: Optional[int] = None, hard_mode: bool = False
+    ) -> Sequence[Any]:
+        """Rank the next guesses for the game state reached by `guesses`.
+
+        Identical concurrent requests share one computation. Cancelling the awaiting task cancels the computation
+        unless another task is still waiting for it. A Rust ranking already running stops, and so do Python batches
+        already running once no other computation is in progress.
+
+        Args:
+            guesses (Sequence[tuple[str, str]], optional): (word, result) pairs played so far.
+            limit (int, optional): Keep only the best `limit` guesses.
+            hard_mode (bool, optional): Only rank guesses that reuse every revealed hint. Defaults to False.
+
+        Returns:
+            Sequence[AnswerPossibility]: Ranked answers, best first. Callers sharing a computation receive the same
+            object, so it must not be modified.
+        """
+        key = (normalize_state(guesses), limit, hard_mode)
+        computation = self._inflight.get(key)
+        if computation is None:
+            cancel = backend.make_cancel_token() if self.use_rust else None
+            started = _Computation(asyncio.ensure_future(self._rank(*key, cancel)), cancel)
+            self._inflight[key] = started
+            started.task.add_done_callback(lambda _: self._forget(key, started))
+            computation = started
+        computation.waiters += 1
+        try:
+            return await asyncio.shield(computation.task)
+        finally:
+            computation.waiters -= 1
+            if computation.waiters == 0 and not computation.task.done():
+                computation.task.cancel()
+                self._forget(key, computation)
+                self._stop(computation)
+
+    async def best_guess(self, guesses: Sequence[tuple[str, str]] = (), hard_mode: bool = False) -> Optional[str]:
+        """Return the top-ranked guess for the game state reached by `guesses`, or None if no word fits."""
+        answers = await self.best_guesses(guesses, limit=1, hard_mode=hard_mode)
+        return answers[0].word if len(answers) else None
+
+    def _forget(self, key: RequestKey, computation: _Computation) -> None:
+        if self._inflight.get(key) is computation:
+            del self._inflight[key]
+
+    def _stop(self, computation: _Computation) -> None:
+        """Stop the work of a cancelled computation that has already started on the executors."""
+        if computation.cancel is not None:
+            computation.cancel.set()
+        elif self._worker_cancel is not None and not self._inflight:
+            # Workers are shared, so their batches can only be stopped once no other computation needs them
+            self._worker_cancel.set()
+
+    async def _rank(
+        self, state: GameState, limit: Optional[int], hard_mode: bool, cancel: Optional[Any] = None
+    ) -> Sequence[Any]:
+        loop = asyncio.get_running_loop()
+        if self.use_rust:
+            return await loop.run_in_executor(self.threads, rank_rust, state, limit, hard_mode, cancel)
+
+        puzzle = await loop.run_in_executor(self.threads, replay_python, state, hard_mode)
+        remaining_words = puzzle.remaining_words
+        if not remaining_words:
+            return RankedAnswers([], [], [], [])
+        if len(remaining_words) == 1:
+            return RankedAnswers(remaining_words, [1], [1], remaining_words)
+        processes = self.processes
+        assert self._worker_cancel is not None
+        # Only set by a cancelled computation once no other was in progress
+        self._worker_cancel.clear()
+        batches = [
+            loop.run_in_executor(processes, process_word_batch, batch_args)
+            for batch_args in make_batch_args(remaining_words, puzzle.valid_guesses, self.max_workers)
+        ]
+        # Cancelling the gather cancels every batch that has not started yet
+        batch_results = await asyncio.gather(*batches)
+        return await loop.run_in_executor(self.threads, rank_batch_results, batch_results, remaining_words, limit)
+
+
+def replay_python(state: GameState, hard_mode: bool) -> Puzzle:
+    """Return a Python Puzzle with `state` applied and no ranking done."""
+    puzzle = Puzzle(get_best_answer=False, hard_mode=hard_mode)
+    for word, result in state:
+        puzzle.make_guess(word, result)
+    return puzzle
+
+
+def replay_rust(state: GameState, hard_mode: bool) -> Any:
+    """Return a Rust Puzzle sharing the backend dictionary with `state` applied and no ranking done."""
+    puzzle = backend.make_rust_puzzle(get_best_answer=False, hard_mode=hard_mode)
+    for word, result in state:
+        puzzle.make_guess(word, result)
+    return puzzle
+
+
+def rank_rust(state: GameState, limit: Optional[int], hard_mode: bool, cancel: Optional[Any] = None) -> Any:
+    """Apply `state` to a Rust Puzzle sharing the backend dictionary and rank its guesses.
+
+    Setting `cancel`, a token from `backend.make_cancel_token`, stops the ranking with a ``Cancelled`` error.
+    """
+    return replay_rust(state, hard_mode).get_all_answers(limit, cancel=cancel)
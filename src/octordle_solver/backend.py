@@ -6,40 +6,168 @@ creates Puzzle instances with the appropriate backend, preferring Rust
 for performance while maintaining fallback to Python.
 """
 
+from collections.abc import Callable
 from typing import Any, Optional
 
 from .dictionary import dictionary
-from .solver import Puzzle as PythonPuzzle
 
-# Module-level references to both backends
-_rust_puzzle_cls: Optional[Any] = None
-_python_puzzle_cls: Optional[Any] = PythonPuzzle
+# Backend references are resolved by __getattr__ on first use, so importing this module imports neither the Rust
+# extension nor the Python solver. Once resolved they are ordinary module attributes and can be patched as before.
+_RUST_ATTRIBUTES = ("_use_rust", "_rust_puzzle_cls", "_rust_dictionary_cls", "_rust_simulate_games")
 
-# Try to import Rust bindings
-try:
-    import octordle_solver_rs as rs
+# Shared Rust dictionary, built on first use and reused by every Rust Puzzle
+_rust_dictionary: Optional[Any] = None
 
-    _rust_puzzle_cls = rs.Puzzle
-    _use_rust = True
-except ImportError:
-    _use_rust = False
 
+def _load_rust() -> dict[str, Any]:
+    """Try to import the Rust bindings.
 
-def make_puzzle() -> Any:
+    Returns:
+        dict[str, Any]: Values for each name in ``_RUST_ATTRIBUTES``.
+    """
+    try:
+        import octordle_solver_rs as rs
+    except ImportError:
+        return {
+            "_use_rust": False,
+            "_rust_puzzle_cls": None,
+            "_rust_dictionary_cls": None,
+            "_rust_simulate_games": None,
+        }
+    return {
+        "_use_rust": True,
+        "_rust_puzzle_cls": rs.Puzzle,
+        "_rust_dictionary_cls": rs.Dictionary,
+        "_rust_simulate_games": rs.simulate_games,
+    }
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve a backend reference the first time it is read."""
+    if name in _RUST_ATTRIBUTES:
+        for attribute, value in _load_rust().items():
+            # Keep values that were set explicitly, e.g. a test forcing the Python backend
+            globals().setdefault(attribute, value)
+    elif name == "_python_puzzle_cls":
+        from .solver import Puzzle
+
+        globals()[name] = Puzzle
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return globals()[name]
+
+
+def _backend_attribute(name: str) -> Any:
+    """Read a backend reference from inside this module, resolving it if needed."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def use_rust() -> bool:
+    """Return whether puzzles use the Rust backend, importing it on first call."""
+    return bool(_backend_attribute("_use_rust"))
+
+
+def get_rust_dictionary() -> Any:
+    """Return the process-wide Rust Dictionary, building it on first use.
+
+    Returns:
+        The shared ``octordle_solver_rs.Dictionary`` instance.
+    """
+    global _rust_dictionary
+    if _rust_dictionary is None:
+        rust_dictionary_cls = _backend_attribute("_rust_dictionary_cls")
+        assert rust_dictionary_cls is not None
+        _rust_dictionary = rust_dictionary_cls(dictionary.valid_answers, dictionary.valid_guesses)
+    return _rust_dictionary
+
+
+def make_rust_puzzle(get_best_answer: bool = True, hard_mode: bool = False) -> Any:
+    """Create a Rust Puzzle sharing the process-wide Rust dictionary.
+
+    Args:
+        get_best_answer (bool, optional): Rank guesses after each guess. Defaults to True.
+        hard_mode (bool, optional): Only rank guesses that reuse every revealed hint. Defaults to False.
+
+    Returns:
+        An ``octordle_solver_rs.Puzzle`` instance.
+    """
+    rust_puzzle_cls = _backend_attribute("_rust_puzzle_cls")
+    assert rust_puzzle_cls is not None
+    return rust_puzzle_cls.from_dictionary(get_rust_dictionary(), get_best_answer=get_best_answer, hard_mode=hard_mode)
+
+
+def simulate_games(opener: str, answers: Optional[list[str]] = None) -> Any:
+    """Play every game from `opener` natively with the Rust backend.
+
+    Args:
+        opener (str): First guess of every game.
+        answers (list[str], optional): Answers to play against. Defaults to every valid answer.
+
+    Returns:
+        The ``octordle_solver_rs.SimulationResult`` of the games.
+    """
+    rust_simulate_games = _backend_attribute("_rust_simulate_games")
+    assert rust_simulate_games is not None
+    return rust_simulate_games(get_rust_dictionary(), opener, answers)
+
+
+def make_puzzle(hard_mode: bool = False) -> Any:
     """Create a backend-appropriate Puzzle instance.
 
     Returns a Rust Puzzle for performance if available, otherwise
-    returns a Python Puzzle. Both implement the same interface.
+    returns a Python Puzzle. Both implement the same interface. Rust puzzles
+    share a single dictionary, so creating one does not copy the word lists.
+
+    Args:
+        hard_mode (bool, optional): Only rank guesses that reuse every revealed hint. Defaults to False.
 
     Returns:
         A Puzzle instance (either Rust or Python backend).
     """
-    if _use_rust:
-        assert _rust_puzzle_cls is not None
-        return _rust_puzzle_cls(
-            dictionary.valid_answers,
-            dictionary.valid_guesses,
-            get_best_answer=True,
-        )
-    assert _python_puzzle_cls is not None
-    return _python_puzzle_cls(get_best_answer=True)
+    if use_rust():
+        return make_rust_puzzle(hard_mode=hard_mode)
+    python_puzzle_cls = _backend_attribute("_python_puzzle_cls")
+    assert python_puzzle_cls is not None
+    return python_puzzle_cls(get_best_answer=True, hard_mode=hard_mode)
+
+
+def make_cancel_token() -> Any:
+    """Create a cancel token for the computations of puzzles created by `make_puzzle`.
+
+    Pass it as ``cancel`` to ``make_guess``, ``get_all_answers`` or `get_best_guess_multiple_puzzles`; setting it
+    stops them with a ``Cancelled`` error. The Rust backend needs its own token, which its worker threads check
+    without the GIL; the Python backend uses a `threading.Event`. Both have ``set``, ``clear`` and ``is_set``.
+
+    Returns:
+        A ``CancelToken`` (Rust backend) or a `threading.Event` (Python backend).
+    """
+    if use_rust():
+        from octordle_solver_rs import CancelToken
+
+        return CancelToken()
+    import threading
+
+    return threading.Event()
+
+
+def get_best_guess_multiple_puzzles(
+    puzzles: list[Any], cancel: Optional[Any] = None, progress: Optional[Callable[[int, int], None]] = None
+) -> str:
+    """Get the best guess for puzzles created by `make_puzzle`, using the matching backend.
+
+    Args:
+        puzzles (list[Any]): Unsolved puzzles.
+        cancel (optional): Token from `make_cancel_token` that stops the scoring once set.
+        progress (Callable[[int, int], None], optional): Called as ``progress(done, total)`` with the number of words
+            scored, at most every 100 ms.
+
+    Returns:
+        (str): Best guess.
+    """
+    if use_rust():
+        from octordle_solver_rs import get_best_guess_multiple_puzzles as rust_get_best_guess_multiple_puzzles
+
+        return rust_get_best_guess_multiple_puzzles(puzzles, cancel, progress)
+    from .solver import get_best_guess_multiple_puzzles as python_get_best_guess_multiple_puzzles
+
+    return python_get_best_guess_multiple_puzzles(puzzles, cancel, progress)
@@ -0,0 +1,311 @@
+"""Rank many game states from a JSONL stream.
+
+Each input line is a JSON list of [word, result] pairs, or an object with ``guesses`` and optional ``id`` and
+``hard_mode`` fields::
+
+    {"id": "game-1", "guesses": [["SLATE", "NNYMY"], ["CRONY", "MYNNN"]]}
+
+Each output line holds the id (the input line number when none is given), the remaining answer count, the best guess
+with its group statistics and the top `limit` guesses, in input order. Lines are read in chunks, so memory stays
+bounded however long the input is. Within a chunk, states sharing a prefix reuse its filtered answers (its replayed
+puzzle with the Rust backend) and identical positions are ranked once.
+
+Run ``octordle-solver-batch states.jsonl > ranked.jsonl``.
+"""
+
+import argparse
+import json
+import os
+import sys
+from itertools import islice
+from time import perf_counter
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional
+
+from . import backend
+from .aio import GameState, replay_rust
+from .dictionary import dictionary
+from .server import parse_state
+from .solver import get_letter_index, process_word_batch, rank_batch_results, score_guess_cached
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_LIMIT = 5
+
+# (word, group count, largest group size), best first
+RankedRows = list[tuple[str, int, int]]
+
+
+class BatchStats:
+    """Counters for one batch run."""
+
+    __slots__ = ("states", "rankings", "errors", "elapsed")
+
+    def __init__(self) -> None:
+        """Initialize the BatchStats."""
+        self.states = 0
+        self.rankings = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def __repr__(self) -> str:
+        """Return the string representation of the statistics."""
+        return (
+            f"BatchStats({self.states} states, {self.rankings} rankings, {self.errors} errors, "
+            f"{self.states_per_second:.1f} states/s)"
+        )
+
+    @property
+    def states_per_second(self) -> float:
+        """States processed per wall-clock second."""
+        return self.states / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def parse_record(line: str, index: int) -> tuple[Any, GameState, bool]:
+    """Parse one input line.
+
+    Args:
+        line (str): JSON list of [word, result] pairs, or an object with ``guesses``, ``id`` and ``hard_mode``.
+        index (int): Line number, used as the id when the line has none.
+
+    Returns:
+        tuple[Any, GameState, bool]: The id, the normalized state and whether hard mode applies.
+
+    Raises:
+        ValueError: If the line is not a valid record.
+    """
+    record = json.loads(line)
+    if isinstance(record, list):
+        return index, parse_state(record), False
+    if not isinstance(record, dict):
+        raise ValueError("record must be a list of guesses or an object")
+    return record.get("id", index), parse_state(record.get("guesses", [])), bool(record.get("hard_mode"))
+
+
+class PrefixFilter:
+    """Remaining answers and legal guesses per game state, computed once per shared prefix."""
+
+    def __init__(self) -> None:
+        """Initialize the PrefixFilter."""
+        self._remaining: dict[GameState, list[str]] = {(): dictionary.valid_answers}
+        self._letter_index = get_letter_index(tuple(dictionary.valid_guesses))
+        self._legal: dict[GameState, int] = {(): self._letter_index.all}
+
+    def remaining(self, state: GameState) -> list[str]:
+        """Return the answers consistent with `state`."""
+        remaining = self._remaining.get(state)
+        if remaining is None:
+            word, result = state[-1]
+            remaining = [answer for answer in self.remaining(state[:-1]) if score_guess_cached(word, answer) == result]
+            self._remaining[state] = remaining
+        return remaining
+
+    def legal_guesses(self, state: GameState) -> int:
+        """Return the bitset, over ``dictionary.valid_guesses``, of the guesses allowed in hard mode after `state`."""
+        legal = self._legal.get(state)
+        if legal is None:
+            legal = self.legal_guesses(state[:-1]) & self._letter_index.hint_mask(*state[-1])
+            self._legal[state] = legal
+        return legal
+
+    def guesses(self, legal: Optional[int]) -> list[str]:
+        """Return the guesses for a `legal_guesses` bitset, or every valid guess for None."""
+        return dictionary.valid_guesses if legal is None else self._letter_index.words_for(legal)
+
+
+class PrefixReplay:
+    """Rust puzzles per game state, each replayed from the puzzle of its prefix."""
+
+    def __init__(self) -> None:
+        """Initialize the PrefixReplay."""
+        self._puzzles: dict[tuple[GameState, bool], Any] = {}
+
+    def puzzle(self, state: GameState, hard_mode: bool) -> Any:
+        """Return a new Rust puzzle with `state` applied and no ranking done."""
+        return self._replayed(state, hard_mode).copy()
+
+    def _replayed(self, state: GameState, hard_mode: bool) -> Any:
+        puzzle = self._puzzles.get((state, hard_mode))
+        if puzzle is None:
+            if state:
+                puzzle = self._replayed(state[:-1], hard_mode).copy()
+                puzzle.make_guess(*state[-1])
+            else:
+                puzzle = replay_rust(state, hard_mode)
+            self._puzzles[state, hard_mode] = puzzle
+        return puzzle
+
+
+def rank_state(args: tuple[list[str], list[str], Optional[int]]) -> RankedRows:
+    """Rank the guesses for one position.
+
+    Args:
+        args (tuple): The remaining answers, the valid guesses and the number of guesses to keep.
+
+    Returns:
+        RankedRows: The best guesses with their group statistics.
+    """
+    remaining_words, valid_guesses, limit = args
+    if len(remaining_words) <= 1:
+        return [(word, 1, 1) for word in remaining_words]
+    guesses = list(dict.fromkeys(remaining_words + valid_guesses))
+    answers = rank_batch_results([process_word_batch((guesses, remaining_words))], remaining_words, limit)
+    return list(zip(answers.words, answers.group_counts, answers.max_group_sizes))
+
+
+def rank_state_rust(args: tuple[Any, Optional[int]]) -> tuple[int, RankedRows]:
+    """Rank the guesses for one state with the Rust backend.
+
+    Args:
+        args (tuple): A Rust puzzle with the state applied, which is ranked in place, and the number of guesses to
+            keep.
+
+    Returns:
+        tuple[int, RankedRows]: The remaining answer count and the best guesses with their group statistics.
+    """
+    puzzle, limit = args
+    if not puzzle.remaining_words:
+        return 0, []
+    rows = [(answer.word, answer.group_count, answer.max_group_size) for answer in puzzle.get_all_answers(limit)]
+    return len(puzzle.remaining_words), rows
+
+
+def make_output(record_id: Any, remaining: int, rows: RankedRows) -> dict[str, Any]:
+    """Return the output record for a ranked state."""
+    best = rows[0] if rows else (None, 0, 0)
+    return {
+        "id": record_id,
+        "remaining": remaining,
+        "best_guess": best[0],
+        "group_count": best[1],
+        "max_group_size": best[2],
+        "answers": [row[0] for row in rows],
+    }
+
+
+def rank_states(
+    lines: Iterable[str],
+    limit: Optional[int] = DEFAULT_LIMIT,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    use_rust: Optional[bool] = None,
+    stats: Optional[BatchStats] = None,
+) -> Iterator[dict[str, Any]]:
+    """Rank the game state on each line of `lines`, yielding one output record per line in order.
+
+    Blank lines are skipped. Invalid lines produce a record with an ``error`` field instead of stopping the run.
+
+    Args:
+        lines (Iterable[str]): JSONL input, read `chunk_size` lines at a time.
+        limit (int, optional): Guesses to keep per state. Defaults to DEFAULT_LIMIT.
+        chunk_size (int, optional): Lines read and ranked together. Defaults to DEFAULT_CHUNK_SIZE.
+        workers (int, optional): Worker processes (threads for Rust). Defaults to the CPU count; 1 ranks in this
+            process.
+        use_rust (bool, optional): Force a backend. Defaults to the Rust backend when it is available.
+        stats (BatchStats, optional): Updated with counters as the run progresses.
+
+    Yields:
+        dict[str, Any]: One output record per input line.
+    """
+    stats = stats if stats is not None else BatchStats()
+    use_rust = backend.use_rust() if use_rust is None else use_rust
+    workers = workers or os.cpu_count() or 1
+    executor = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+        # The Rust backend releases the GIL while ranking, so threads avoid copying the dictionary into processes
+        executor = ThreadPoolExecutor(workers) if use_rust else ProcessPoolExecutor(workers)
+
+    start = perf_counter()
+    numbered = ((index, line) for index, line in enumerate(lines) if line.strip())
+    try:
+        while chunk := list(islice(numbered, chunk_size)):
+            records: list[Any] = []
+            for index, line in chunk:
+                try:
+                    records.append(parse_record(line, index))
+                except ValueError as error:
+                    records.append({"id": index, "error": str(error)})
+
+            rank_chunk = _rank_chunk_rust if use_rust else _rank_chunk_python
+            for output in rank_chunk(records, limit, executor, stats):
+                stats.states += 1
+                stats.errors += "error" in output
+                yield output
+            stats.elapsed = perf_counter() - start
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _map(executor: Optional["Executor"], fn: Callable[[Any], Any], jobs: Iterable[Any]) -> Iterator[Any]:
+    return executor.map(fn, jobs) if executor is not None else map(fn, jobs)
+
+
+def _rank_chunk_python(
+    records: list[Any], limit: Optional[int], executor: Optional["Executor"], stats: BatchStats
+) -> list[dict[str, Any]]:
+    prefixes = PrefixFilter()
+    # Positions with the same remaining answers and guesses are ranked once
+    jobs: dict[tuple[tuple[str, ...], Optional[int]], tuple[list[str], list[str], Optional[int]]] = {}
+    keys: list[Optional[tuple[tuple[str, ...], Optional[int]]]] = []
+    for record in records:
+        if isinstance(record, dict):
+            keys.append(None)
+            continue
+        _, state, hard_mode = record
+        remaining = prefixes.remaining(state)
+        legal = prefixes.legal_guesses(state) if hard_mode else None
+        key = (tuple(remaining), legal)
+        if key not in jobs:
+            jobs[key] = (remaining, prefixes.guesses(legal), limit)
+        keys.append(key)
+
+    ranked = dict(zip(jobs, _map(executor, rank_state, jobs.values())))
+    stats.rankings += len(jobs)
+    return [
+        record if key is None else make_output(record[0], len(key[0]), ranked[key])
+        for record, key in zip(records, keys)
+    ]
+
+
+def _rank_chunk_rust(
+    records: list[Any], limit: Optional[int], executor: Optional["Executor"], stats: BatchStats
+) -> list[dict[str, Any]]:
+    prefixes = PrefixReplay()
+    # Identical states are ranked once
+    keys = [None if isinstance(record, dict) else (record[1], record[2]) for record in records]
+    jobs = {key: (prefixes.puzzle(*key), limit) for key in dict.fromkeys(keys) if key is not None}
+    ranked = dict(zip(jobs, _map(executor, rank_state_rust, jobs.values())))
+    stats.rankings += len(jobs)
+    return [record if key is None else make_output(record[0], *ranked[key]) for record, key in zip(records, keys)]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Rank the states in a JSONL file or stdin and write JSONL results."""
+    parser = argparse.ArgumentParser(description="Rank the next guesses for game states read as JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of game states, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="File to write JSONL results to, or - for stdout")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Guesses to list per state")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Lines ranked together")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    stats = BatchStats()
+    source: IO[str] = sys.stdin if args.input == "-" else open(args.input)
+    sink: IO[str] = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for output in rank_states(source, args.limit, args.chunk_size, args.workers, stats=stats):
+            sink.write(json.dumps(output) + "\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
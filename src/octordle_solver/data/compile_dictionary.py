@@ -0,0 +1,13 @@
+"""Compile the text word lists into the binary dictionary loaded by ``octordle_solver.dictionary``."""
+
+from octordle_solver.dictionary import COMPILED_DICTIONARY_FILE_PATH, compile_dictionary
+
+
+def main():
+    """Rebuild ``data/dictionary.bin`` from the text word lists."""
+    content_hash = compile_dictionary(COMPILED_DICTIONARY_FILE_PATH)
+    print(f"Wrote {COMPILED_DICTIONARY_FILE_PATH} ({content_hash.hex()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,9 @@ from pathlib import Path
 
 from colorama import Fore
 
+from octordle_solver import backend
 from octordle_solver.dictionary import dictionary
-from octordle_solver.solver import Puzzle, score_guess_cached
+from octordle_solver.solver import score_guess_cached
 from octordle_solver.utils import catchtime
 
 STARTING_WORD = "SLATE"
@@ -30,7 +31,7 @@ def print_word(word, answer) -> None:
 def play_game_for_word(answer: str, starting_word: str):
     """Play out a wordle game with a given answer and starting word."""
     guess = starting_word
-    puzzle = Puzzle()
+    puzzle = backend.make_puzzle()
     num_guesses = 0
     guesses = []
 
@@ -39,21 +40,29 @@ def play_game_for_word(answer: str, starting_word: str):
         num_guesses += 1
         result = score_guess_cached(guess, answer)
         print_word(guess, answer)
-        if result == [0, 0, 0, 0, 0]:
+        if result == "YYYYY":
             break
 
         puzzle.make_guess(guess, result)
         if len(puzzle.remaining_words) < 1:
             raise RuntimeError("Unable to solve puzzle")
 
-        guess = puzzle.all_answers[0].word  # TODO: Make this a property or something
+        guess = puzzle.best_word
 
     print(f"Solved {answer} in {num_guesses} guesses")
     return num_guesses
 
 
 def solve_for_all_words(starting_word: str = STARTING_WORD):
-    """Solve wordle for all words in the dictionary."""
+    """Solve wordle for all words in the dictionary.
+
+    With the Rust backend every game is simulated natively in one call;
+    otherwise each game is played turn by turn.
+    """
+    if backend.use_rust():
+        simulation = backend.simulate_games(starting_word)
+        return list(zip(simulation.answers, memoryview(simulation.guess_counts()).tolist()))
+
     results = []
 
     for word in dictionary.valid_answers:
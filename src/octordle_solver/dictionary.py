@@ -1,29 +1,315 @@
-"""Module to load and store the dictionary of words."""
+"""Module to load and store the dictionary of words.
 
+The word lists are read from a compiled binary file (``data/dictionary.bin``) the first time they are used. The
+compiled file is built from the text files in ``data`` with ``compile-dictionary``; if it is missing the text files are
+parsed instead.
+
+Compiled format (all integers little-endian):
+
+* Header: magic ``b"OCTD"``, format version (u16), two padding bytes, then the number of unique words, answers,
+  guesses and dictionary words (u32 each), followed by the SHA-256 content hash of the three word lists.
+* The unique words as fixed-width 5-byte ASCII records, in word id order. Answers are numbered first, then guesses
+  that are not answers, then the remaining dictionary words.
+* The word ids of ``valid_answers``, ``valid_guesses`` and ``words`` in their original order (u16 each).
+
+Word ids are shared with the Rust backend: a Rust ``Dictionary`` built from ``valid_answers`` and ``valid_guesses``
+numbers its words exactly like the first entries of `Vocabulary`.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
 from pathlib import Path
+from typing import Iterable, Optional
 
 DATA_PATH = Path(__file__).parent / "data"
 DICTIONARY_FILE_PATH = DATA_PATH / "5_letter_words_spellchecked.txt"
 VALID_GUESSES_FILE_PATH = DATA_PATH / "valid_guesses.txt"
 VALID_ANSWERS_FILE_PATH = DATA_PATH / "valid_answers.txt"
+COMPILED_DICTIONARY_FILE_PATH = DATA_PATH / "dictionary.bin"
+
+MAGIC = b"OCTD"
+FORMAT_VERSION = 1
+WORD_LENGTH = 5
+HEADER = struct.Struct("<4sH2xIIII32s")
 
 
 __all__ = ["dictionary"]
 
 
+class DictionaryFormatError(ValueError):
+    """Raised when a compiled dictionary file cannot be read."""
+
+
+class WordLists:
+    """Word lists decoded from a compiled dictionary or parsed from the text files."""
+
+    __slots__ = ("words", "valid_guesses", "valid_answers", "unique_words", "content_hash")
+
+    def __init__(
+        self,
+        words: list[str],
+        valid_guesses: list[str],
+        valid_answers: list[str],
+        unique_words: list[str],
+        content_hash: bytes,
+    ) -> None:
+        """Initialize the WordLists."""
+        self.words = words
+        self.valid_guesses = valid_guesses
+        self.valid_answers = valid_answers
+        self.unique_words = unique_words
+        self.content_hash = content_hash
+
+
+class Vocabulary:
+    """Interning table mapping every dictionary word to a stable small integer id.
+
+    Ids follow `Dictionary.unique_words`, so the valid answers are ``0..len(valid_answers)``. Every word list of a
+    `Dictionary` holds the vocabulary's own string objects, so equal words are shared rather than copied.
+    """
+
+    __slots__ = ("words", "_ids")
+
+    def __init__(self, words: list[str]) -> None:
+        """Initialize the Vocabulary.
+
+        Args:
+            words (list[str]): Distinct words in id order.
+        """
+        self.words: tuple[str, ...] = tuple(words)
+        self._ids = {word: i for i, word in enumerate(self.words)}
+
+    def __len__(self) -> int:
+        """Return the number of words."""
+        return len(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        """Return whether `word` is in the vocabulary."""
+        return word in self._ids
+
+    def __repr__(self) -> str:
+        """Return the string representation of the vocabulary."""
+        return f"Vocabulary({len(self.words)} words)"
+
+    def get(self, word: str) -> Optional[int]:
+        """Return the id of `word`, or None if it is not in the vocabulary."""
+        return self._ids.get(word)
+
+    def id_of(self, word: str) -> int:
+        """Return the id of `word`.
+
+        Raises:
+            ValueError: If `word` is not in the vocabulary.
+        """
+        try:
+            return self._ids[word]
+        except KeyError:
+            raise ValueError(f"'{word}' is not in the dictionary") from None
+
+    def word(self, word_id: int) -> str:
+        """Return the word with id `word_id`."""
+        return self.words[word_id]
+
+    def ids(self, words: Iterable[str]) -> array:
+        """Return the ids of `words` as an unsigned 16-bit array.
+
+        Raises:
+            ValueError: If a word is not in the vocabulary.
+        """
+        return array("H", [self.id_of(word) for word in words])
+
+    def words_for(self, word_ids: Iterable[int]) -> list[str]:
+        """Return the words for `word_ids`."""
+        return [self.words[word_id] for word_id in word_ids]
+
+    def intern(self, word: str) -> str:
+        """Return the vocabulary's copy of `word`, or `word` itself if it is unknown."""
+        word_id = self._ids.get(word)
+        return word if word_id is None else self.words[word_id]
+
+
+def read_word_file(path: Path) -> list[str]:
+    """Read one word per line from a text file.
+
+    Args:
+        path (Path): Text file to read.
+
+    Returns:
+        list[str]: The stripped lines.
+    """
+    with open(path) as file:
+        return [word.strip() for word in file.readlines()]
+
+
+def hash_word_lists(valid_answers: list[str], valid_guesses: list[str], words: list[str]) -> bytes:
+    """Return the SHA-256 content hash of the three word lists."""
+    import hashlib
+
+    digest = hashlib.sha256()
+    for word_list in (valid_answers, valid_guesses, words):
+        digest.update("\n".join(word_list).encode("ascii"))
+        digest.update(b"\0")
+    return digest.digest()
+
+
+def number_words(valid_answers: list[str], valid_guesses: list[str], words: list[str]) -> list[str]:
+    """Return the unique words in word id order: answers, then other guesses, then other dictionary words."""
+    return list(dict.fromkeys(valid_answers + valid_guesses + words))
+
+
+def parse_text_files() -> WordLists:
+    """Parse the word lists from the text files in the data directory. Equal words share one string object."""
+    words = read_word_file(DICTIONARY_FILE_PATH)
+    valid_guesses = read_word_file(VALID_GUESSES_FILE_PATH)
+    valid_answers = read_word_file(VALID_ANSWERS_FILE_PATH)
+    unique_words = {word: word for word in number_words(valid_answers, valid_guesses, words)}
+    return WordLists(
+        [unique_words[word] for word in words],
+        [unique_words[word] for word in valid_guesses],
+        [unique_words[word] for word in valid_answers],
+        list(unique_words),
+        hash_word_lists(valid_answers, valid_guesses, words),
+    )
+
+
+def compile_dictionary(output_path: Path = COMPILED_DICTIONARY_FILE_PATH) -> bytes:
+    """Compile the text word lists into the binary dictionary format.
+
+    Args:
+        output_path (Path): Where to write the compiled dictionary.
+
+    Returns:
+        bytes: The content hash stored in the compiled file.
+    """
+    word_lists = parse_text_files()
+    ids = {word: i for i, word in enumerate(word_lists.unique_words)}
+
+    header = HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        len(word_lists.unique_words),
+        len(word_lists.valid_answers),
+        len(word_lists.valid_guesses),
+        len(word_lists.words),
+        word_lists.content_hash,
+    )
+    records = "".join(word_lists.unique_words).encode("ascii")
+    id_arrays = [
+        array("H", [ids[word] for word in word_list])
+        for word_list in (word_lists.valid_answers, word_lists.valid_guesses, word_lists.words)
+    ]
+    if sys.byteorder != "little":  # pragma: no cover
+        for id_array in id_arrays:
+            id_array.byteswap()
+
+    with open(output_path, "wb") as file:
+        file.write(header)
+        file.write(records)
+        for id_array in id_arrays:
+            file.write(id_array.tobytes())
+    return word_lists.content_hash
+
+
+def load_compiled_dictionary(path: Path = COMPILED_DICTIONARY_FILE_PATH) -> WordLists:
+    """Memory-map and decode a compiled dictionary.
+
+    Args:
+        path (Path): The compiled dictionary file.
+
+    Returns:
+        WordLists: The decoded word lists. Equal words share one string object.
+    """
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if len(data) < HEADER.size:
+            raise DictionaryFormatError(f"{path} is too short to be a compiled dictionary")
+        magic, version, num_unique, num_answers, num_guesses, num_words, content_hash = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise DictionaryFormatError(f"{path} is not a version {FORMAT_VERSION} compiled dictionary")
+
+        records_end = HEADER.size + num_unique * WORD_LENGTH
+        expected_size = records_end + 2 * (num_answers + num_guesses + num_words)
+        if len(data) != expected_size:
+            raise DictionaryFormatError(f"{path} is {len(data)} bytes, expected {expected_size}")
+
+        records = data[HEADER.size : records_end].decode("ascii")
+        ids = array("H")
+        ids.frombytes(data[records_end:expected_size])
+
+    if sys.byteorder != "little":  # pragma: no cover
+        ids.byteswap()
+
+    unique_words = [records[i : i + WORD_LENGTH] for i in range(0, len(records), WORD_LENGTH)]
+    answers_end = num_answers
+    guesses_end = answers_end + num_guesses
+    return WordLists(
+        [unique_words[i] for i in ids[guesses_end:]],
+        [unique_words[i] for i in ids[answers_end:guesses_end]],
+        [unique_words[i] for i in ids[:answers_end]],
+        unique_words,
+        content_hash,
+    )
+
+
 class Dictionary:
-    def __init__(self):
-        with open(DICTIONARY_FILE_PATH) as file:
-            self.words = file.readlines()
-        self.words = [word.strip() for word in self.words]
-
-        with open(VALID_GUESSES_FILE_PATH) as file:
-            self.valid_guesses = file.readlines()
-        self.valid_guesses = [word.strip() for word in self.valid_guesses]
-
-        with open(VALID_ANSWERS_FILE_PATH) as file:
-            self.valid_answers = file.readlines()
-        self.valid_answers = [word.strip() for word in self.valid_answers]
+    """The solver's word lists, loaded on first access.
+
+    Reads the compiled dictionary when it exists and falls back to parsing the text files otherwise. All lists share
+    the string objects of `vocabulary`.
+    """
+
+    def __init__(self, compiled_path: Optional[Path] = COMPILED_DICTIONARY_FILE_PATH) -> None:
+        """Initialize the Dictionary.
+
+        Args:
+            compiled_path (Path, optional): Compiled dictionary to load. Pass None to always parse the text files.
+        """
+        self._compiled_path = compiled_path
+        self._word_lists: Optional[WordLists] = None
+        self._vocabulary: Optional[Vocabulary] = None
+
+    def _load(self) -> WordLists:
+        if self._word_lists is None:
+            if self._compiled_path is not None and self._compiled_path.exists():
+                word_lists = load_compiled_dictionary(self._compiled_path)
+            else:
+                word_lists = parse_text_files()
+            self._vocabulary = Vocabulary(word_lists.unique_words)
+            self._word_lists = word_lists
+        return self._word_lists
+
+    @property
+    def vocabulary(self) -> Vocabulary:
+        """Interning table giving every word its id."""
+        self._load()
+        assert self._vocabulary is not None
+        return self._vocabulary
+
+    @property
+    def words(self) -> list[str]:
+        """All dictionary words."""
+        return self._load().words
+
+    @property
+    def valid_guesses(self) -> list[str]:
+        """Words accepted as guesses."""
+        return self._load().valid_guesses
+
+    @property
+    def valid_answers(self) -> list[str]:
+        """Words that can be answers."""
+        return self._load().valid_answers
+
+    @property
+    def unique_words(self) -> list[str]:
+        """Every distinct word, indexed by word id: answers first, then other guesses, then other words."""
+        return self._load().unique_words
+
+    @property
+    def content_hash(self) -> bytes:
+        """SHA-256 hash of the word lists, identifying this dictionary's contents."""
+        return self._load().content_hash
 
 
 dictionary = Dictionary()
@@ -0,0 +1,333 @@
+"""Headless game engine for playing many games against pluggable guessers.
+
+Unlike `game.Game`, nothing here reads input or prints. A guesser is any object with ``next_guess()`` and
+``feedback(word, result)`` methods; `run_games` creates one per game from a factory, plays every answer and reports
+outcome and throughput statistics. Games are split across worker processes, so factories must be picklable (a class or
+a `functools.partial` of one).
+"""
+
+import os
+import random
+from collections import Counter
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Iterable, Optional, Protocol, Sequence
+
+from .constants import STARTING_GUESS
+from .dictionary import dictionary
+from .solver import (
+    PossibilityState,
+    create_chunks,
+    get_cached_best_second_guess,
+    get_chunk_size,
+    group_stats,
+    score_guess_cached,
+)
+
+WINNING_RESULT = "YYYYY"
+DEFAULT_MAX_TURNS = 6
+RESULT_TO_STATE = {
+    "Y": PossibilityState.CORRECT.value,
+    "M": PossibilityState.MISPLACED.value,
+    "N": PossibilityState.INCORRECT.value,
+}
+
+
+class Guesser(Protocol):
+    """Strategy that picks guesses for a single game."""
+
+    def next_guess(self) -> str:
+        """Return the word to guess next."""
+        ...
+
+    def feedback(self, word: str, result: str) -> None:
+        """Receive the result of guessing `word`, e.g. "YMNNN"."""
+        ...
+
+
+GuesserFactory = Callable[[], Guesser]
+
+
+# ---------------------------------------------------------------------------
+# Guessers
+# ---------------------------------------------------------------------------
+
+
+class CandidateGuesser:
+    """Base guesser that keeps track of the answers still consistent with the feedback."""
+
+    def __init__(self) -> None:
+        """Initialize the CandidateGuesser."""
+        self.remaining_words: list[str] = dictionary.valid_answers
+
+    def next_guess(self) -> str:
+        """Return the first remaining answer."""
+        return self.remaining_words[0]
+
+    def feedback(self, word: str, result: str) -> None:
+        """Drop the answers that would not have produced `result`."""
+        self.remaining_words = [
+            answer for answer in self.remaining_words if score_guess_cached(word, answer) == result
+        ]
+
+
+class FixedGuesser(CandidateGuesser):
+    """Plays a fixed list of words, then the first remaining answer each turn."""
+
+    def __init__(self, words: Sequence[str]) -> None:
+        """Initialize the FixedGuesser.
+
+        Args:
+            words (Sequence[str]): Words to open with, in order.
+        """
+        super().__init__()
+        self._words = list(words)
+        self._turn = 0
+
+    def next_guess(self) -> str:
+        """Return the next fixed word, or the first remaining answer once they are used up."""
+        if self._turn < len(self._words) and len(self.remaining_words) > 1:
+            word = self._words[self._turn]
+        else:
+            word = super().next_guess()
+        self._turn += 1
+        return word
+
+
+class RandomGuesser(CandidateGuesser):
+    """Guesses a random remaining answer each turn."""
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """Initialize the RandomGuesser.
+
+        Args:
+            seed (int, optional): Seed for reproducible games.
+        """
+        super().__init__()
+        self._random = random.Random(seed)
+
+    def next_guess(self) -> str:
+        """Return a random remaining answer."""
+        return self._random.choice(self.remaining_words)
+
+
+@lru_cache(maxsize=None)
+def best_guess(remaining_words: tuple[str, ...]) -> str:
+    """Return the word `solver.Puzzle` would rank first for `remaining_words`.
+
+    Results are cached per process, so games that reach the same state share the ranking.
+
+    Args:
+        remaining_words (tuple[str, ...]): Answers still possible.
+
+    Returns:
+        str: The best guess.
+    """
+    if len(remaining_words) == 1:
+        return remaining_words[0]
+    guesses = dict.fromkeys(remaining_words + tuple(dictionary.valid_guesses))
+    # A guess that puts every word in its own group cannot be beaten by a later one
+    perfect_key = (-len(remaining_words), 1)
+    best_key, best_word = None, ""
+    for word in guesses:
+        group_count, max_group_size = group_stats(word, remaining_words)
+        key = (-group_count, max_group_size)
+        if best_key is None or key < best_key:
+            best_key, best_word = key, word
+            if key == perfect_key:
+                break
+    return best_word
+
+
+class SolverGuesser(CandidateGuesser):
+    """Plays the solver's strategy: the opener, then the top-ranked guess each turn.
+
+    With the default opener the second guess comes from the precomputed best second guesses.
+    """
+
+    def __init__(self, opener: str = STARTING_GUESS) -> None:
+        """Initialize the SolverGuesser.
+
+        Args:
+            opener (str, optional): First guess. Defaults to STARTING_GUESS.
+        """
+        super().__init__()
+        self._opener = opener
+        self._results: list[str] = []
+
+    def next_guess(self) -> str:
+        """Return the opener on the first turn and the solver's best guess afterwards."""
+        if not self._results:
+            return self._opener
+        if len(self._results) == 1 and self._opener == STARTING_GUESS and len(self.remaining_words) > 1:
+            possibility = [RESULT_TO_STATE[letter] for letter in self._results[0]]
+            cached = get_cached_best_second_guess(possibility)
+            if cached is not None:
+                return cached
+        return best_guess(tuple(self.remaining_words))
+
+    def feedback(self, word: str, result: str) -> None:
+        """Record `result` and drop the answers that would not have produced it."""
+        self._results.append(result)
+        super().feedback(word, result)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+class GameResult:
+    """Outcome of one headless game."""
+
+    __slots__ = ("answer", "guesses", "solved")
+
+    def __init__(self, answer: str, guesses: tuple[str, ...], solved: bool) -> None:
+        """Initialize the GameResult.
+
+        Args:
+            answer (str): The game's answer.
+            guesses (tuple[str, ...]): Every guess played, in order.
+            solved (bool): Whether the answer was guessed within the turn limit.
+        """
+        self.answer = answer
+        self.guesses = guesses
+        self.solved = solved
+
+    def __repr__(self) -> str:
+        """Return the string representation of the result."""
+        return f"GameResult(answer={self.answer!r}, guesses={self.guesses!r}, solved={self.solved!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Equality override."""
+        if not isinstance(other, GameResult):
+            return NotImplemented
+        return (self.answer, self.guesses, self.solved) == (other.answer, other.guesses, other.solved)
+
+    @property
+    def num_guesses(self) -> int:
+        """Return the number of guesses played."""
+        return len(self.guesses)
+
+
+class EngineReport:
+    """Outcome and throughput statistics for a batch of games."""
+
+    def __init__(self, results: list[GameResult], elapsed: float) -> None:
+        """Initialize the EngineReport.
+
+        Args:
+            results (list[GameResult]): One result per game, in the order the answers were given.
+            elapsed (float): Wall-clock seconds spent playing.
+        """
+        self.results = results
+        self.elapsed = elapsed
+
+    def __len__(self) -> int:
+        """Return the number of games."""
+        return len(self.results)
+
+    def __repr__(self) -> str:
+        """Return the string representation of the report."""
+        return (
+            f"EngineReport({len(self)} games, {self.win_rate:.1%} solved, "
+            f"mean {self.mean_guesses:.3f} guesses, {self.games_per_second:.1f} games/s)"
+        )
+
+    @property
+    def games_per_second(self) -> float:
+        """Games played per wall-clock second."""
+        return len(self.results) / self.elapsed if self.elapsed > 0 else float("inf")
+
+    @property
+    def win_rate(self) -> float:
+        """Fraction of games solved within the turn limit."""
+        return sum(result.solved for result in self.results) / len(self.results) if self.results else 0.0
+
+    @property
+    def mean_guesses(self) -> float:
+        """Average number of guesses in solved games."""
+        solved = [result.num_guesses for result in self.results if result.solved]
+        return sum(solved) / len(solved) if solved else 0.0
+
+    @property
+    def max_guesses(self) -> int:
+        """Most guesses any solved game needed."""
+        return max((result.num_guesses for result in self.results if result.solved), default=0)
+
+    @property
+    def distribution(self) -> Counter[int]:
+        """Return the number of solved games by guess count."""
+        return Counter(result.num_guesses for result in self.results if result.solved)
+
+    @property
+    def failures(self) -> list[str]:
+        """Answers that were not solved."""
+        return [result.answer for result in self.results if not result.solved]
+
+
+def play_game(guesser: Guesser, answer: str, max_turns: int = DEFAULT_MAX_TURNS) -> GameResult:
+    """Play one game of `guesser` against `answer`.
+
+    Args:
+        guesser (Guesser): Guesser for this game.
+        answer (str): The answer.
+        max_turns (int, optional): Guesses allowed. Defaults to DEFAULT_MAX_TURNS.
+
+    Returns:
+        GameResult: The outcome.
+    """
+    guesses: list[str] = []
+    for _ in range(max_turns):
+        word = guesser.next_guess()
+        guesses.append(word)
+        result = score_guess_cached(word, answer)
+        if result == WINNING_RESULT:
+            return GameResult(answer, tuple(guesses), True)
+        guesser.feedback(word, result)
+    return GameResult(answer, tuple(guesses), False)
+
+
+def play_games(args: tuple[GuesserFactory, list[str], int]) -> list[GameResult]:
+    """Play a batch of games, creating a fresh guesser for each.
+
+    Args:
+        args (tuple): The guesser factory, the answers and the turn limit.
+
+    Returns:
+        list[GameResult]: One result per answer.
+    """
+    guesser_factory, answers, max_turns = args
+    return [play_game(guesser_factory(), answer, max_turns) for answer in answers]
+
+
+def run_games(
+    guesser_factory: GuesserFactory,
+    answers: Optional[Iterable[str]] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    workers: Optional[int] = None,
+) -> EngineReport:
+    """Play a game against every answer and collect statistics.
+
+    Args:
+        guesser_factory (GuesserFactory): Creates the guesser for each game.
+        answers (Iterable[str], optional): Answers to play. Defaults to every valid answer.
+        max_turns (int, optional): Guesses allowed per game. Defaults to DEFAULT_MAX_TURNS.
+        workers (int, optional): Worker processes. Defaults to the CPU count; 1 plays in this process.
+
+    Returns:
+        EngineReport: Results in the order of `answers`, with timing.
+    """
+    answers = list(dictionary.valid_answers if answers is None else answers)
+    workers = workers or os.cpu_count() or 1
+    start = perf_counter()
+    if workers == 1 or len(answers) <= 1:
+        results = play_games((guesser_factory, answers, max_turns))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        batches = create_chunks(answers, get_chunk_size(len(answers), workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batch_args = [(guesser_factory, batch, max_turns) for batch in batches]
+            results = [result for batch in executor.map(play_games, batch_args) for result in batch]
+    return EngineReport(results, perf_counter() - start)
@@ -5,7 +5,7 @@ from typing import Optional, Set
 
 from colorama import Back, Style
 
-from .dictionary import Dictionary
+from .dictionary import dictionary
 from .solver import Puzzle, score_guess
 from .utils import clear_screen
 
@@ -19,7 +19,7 @@ class Game:
         Args:
             word (Optional[str], optional): The word to use for the game, if None, a random word is chosen.
         """
-        self.dictionary = Dictionary()
+        self.dictionary = dictionary
         if word is None:
             self.word = random.choice(self.dictionary.words)
         else:
@@ -0,0 +1,110 @@
+"""Measure how long the package's modules take to import.
+
+Each measurement imports a module in a fresh interpreter with ``python -X importtime`` so earlier imports do not hide
+its cost. Run ``python -m octordle_solver.importtime`` to print a report against `IMPORT_TIME_BUDGETS`.
+"""
+
+import subprocess
+import sys
+from typing import Iterable
+
+# Cumulative import time budgets in seconds. They leave headroom for slow CI machines; the point is to catch a module
+# that starts importing something heavy or loading data at import time.
+IMPORT_TIME_BUDGETS = {
+    "octordle_solver.dictionary": 0.1,
+    "octordle_solver.solver": 0.15,
+    "octordle_solver.backend": 0.15,
+}
+
+# Modules that must only be imported when they are first used
+DEFERRED_MODULES = ("colorama", "concurrent.futures", "json", "octordle_solver_rs", "PySide6")
+
+
+class ImportProfile:
+    """Result of importing a module in a fresh interpreter."""
+
+    __slots__ = ("module", "seconds", "modules")
+
+    def __init__(self, module: str, seconds: float, modules: frozenset[str]) -> None:
+        """Initialize the ImportProfile.
+
+        Args:
+            module (str): The imported module.
+            seconds (float): Cumulative time spent importing it, including its dependencies.
+            modules (frozenset[str]): Every module imported as a result.
+        """
+        self.module = module
+        self.seconds = seconds
+        self.modules = modules
+
+    def __repr__(self) -> str:
+        """Return the string representation of the profile."""
+        return f"ImportProfile(module={self.module!r}, seconds={self.seconds:.4f}, modules={len(self.modules)})"
+
+
+def profile_import(module: str, runs: int = 3) -> ImportProfile:
+    """Import `module` in `runs` fresh interpreters and keep the fastest run.
+
+    Args:
+        module (str): Dotted module name.
+        runs (int, optional): Number of interpreters to start. Defaults to 3.
+
+    Returns:
+        ImportProfile: The fastest run.
+    """
+    best = None
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        seconds = 0.0
+        modules = set()
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            name = name.strip()
+            if not cumulative.strip().isdigit():
+                continue  # Header line
+            modules.add(name)
+            if name == module:
+                seconds = int(cumulative) / 1_000_000
+        profile = ImportProfile(module, seconds, frozenset(modules))
+        if best is None or profile.seconds < best.seconds:
+            best = profile
+    assert best is not None
+    return best
+
+
+def deferred_imports(profile: ImportProfile, deferred: Iterable[str] = DEFERRED_MODULES) -> list[str]:
+    """Return the modules in `deferred` that `profile`'s import pulled in.
+
+    Args:
+        profile (ImportProfile): Profile to check.
+        deferred (Iterable[str], optional): Module names that should not be imported. Defaults to DEFERRED_MODULES.
+
+    Returns:
+        list[str]: The offending modules.
+    """
+    return [name for name in deferred if name in profile.modules]
+
+
+def main():
+    """Print the import time of each budgeted module."""
+    over_budget = False
+    for module, budget in IMPORT_TIME_BUDGETS.items():
+        profile = profile_import(module)
+        eager = deferred_imports(profile)
+        status = "ok" if profile.seconds <= budget and not eager else "OVER"
+        over_budget |= status != "ok"
+        print(f"{module:<30} {profile.seconds * 1000:7.1f} ms (budget {budget * 1000:.0f} ms) {status}")
+        if eager:
+            print(f"    imports deferred modules: {', '.join(eager)}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""Local HTTP/JSON solver service.
+
+One long-lived process keeps the dictionary, the Rust pattern table and recent rankings warm, so short-lived clients
+skip the cold start. Requests are served concurrently on threads. Run ``octordle-solver-server`` and POST JSON:
+
+* ``/best-guess``: ``{"guesses": [["SLATE", "NNYMY"]], "limit": 10, "hard_mode": false}`` returns the ranked guesses
+  and the remaining answer count. With ``"time_budget_ms"`` ranking stops when the budget runs out, and ``exact`` in
+  the response tells whether every candidate was scored.
+* ``/filter``: ``{"guesses": [...], "hard_mode": false}`` returns the remaining answers.
+* ``/multi-board``: ``{"boards": [[["SLATE", "NNYMY"]], ...]}`` returns the best single guess for every unsolved
+  board.
+
+``GET /metrics`` reports request counts, latency percentiles and throughput per endpoint; ``GET /health`` returns
+``{"status": "ok"}``.
+"""
+
+import argparse
+import json
+import math
+import os
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional, Union
+
+from . import backend
+from .aio import GameState, normalize_state, replay_python, replay_rust
+from .dictionary import dictionary
+from .solver import (
+    RankedAnswers,
+    get_best_guess_multiple_puzzles,
+    iter_all_answers,
+    load_best_second_guesses,
+    make_batch_args,
+    process_word_batch,
+    rank_batch_results,
+    start_cancellable_pool,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_LIMIT = 10
+LATENCY_WINDOW = 1024
+
+# Ranked answers of either backend: a `RankedAnswers` or a Rust `AnswerList`, both with `exact`
+Ranking = Union[RankedAnswers, Any]
+
+
+class BadRequest(ValueError):
+    """Raised for a request the service cannot answer."""
+
+
+class EndpointMetrics:
+    """Request count, errors and recent latencies of one endpoint."""
+
+    __slots__ = ("requests", "errors", "total_seconds", "latencies")
+
+    def __init__(self) -> None:
+        """Initialize the EndpointMetrics."""
+        self.requests = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def snapshot(self, uptime: float) -> dict[str, Any]:
+        """Return the metrics as JSON-ready values, with latencies in milliseconds."""
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_second": self.requests / uptime if uptime > 0 else 0.0,
+            "mean_ms": self.total_seconds / self.requests * 1000 if self.requests else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+
+class SolverService:
+    """Thread-safe solver state shared by every request.
+
+    Replayed puzzles and their rankings are kept in an LRU cache keyed by game state, so repeated states, such as
+    every client's opening move, are ranked once.
+    """
+
+    def __init__(
+        self, cache_size: int = DEFAULT_CACHE_SIZE, max_workers: Optional[int] = None, use_rust: Optional[bool] = None
+    ) -> None:
+        """Initialize the SolverService.
+
+        Args:
+            cache_size (int, optional): Number of ranked game states to keep. Defaults to DEFAULT_CACHE_SIZE.
+            max_workers (int, optional): Worker processes for Python ranking. Defaults to the CPU count.
+            use_rust (bool, optional): Force a backend. Defaults to the Rust backend when it is available.
+        """
+        self.use_rust = backend.use_rust() if use_rust is None else use_rust
+        self.cache_size = cache_size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.started = time.perf_counter()
+        self._cache: OrderedDict[tuple[GameState, bool], tuple[Any, Ranking]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._metrics: dict[str, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+        self._processes: Optional[ProcessPoolExecutor] = None
+        # Checked by the worker processes between words, and the number of Python rankings using them
+        self._worker_cancel: Optional[Any] = None
+        self._python_rankings = 0
+
+    def warm(self) -> None:
+        """Load the word lists, the best second guesses and, with the Rust backend, the pattern table."""
+        dictionary.vocabulary
+        load_best_second_guesses()
+        if self.use_rust:
+            backend.get_rust_dictionary().pattern_table()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._processes is not None:
+            self._processes.shutdown(cancel_futures=True)
+            self._processes = None
+
+    # Solving
+
+    def _replay(self, state: GameState, hard_mode: bool) -> Any:
+        return replay_rust(state, hard_mode) if self.use_rust else replay_python(state, hard_mode)
+
+    def _rank_python(self, puzzle: Any, time_budget_ms: Optional[float]) -> RankedAnswers:
+        remaining_words = puzzle.remaining_words
+        if len(remaining_words) <= 1:
+            ones = [1] * len(remaining_words)
+            return RankedAnswers(remaining_words, ones, ones, remaining_words)
+        with self._lock:
+            if self._processes is None:
+                self._processes, self._worker_cancel = start_cancellable_pool(self.max_workers)
+            processes, worker_cancel = self._processes, self._worker_cancel
+            assert worker_cancel is not None
+            if self._python_rankings == 0:
+                # Only set once no ranking was in progress
+                worker_cancel.clear()
+            self._python_rankings += 1
+        try:
+            if time_budget_ms is not None:
+                deadline = time.monotonic() + time_budget_ms / 1000
+                rankings = iter_all_answers(
+                    remaining_words,
+                    puzzle.valid_guesses,
+                    limit=0,
+                    num_workers=self.max_workers,
+                    deadline=deadline,
+                    executor=processes,
+                )
+                return deque(rankings, maxlen=1)[0]
+            batch_args = make_batch_args(remaining_words, puzzle.valid_guesses, self.max_workers)
+            return rank_batch_results(processes.map(process_word_batch, batch_args), remaining_words)
+        finally:
+            with self._lock:
+                self._python_rankings -= 1
+                if self._python_rankings == 0:
+                    # Workers are shared, so batches still scoring a ranking cut short by its deadline are only
+                    # stopped once no other ranking needs them
+                    worker_cancel.set()
+
+    def ranked_puzzle(
+        self, state: GameState, hard_mode: bool = False, time_budget_ms: Optional[float] = None
+    ) -> tuple[Any, Ranking]:
+        """Return the puzzle for `state` with its guesses ranked, from the cache when possible.
+
+        Args:
+            state (GameState): Guesses played so far.
+            hard_mode (bool, optional): Only rank guesses that reuse every revealed hint. Defaults to False.
+            time_budget_ms (float, optional): Stop ranking after this many milliseconds. Rankings cut short are not
+                cached.
+
+        Returns:
+            tuple[Any, Ranking]: The puzzle, which must not be modified, and its ranked answers.
+        """
+        key = (state, hard_mode)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._cache_hits += 1
+                return cached
+            self._cache_misses += 1
+
+        try:
+            puzzle = self._replay(state, hard_mode)
+        except (TypeError, ValueError) as error:
+            raise BadRequest(str(error)) from error
+        if self.use_rust:
+            answers = puzzle.get_all_answers(time_budget_ms=time_budget_ms)
+        else:
+            answers = self._rank_python(puzzle, time_budget_ms)
+            puzzle.all_answers = answers
+            puzzle.all_answers_dict = answers.by_word()
+
+        entry = (puzzle, answers)
+        if not answers.exact:
+            return entry
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def best_guess(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Handle a ``/best-guess`` request."""
+        limit = request.get("limit", DEFAULT_LIMIT)
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise BadRequest("limit must be a non-negative integer or null")
+        time_budget_ms = request.get("time_budget_ms")
+        if time_budget_ms is not None and (
+            not isinstance(time_budget_ms, (int, float)) or not math.isfinite(time_budget_ms) or time_budget_ms < 0
+        ):
+            raise BadRequest("time_budget_ms must be a non-negative finite number or null")
+        state = parse_state(request.get("guesses", []))
+        puzzle, answers = self.ranked_puzzle(state, bool(request.get("hard_mode")), time_budget_ms)
+        return {
+            "remaining": len(puzzle.remaining_words),
+            "exact": answers.exact,
+            "answers": [
+                {"word": answer.word, "group_count": answer.group_count, "max_group_size": answer.max_group_size}
+                for answer in answers[:limit]
+            ],
+        }
+
+    def filter(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Handle a ``/filter`` request."""
+        state = parse_state(request.get("guesses", []))
+        try:
+            puzzle = self._replay(state, bool(request.get("hard_mode")))
+        except (TypeError, ValueError) as error:
+            raise BadRequest(str(error)) from error
+        return {"remaining_words": list(puzzle.remaining_words)}
+
+    def multi_board(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Handle a ``/multi-board`` request."""
+        boards = request.get("boards")
+        if not isinstance(boards, list) or not boards:
+            raise BadRequest("boards must be a non-empty list of guess lists")
+        puzzles = []
+        for board in boards:
+            state = parse_state(board)
+            if state and state[-1][1] == "YYYYY":
+                continue
+            puzzle, _ = self.ranked_puzzle(state)
+            if not puzzle.remaining_words:
+                raise BadRequest("a board has no remaining answers")
+            puzzles.append(puzzle)
+        if not puzzles:
+            return {"best_guess": None}
+        if self.use_rust:
+            from octordle_solver_rs import get_best_guess_multiple_puzzles as rust_get_best_guess_multiple_puzzles
+
+            return {"best_guess": rust_get_best_guess_multiple_puzzles(puzzles)}
+        return {"best_guess": get_best_guess_multiple_puzzles(puzzles)}
+
+    # Metrics
+
+    def record(self, endpoint: str, seconds: float, error: bool) -> None:
+        """Record one handled request."""
+        with self._lock:
+            metrics = self._metrics.setdefault(endpoint, EndpointMetrics())
+            metrics.requests += 1
+            metrics.errors += error
+            metrics.total_seconds += seconds
+            metrics.latencies.append(seconds)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return latency and throughput per endpoint, plus cache statistics."""
+        uptime = time.perf_counter() - self.started
+        with self._lock:
+            return {
+                "backend": "rust" if self.use_rust else "python",
+                "uptime_seconds": uptime,
+                "cache": {"size": len(self._cache), "hits": self._cache_hits, "misses": self._cache_misses},
+                "endpoints": {endpoint: metrics.snapshot(uptime) for endpoint, metrics in self._metrics.items()},
+            }
+
+
+def parse_state(guesses: Any) -> GameState:
+    """Validate a JSON list of [word, result] pairs and normalize it.
+
+    Raises:
+        BadRequest: If `guesses` is malformed.
+    """
+    if not isinstance(guesses, list) or not all(
+        isinstance(guess, list) and len(guess) == 2 and all(isinstance(part, str) for part in guess)
+        for guess in guesses
+    ):
+        raise BadRequest("guesses must be a list of [word, result] pairs")
+    state = normalize_state(guesses)
+    for word, result in state:
+        if len(word) != 5 or len(result) != 5 or set(result) - set("YMN"):
+            raise BadRequest(f"invalid guess {word!r} with result {result!r}")
+    return state
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the server's `SolverService`."""
+
+    server: "SolverHTTPServer"
+
+    def address_string(self) -> str:
+        """Return the client address, which is empty for Unix sockets."""
+        return str(self.client_address[0]) if self.client_address else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Log only when the server is verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self) -> None:
+        """Serve ``/health`` and ``/metrics``."""
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send(HTTPStatus.OK, self.server.service.metrics())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"unknown endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        """Serve the solver endpoints."""
+        service = self.server.service
+        routes: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "/best-guess": service.best_guess,
+            "/filter": service.filter,
+            "/multi-board": service.multi_board,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"unknown endpoint {self.path}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise BadRequest("request body must be a JSON object")
+            status, payload = HTTPStatus.OK, handler(request)
+        except (BadRequest, json.JSONDecodeError) as exception:
+            status, payload = HTTPStatus.BAD_REQUEST, {"error": str(exception)}
+        except Exception as exception:  # pragma: no cover
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(exception)}
+        # Recorded before responding, so a client reading /metrics afterwards sees this request
+        service.record(self.path, time.perf_counter() - start, status != HTTPStatus.OK)
+        self._send(status, payload)
+
+    def _send(self, status: HTTPStatus, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class SolverHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding a `SolverService`."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Any, service: SolverService, verbose: bool = False) -> None:
+        """Initialize the SolverHTTPServer.
+
+        Args:
+            address (Any): (host, port) to listen on.
+            service (SolverService): Service answering the requests.
+            verbose (bool, optional): Log every request. Defaults to False.
+        """
+        self.service = service
+        self.verbose = verbose
+        super().__init__(address, SolverRequestHandler)
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class SolverUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Threaded HTTP server on a Unix socket holding a `SolverService`."""
+
+        daemon_threads = True
+
+        def __init__(self, path: str, service: SolverService, verbose: bool = False) -> None:
+            """Initialize the SolverUnixServer.
+
+            Args:
+                path (str): Socket path to listen on.
+                service (SolverService): Service answering the requests.
+                verbose (bool, optional): Log every request. Defaults to False.
+            """
+            self.service = service
+            self.verbose = verbose
+            super().__init__(path, SolverRequestHandler)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the solver service until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve the Octordle solver over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix-socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args(argv)
+
+    service = SolverService(cache_size=args.cache_size)
+    service.warm()
+    if args.unix_socket:
+        server: socketserver.BaseServer = SolverUnixServer(args.unix_socket, service, args.verbose)
+        where = args.unix_socket
+    else:
+        server = SolverHTTPServer((args.host, args.port), service, args.verbose)
+        where = f"http://{args.host}:{args.port}"
+    print(f"Serving the {'Rust' if service.use_rust else 'Python'} solver on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.unix_socket:
+            os.unlink(args.unix_socket)
+
+
+if __name__ == "__main__":
+    main()
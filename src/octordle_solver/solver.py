@@ -1,26 +1,76 @@
 """Solve Wordle puzzles."""
 
-from colorama import Back, Style
-import concurrent.futures
-import json
+import heapq
 import os
+import time
+from array import array
 from collections import Counter, defaultdict
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from enum import Enum
-from functools import cached_property, lru_cache
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Union, Sequence
-from dataclasses import dataclass
-
-from colorama import Fore
+from typing import TYPE_CHECKING, Optional, Protocol, Union, overload
 
 from .dictionary import dictionary
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, ProcessPoolExecutor
+    from multiprocessing.synchronize import Event as ProcessEvent
+
 CHUNK_TUNING_FACTOR = 0.5
+# Batches per worker when ranking with iter_all_answers; smaller batches give more frequent interim rankings
+ANYTIME_BATCHES_PER_WORKER = 4
+# Seconds between cancel token checks while waiting for worker processes
+CANCEL_POLL_INTERVAL = 0.01
+# Words a worker process scores between cancel checks
+CANCEL_CHECK_WORDS = 16
+# Shortest time between two progress reports, in seconds
+PROGRESS_INTERVAL = 0.1
 PENALTY_WEIGHT = 0.1
 REMAINING_WORD_BONUS = 2
 SECOND_GUESS_PATH = Path(__file__).parent / "data" / "best_second_guesses.json"
-with open(SECOND_GUESS_PATH, "r") as f:
-    BEST_SECOND_GUESSES = json.load(f)
+
+
+class CancelToken(Protocol):
+    """Cooperative cancellation flag, e.g. a `threading.Event`."""
+
+    def is_set(self) -> bool:
+        """Return whether the computation should stop."""
+        ...
+
+
+class Cancelled(Exception):
+    """Raised when a computation is stopped through its cancel token."""
+
+
+# Called as progress(done, total) with the number of candidates scored so far, on the thread that started the work
+ProgressCallback = Callable[[int, int], None]
+
+
+# Set in worker processes started by iter_all_answers, so process_word_batch can stop early once cancelled
+_worker_cancel_event = None
+
+
+@lru_cache(maxsize=None)
+def load_best_second_guesses() -> dict[str, str]:
+    """Load the precomputed best second guesses on first use.
+
+    Returns:
+        dict[str, str]: Best second guess keyed by the first guess's answer possibility.
+    """
+    import json
+
+    with open(SECOND_GUESS_PATH, "r") as f:
+        best_second_guesses = json.load(f)
+    vocabulary = dictionary.vocabulary
+    return {key: vocabulary.intern(word) for key, word in best_second_guesses.items()}
+
+
+def __getattr__(name: str):
+    """Load `BEST_SECOND_GUESSES` the first time it is accessed."""
+    if name == "BEST_SECOND_GUESSES":
+        return load_best_second_guesses()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class PossibilityState(Enum):
@@ -35,6 +85,8 @@ class PossibilityState(Enum):
 class Group:
     """Class to represent a group of words for a given possibility."""
 
+    __slots__ = ("words", "possibility")
+
     def __init__(self, words: list[str], possibility: Union[list[int], str, tuple[str, ...]]) -> None:
         """Initialize the Group.
 
@@ -68,23 +120,80 @@ class Group:
 
 
 class AnswerPossibility:
-    """Class representing a possible answer."""
+    """Class representing a possible answer.
+
+    Possibilities read from a `RankedAnswers` table only carry the word's statistics; their groups are generated the
+    first time `groups` is read.
+    """
+
+    __slots__ = ("word", "_groups", "_group_count", "_max_group_size", "_remaining_words")
 
     def __init__(self, word: str, groups: list[Group]):
         """Initialize the AnswerPossibility."""
         self.word = word
+        self._groups: Optional[list[Group]] = None
+        self._group_count: Optional[int] = None
+        self._max_group_size: Optional[int] = None
+        # Words the groups are generated from, for possibilities created by `from_stats`
+        self._remaining_words: Optional[tuple[str, ...]] = None
         self.groups = groups
 
-    @cached_property
-    def max_group_size(self):
+    @classmethod
+    def from_stats(
+        cls, word: str, group_count: int, max_group_size: int, remaining_words: tuple[str, ...]
+    ) -> "AnswerPossibility":
+        """Create an AnswerPossibility whose groups are generated on first access.
+
+        Args:
+            word (str): The guess.
+            group_count (int): Number of groups the guess splits `remaining_words` into.
+            max_group_size (int): Size of the largest of those groups.
+            remaining_words (tuple[str, ...]): The words the groups are generated from.
+
+        Returns:
+            (AnswerPossibility): The lazily grouped AnswerPossibility.
+        """
+        answer_possibility = cls.__new__(cls)
+        answer_possibility.word = word
+        answer_possibility._groups = None
+        answer_possibility._group_count = group_count
+        answer_possibility._max_group_size = max_group_size
+        answer_possibility._remaining_words = remaining_words
+        return answer_possibility
+
+    @property
+    def groups(self) -> list[Group]:
+        """Return the groups of remaining words, one per feedback pattern."""
+        if self._groups is None:
+            self._groups = generate_groups_cached(self.word, self._remaining_words)
+        return self._groups
+
+    @groups.setter
+    def groups(self, groups: list[Group]) -> None:
+        self._groups = groups
+        self._group_count = None
+        self._max_group_size = None
+        self._remaining_words = None
+
+    @property
+    def group_count(self) -> int:
+        """Return the number of groups in this AnswerPossibility."""
+        if self._group_count is None:
+            self._group_count = len(self.groups)
+        return self._group_count
+
+    @property
+    def max_group_size(self) -> int:
         """Size of the largest group in this AnswerPossibility."""
-        if not self.groups:
-            return -1
-        return max(len(group.words) for group in self.groups)
+        if self._max_group_size is None:
+            max_group_size = max((len(group.words) for group in self.groups), default=-1)
+            self._max_group_size = max_group_size
+            return max_group_size
+        return self._max_group_size
 
     def __str__(self):
         """Return a string representation of the AnswerPossibility."""
-        result = f"{self.word}: {len(self.groups)} groups, largest group {self.max_group_size}"
+        result = f"{self.word}: {self.group_count} groups, largest group {self.max_group_size}"
         # TODO: Improve color printout here
         for group in self.groups:
             result += f"\n\t{group}"
@@ -95,12 +204,105 @@ class AnswerPossibility:
 
         If the number of groups is the same, favor smaller groups. Otherwise, favor more groups.
         """
-        if len(self.groups) == len(other.groups):
-            if len(self.groups) == 0:
+        if self.group_count == other.group_count:
+            if self.group_count == 0:
                 return True
             return self.max_group_size < other.max_group_size
 
-        return len(self.groups) > len(other.groups)
+        return self.group_count > other.group_count
+
+
+class RankedAnswers(Sequence[AnswerPossibility]):
+    """Answer possibilities sorted best to worst, stored as parallel arrays.
+
+    Only the words, group counts and largest group sizes are stored. Indexing creates an `AnswerPossibility` view on
+    demand.
+    """
+
+    __slots__ = ("words", "group_counts", "max_group_sizes", "remaining_words", "exact", "_positions")
+
+    def __init__(
+        self,
+        words: list[str],
+        group_counts: Sequence[int],
+        max_group_sizes: Sequence[int],
+        remaining_words: Sequence[str],
+        exact: bool = True,
+    ) -> None:
+        """Initialize the RankedAnswers.
+
+        Args:
+            words (list[str]): Ranked words, best first.
+            group_counts (Sequence[int]): Number of groups for each word.
+            max_group_sizes (Sequence[int]): Largest group size for each word.
+            remaining_words (Sequence[str]): Words the groups are generated from.
+            exact (bool, optional): Whether every candidate guess was scored. Defaults to True.
+        """
+        self.words = words
+        self.group_counts = array("i", group_counts)
+        self.max_group_sizes = array("i", max_group_sizes)
+        self.remaining_words = tuple(remaining_words)
+        self.exact = exact
+        self._positions: Optional[dict[str, int]] = None
+
+    def __len__(self) -> int:
+        """Return the number of ranked words."""
+        return len(self.words)
+
+    @overload
+    def __getitem__(self, index: int) -> AnswerPossibility:
+        """Return the AnswerPossibility at `index`."""
+
+    @overload
+    def __getitem__(self, index: slice) -> list[AnswerPossibility]:
+        """Return the AnswerPossibilities in `index`."""
+
+    def __getitem__(self, index):
+        """Return the AnswerPossibility at `index`, or a list of them for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return AnswerPossibility.from_stats(
+            self.words[index], self.group_counts[index], self.max_group_sizes[index], self.remaining_words
+        )
+
+    def position(self, word: str) -> Optional[int]:
+        """Return the rank of `word`, or None if it was not ranked."""
+        if self._positions is None:
+            self._positions = {ranked_word: i for i, ranked_word in enumerate(self.words)}
+        return self._positions.get(word)
+
+    def by_word(self) -> "RankedAnswersByWord":
+        """Return a read-only mapping from word to AnswerPossibility."""
+        return RankedAnswersByWord(self)
+
+
+class RankedAnswersByWord(Mapping[str, AnswerPossibility]):
+    """Read-only `word -> AnswerPossibility` view of a `RankedAnswers` table."""
+
+    __slots__ = ("_answers",)
+
+    def __init__(self, answers: RankedAnswers) -> None:
+        """Initialize the view."""
+        self._answers = answers
+
+    def __getitem__(self, word: str) -> AnswerPossibility:
+        """Return the AnswerPossibility for `word`."""
+        position = self._answers.position(word)
+        if position is None:
+            raise KeyError(word)
+        return self._answers[position]
+
+    def __contains__(self, word: object) -> bool:
+        """Return whether `word` was ranked."""
+        return isinstance(word, str) and self._answers.position(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the ranked words, best first."""
+        return iter(self._answers.words)
+
+    def __len__(self) -> int:
+        """Return the number of ranked words."""
+        return len(self._answers)
 
 
 def calculate_fitness_score(answer_possibility: AnswerPossibility, remaining_words: list[str]) -> float:
@@ -113,7 +315,7 @@ def calculate_fitness_score(answer_possibility: AnswerPossibility, remaining_wor
     Returns:
         (float): Computed score.
     """
-    fitness = len(answer_possibility.groups) - (answer_possibility.max_group_size * PENALTY_WEIGHT)
+    fitness = answer_possibility.group_count - (answer_possibility.max_group_size * PENALTY_WEIGHT)
 
     in_remaining_words = 1 if answer_possibility.word in remaining_words else 0
     remaining_words_bonus = REMAINING_WORD_BONUS * in_remaining_words
@@ -123,15 +325,35 @@ def calculate_fitness_score(answer_possibility: AnswerPossibility, remaining_wor
     return fitness
 
 
-@dataclass
 class Guess:
     """Simple class to hold and print guesses."""
 
-    word: str
-    result: str
+    __slots__ = ("word", "result")
+
+    def __init__(self, word: str, result: str) -> None:
+        """Initialize the Guess.
+
+        Args:
+            word (str): The guessed word.
+            result (str): The feedback, e.g. "YMNNN".
+        """
+        self.word = word
+        self.result = result
+
+    def __repr__(self) -> str:
+        """Return the string representation of the guess."""
+        return f"Guess(word={self.word!r}, result={self.result!r})"
+
+    def __eq__(self, other: object) -> bool:
+        """Equality override."""
+        if not isinstance(other, Guess):
+            return NotImplemented
+        return self.word == other.word and self.result == other.result
 
     def __str__(self):
         """Return a colored string output of the guess."""
+        from colorama import Back, Style
+
         output_string = ""
         for letter, result in zip(self.word, self.result):
             if result == "Y":
@@ -143,31 +365,172 @@ class Guess:
         return output_string
 
 
+class LetterIndex:
+    """Bitsets of guesses by letter position and letter count, used to filter guesses in hard mode.
+
+    Bit `i` of each bitset stands for `words[i]`.
+    """
+
+    def __init__(self, words: Sequence[str]) -> None:
+        """Initialize the LetterIndex.
+
+        Args:
+            words (Sequence[str]): Guesses to index.
+        """
+        self.words = tuple(words)
+        self.all = (1 << len(self.words)) - 1
+        num_bytes = (len(self.words) + 7) // 8
+        at: dict[tuple[int, str], bytearray] = defaultdict(lambda: bytearray(num_bytes))
+        at_least: dict[tuple[str, int], bytearray] = defaultdict(lambda: bytearray(num_bytes))
+        for i, word in enumerate(self.words):
+            byte, bit = divmod(i, 8)
+            for position, letter in enumerate(word):
+                at[position, letter][byte] |= 1 << bit
+            for letter, count in Counter(word).items():
+                for n in range(1, count + 1):
+                    at_least[letter, n][byte] |= 1 << bit
+        # Words with `letter` at `position`, and words containing `letter` at least `n` times
+        self._at = {key: int.from_bytes(bits, "little") for key, bits in at.items()}
+        self._at_least = {key: int.from_bytes(bits, "little") for key, bits in at_least.items()}
+
+    def hint_mask(self, word: str, result: str) -> int:
+        """Return the guesses that reuse every hint revealed by guessing `word`.
+
+        Hard mode requires each green letter in the same position and each green or yellow letter at least as many
+        times as it was revealed.
+
+        Args:
+            word (str): The guessed word.
+            result (str): Its feedback, e.g. "YMNNN".
+
+        Returns:
+            int: Bitset of the legal guesses.
+        """
+        mask = self.all
+        revealed: Counter[str] = Counter()
+        for position, (letter, letter_result) in enumerate(zip(word, result)):
+            if letter_result == "Y":
+                mask &= self._at.get((position, letter), 0)
+            if letter_result in ("Y", "M"):
+                revealed[letter] += 1
+        for letter, count in revealed.items():
+            mask &= self._at_least.get((letter, count), 0)
+        return mask
+
+    def words_for(self, mask: int) -> list[str]:
+        """Return the words whose bits are set in `mask`."""
+        return [word for word, bit in zip(self.words, bin(mask)[:1:-1]) if bit == "1"]
+
+
+@lru_cache(maxsize=8)
+def get_letter_index(words: tuple[str, ...]) -> LetterIndex:
+    """Return the LetterIndex for `words`, building it on first use."""
+    return LetterIndex(words)
+
+
 class Puzzle:
     """Class to hold the state of a single Wordle puzzle."""
 
-    def __init__(self, get_best_answer: bool = True) -> None:
-        """Initialize the puzzle."""
+    def __init__(self, get_best_answer: bool = True, hard_mode: bool = False) -> None:
+        """Initialize the puzzle.
+
+        Args:
+            get_best_answer (bool, optional): Rank the next guesses after every guess. Defaults to True.
+            hard_mode (bool, optional): Only allow guesses that reuse every revealed hint. Defaults to False.
+        """
         self.remaining_words = dictionary.valid_answers.copy()
         self.valid_guesses = dictionary.valid_guesses.copy()
-        self.all_answers: list[AnswerPossibility] = []
-        self.all_answers_dict: dict[str, AnswerPossibility] = {}
+        self.all_answers: Sequence[AnswerPossibility] = []
+        self.all_answers_dict: Mapping[str, AnswerPossibility] = {}
         self.guesses: list[Guess] = []
+        self.hard_mode = hard_mode
+        # Stop ranking after this many milliseconds and keep the best guesses scored so far
+        self.time_budget_ms: Optional[float] = None
         self._get_best_answer = get_best_answer
-
-    def make_guess(self, word: str, result: Union[str, list[int]]):
+        # Hard mode state: bitset of the legal guesses over the words of _letter_index, and the list it produced
+        self._legal_guesses = 0
+        self._letter_index: Optional[LetterIndex] = None
+        self._filtered_guesses: Optional[list[str]] = None
+
+    def make_guess(
+        self,
+        word: str,
+        result: Union[str, list[int]],
+        cancel: Optional[CancelToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ):
         """Guess a word.
 
         Args:
             word (str): Word that was guessed.
             result (str): Result of the word being guessed.
+            cancel (CancelToken, optional): Stops ranking the next guesses once set.
+            progress (ProgressCallback, optional): Called with the number of candidates scored while ranking.
+
+        Raises:
+            Cancelled: If `cancel` was set before ranking finished. The guess stays applied.
+        """
+        self._apply_guess(word, result)
+        if self._get_best_answer:
+            self.get_all_answers(cancel=cancel, progress=progress)
+
+    def make_guess_iter(
+        self,
+        word: str,
+        result: Union[str, list[int]],
+        limit: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Iterator[RankedAnswers]:
+        """Guess a word, then rank the next guesses with `iter_all_answers`, yielding interim rankings.
+
+        The guess is applied when iteration starts. Once the generator is exhausted, `all_answers` holds the complete
+        ranking, as after `make_guess`.
+
+        Args:
+            word (str): Word that was guessed.
+            result (str): Result of the word being guessed.
+            limit (int, optional): Keep only the best `limit` guesses in the interim rankings.
+            progress (ProgressCallback, optional): Called with the number of candidates scored while ranking.
+
+        Yields:
+            (RankedAnswers): Rankings of the guesses scored so far, the last one complete.
+        """
+        self._apply_guess(word, result)
+        yield from self.iter_all_answers(limit, progress)
+
+    def copy(self) -> "Puzzle":
+        """Return an independent puzzle with the same state, sharing the current ranking.
+
+        Guessing on the copy leaves this puzzle unchanged, so a copy can be ranked in the background.
         """
+        import copy
+
+        puzzle = copy.copy(self)
+        puzzle.guesses = list(self.guesses)
+        return puzzle
+
+    def _apply_guess(self, word: str, result: Union[str, list[int]]) -> None:
         result = self._sanitize_result(result)
         guess = Guess(word, result)
         self.guesses.append(guess)
         self.filter_words(guess)
-        if self._get_best_answer:
-            self.get_all_answers()
+        if self.hard_mode:
+            self.filter_guesses(guess)
+
+    def filter_guesses(self, guess: Guess) -> None:
+        """Keep only the valid guesses that reuse every hint revealed by `guess`.
+
+        Each call narrows the previous result, so the cost does not grow with the number of guesses.
+
+        Args:
+            guess (Guess): The guess that was made
+        """
+        if self._letter_index is None or self.valid_guesses is not self._filtered_guesses:
+            # First hard-mode guess, or valid_guesses was replaced: start over from the current list
+            self._letter_index = get_letter_index(tuple(self.valid_guesses))
+            self._legal_guesses = self._letter_index.all
+        self._legal_guesses &= self._letter_index.hint_mask(guess.word, guess.result)
+        self.valid_guesses = self._filtered_guesses = self._letter_index.words_for(self._legal_guesses)
 
     def _sanitize_result(self, result: Union[str, list[int]]) -> str:
         if isinstance(result, str):
@@ -180,6 +543,10 @@ class Puzzle:
         result = "".join(mapping[r] for r in result)
         return result
 
+    def remaining_ids(self) -> array:
+        """Return the ids of the remaining words, as in `dictionary.vocabulary`, as an unsigned 16-bit array."""
+        return dictionary.vocabulary.ids(self.remaining_words)
+
     def __str__(self):
         """Return the string representation of the state of the Puzzle."""
         result = ""
@@ -188,13 +555,72 @@ class Puzzle:
         result += f"{len(self.remaining_words)} remaining words"
         return result
 
-    def get_all_answers(self) -> list[AnswerPossibility]:
-        """Get all answers for the given state."""
+    def get_all_answers(
+        self,
+        time_budget_ms: Optional[float] = None,
+        cancel: Optional[CancelToken] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Sequence[AnswerPossibility]:
+        """Get all answers for the given state.
+
+        Args:
+            time_budget_ms (float, optional): Stop ranking after this many milliseconds and keep the best guesses
+                scored so far. Defaults to `time_budget_ms`; None ranks every candidate.
+            cancel (CancelToken, optional): Stops ranking once set.
+            progress (ProgressCallback, optional): Called with the number of candidates scored while ranking.
+
+        Raises:
+            Cancelled: If `cancel` was set before ranking finished. `all_answers` is then left empty.
+        """
         if not self.remaining_words:
             return []
-        self.all_answers = get_all_answers(self.remaining_words, self.valid_guesses)
-        self.all_answers_dict = {answer.word: answer for answer in self.all_answers}
-        return self.all_answers
+        time_budget_ms = self.time_budget_ms if time_budget_ms is None else time_budget_ms
+        try:
+            answers = get_all_answers(
+                self.remaining_words,
+                self.valid_guesses,
+                time_budget_ms=time_budget_ms,
+                cancel=cancel,
+                progress=progress,
+            )
+        except Cancelled:
+            # Do not leave the ranking of an earlier state behind
+            self.all_answers = []
+            self.all_answers_dict = {}
+            raise
+        self.all_answers = answers
+        self.all_answers_dict = answers.by_word()
+        return answers
+
+    def iter_all_answers(
+        self, limit: Optional[int] = None, progress: Optional[ProgressCallback] = None
+    ) -> Iterator[RankedAnswers]:
+        """Rank the next guesses, yielding interim rankings as batches complete.
+
+        `all_answers` is cleared when ranking starts and set to the complete ranking once the generator is exhausted.
+
+        Args:
+            limit (int, optional): Keep only the best `limit` guesses in the interim rankings.
+            progress (ProgressCallback, optional): Called with the number of candidates scored as batches complete.
+
+        Yields:
+            (RankedAnswers): Rankings of the guesses scored so far, the last one complete.
+        """
+        self.all_answers = []
+        self.all_answers_dict = {}
+        answers = None
+        for answers in iter_all_answers(self.remaining_words, self.valid_guesses, limit, progress=progress):
+            yield answers
+        if answers is not None:
+            self.all_answers = answers
+            self.all_answers_dict = answers.by_word()
+
+    @property
+    def best_word(self) -> Optional[str]:
+        """Return the top-ranked guess, or None if no answers have been computed."""
+        if not self.all_answers:
+            return None
+        return self.all_answers[0].word
 
     @property
     def is_solved(self) -> bool:
@@ -208,6 +634,9 @@ class Puzzle:
         self.all_answers = []
         self.all_answers_dict = {}
         self.guesses = []
+        self._legal_guesses = 0
+        self._letter_index = None
+        self._filtered_guesses = None
 
     def filter_words(self, guess: Guess) -> None:
         """Filter the remaining words based on a guess.
@@ -233,11 +662,13 @@ def get_cached_best_second_guess(answer_possibility: list[int]) -> Optional[str]
     for i in answer_possibility:
         possibility_key += str(i)
 
-    return BEST_SECOND_GUESSES.get(possibility_key)
+    return load_best_second_guesses().get(possibility_key)
 
 
 def pretty_print_group(group: Group, word: str):  # pragma: no cover
     """Print a group in a nice format."""
+    from colorama import Fore, Style
+
     output_string = ""
     for i, letter in enumerate(word):
         if group.possibility[i] == 0:
@@ -367,63 +798,343 @@ def create_chunks(list_to_chunk: list, chunk_size: int):
         yield list_to_chunk[i : i + chunk_size]
 
 
-def process_word_batch(args) -> list[tuple[str, list[Group]]]:
-    """Generate groups for a given batch of words.
+def group_sizes(given_word: str, remaining_words: Sequence[str]) -> dict[str, int]:
+    """Count the words in each group a guess would create without building the groups.
+
+    Args:
+        given_word (str): The word to generate groups for.
+        remaining_words (Sequence[str]): The words that are still valid answers.
+
+    Returns:
+        dict[str, int]: Size of each group by its result, in the order `generate_groups` returns the groups.
+    """
+    return Counter(score_guess_cached(given_word, word) for word in remaining_words)
+
+
+def group_words(given_word: str, possibility: str, remaining_words: Sequence[str]) -> list[str]:
+    """Return the words of one group a guess would create.
+
+    Args:
+        given_word (str): The word to generate the group for.
+        possibility (str): Result shared by the words of the group, e.g. "NNYMY".
+        remaining_words (Sequence[str]): The words that are still valid answers.
+
+    Returns:
+        list[str]: The remaining words that `given_word` scores as `possibility`, in order.
+    """
+    return [word for word in remaining_words if score_guess_cached(given_word, word) == possibility]
+
+
+def group_stats(given_word: str, remaining_words: Sequence[str]) -> tuple[int, int]:
+    """Count the groups a guess would create without building them.
+
+    Args:
+        given_word (str): The word to generate groups for.
+        remaining_words (Sequence[str]): The words that are still valid answers.
+
+    Returns:
+        tuple[int, int]: Number of groups and size of the largest group (-1 if there are no groups).
+    """
+    counts = group_sizes(given_word, remaining_words)
+    return len(counts), max(counts.values(), default=-1)
+
+
+def process_word_batch(args) -> list[tuple[str, int, int]]:
+    """Compute group statistics for a given batch of words.
 
     Args:
         args (tuple): A tuple of the batch of words and the remaining words.
 
     Returns:
-        list[tuple[str, list[Group]]]: List of results - tuples of the word and list of groups.
+        list[tuple[str, int, int]]: List of results - tuples of the word, its group count and its largest group size.
     """
     words_batch, remaining_words = args
-    batch_results = []
-    for word in words_batch:
-        groups = generate_groups_cached(word, tuple(remaining_words))
-        batch_results.append((word, groups))
-    return batch_results
+    if _worker_cancel_event is None:
+        return [(word, *group_stats(word, remaining_words)) for word in words_batch]
+    results: list[tuple[str, int, int]] = []
+    for words in create_chunks(words_batch, CANCEL_CHECK_WORDS):
+        # The results of a cancelled batch are discarded, so stopping part way through is fine
+        if _worker_cancel_event.is_set():
+            break
+        results.extend((word, *group_stats(word, remaining_words)) for word in words)
+    return results
+
+
+def _init_cancel_worker(event) -> None:
+    """Process pool initializer sharing the `multiprocessing.Event` that stops `process_word_batch`."""
+    global _worker_cancel_event
+    _worker_cancel_event = event
+
+
+def start_cancellable_pool(max_workers: Optional[int] = None) -> tuple["ProcessPoolExecutor", "ProcessEvent"]:
+    """Start a process pool whose workers stop scoring their `process_word_batch` calls once an event is set.
+
+    Batches stopped this way return the statistics scored so far, so the event must only be set once no ranking
+    still needs the batches running on the pool, and cleared before new ones are submitted.
+
+    Args:
+        max_workers (int, optional): Worker processes. Defaults to the CPU count.
 
+    Returns:
+        tuple[ProcessPoolExecutor, multiprocessing.Event]: The pool, and the event its workers check.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    event = multiprocessing.Event()
+    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_cancel_worker, initargs=(event,))
+    return pool, event
 
-def get_all_answers(remaining_words: list[str], valid_guesses: Optional[list[str]] = None) -> list[AnswerPossibility]:
+
+def get_all_answers(
+    remaining_words: list[str],
+    valid_guesses: Optional[list[str]] = None,
+    time_budget_ms: Optional[float] = None,
+    cancel: Optional[CancelToken] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> RankedAnswers:
     """Get all answer sorted best to worst.
 
+    Worker processes only send back group statistics; groups are generated when an entry's `groups` is read.
+
     Args:
         remaining_words (list[str]): List of words words still possible given the game state.
         valid_guesses (list[str], optional): Valid guesses to use. If not provided, will use dictionary.valid_guesses.
+        time_budget_ms (float, optional): Stop after this many milliseconds and rank the guesses scored so far, in
+            `prioritize_guesses` order. The result's `exact` is False if some were skipped. At least one batch is
+            always scored.
+        cancel (CancelToken, optional): Checked between batches, and by the worker processes while they score.
+        progress (ProgressCallback, optional): Called with the number of candidates scored as batches complete.
 
     Returns:
-        (list[AnswerPossibility]): List of AnswerPossibility objects.
+        (RankedAnswers): Ranked AnswerPossibility table.
+
+    Raises:
+        Cancelled: If `cancel` was set before ranking finished.
     """
-    all_possibilities: list[AnswerPossibility] = []
     if len(remaining_words) == 1:
         word = remaining_words[0]
-        groups = generate_groups_cached(word, tuple(remaining_words))
-        all_possibilities = [AnswerPossibility(word, groups)]
-        return all_possibilities
+        return RankedAnswers([word], [1], [1], remaining_words)
+    if time_budget_ms is not None or cancel is not None or progress is not None:
+        deadline = None if time_budget_ms is None else time.monotonic() + time_budget_ms / 1000
+        answers = RankedAnswers([], [], [], remaining_words)
+        for answers in iter_all_answers(
+            remaining_words, valid_guesses, limit=0, deadline=deadline, cancel=cancel, progress=progress
+        ):
+            pass
+        return answers
 
-    valid_guesses = valid_guesses or dictionary.valid_guesses
+    # Imported here so that importing the solver does not pay for concurrent.futures
+    from concurrent.futures import ProcessPoolExecutor
+
+    batch_args = make_batch_args(remaining_words, valid_guesses or dictionary.valid_guesses, os.cpu_count())
+    with ProcessPoolExecutor() as executor:
+        return rank_batch_results(executor.map(process_word_batch, batch_args), remaining_words)
+
+
+def make_batch_args(
+    remaining_words: list[str], valid_guesses: list[str], num_workers: Optional[int]
+) -> list[tuple[list[str], list[str]]]:
+    """Split the candidate guesses into `process_word_batch` arguments.
+
+    Args:
+        remaining_words (list[str]): Words still possible given the game state.
+        valid_guesses (list[str]): Valid guesses to rank after the remaining words.
+        num_workers (int, optional): Number of workers the batches are shared between.
+
+    Returns:
+        list[tuple[list[str], list[str]]]: One (batch, remaining words) pair per batch.
+    """
     guesses = list(dict.fromkeys(remaining_words + valid_guesses))
-    chunk_size = get_chunk_size(len(guesses), os.cpu_count())
-    batches = list(create_chunks(guesses, chunk_size))
-    with concurrent.futures.ProcessPoolExecutor() as executor:
-        batch_args = [(batch, remaining_words) for batch in batches]
-        for batch_result in executor.map(process_word_batch, batch_args):
-            for word, groups in batch_result:
-                all_possibilities.append(AnswerPossibility(word, groups))
+    chunk_size = get_chunk_size(len(guesses), num_workers or 1)
+    return [(batch, remaining_words) for batch in create_chunks(guesses, chunk_size)]
+
+
+def rank_batch_results(
+    batch_results: Iterable[list[tuple[str, int, int]]], remaining_words: Sequence[str], limit: Optional[int] = None
+) -> RankedAnswers:
+    """Rank the group statistics returned by `process_word_batch`.
+
+    Args:
+        batch_results (Iterable[list[tuple[str, int, int]]]): Batch results, in batch order.
+        remaining_words (Sequence[str]): Words still possible given the game state.
+        limit (int, optional): Keep only the best `limit` guesses.
+
+    Returns:
+        (RankedAnswers): Ranked AnswerPossibility table.
+    """
+    words: list[str] = []
+    group_counts: list[int] = []
+    max_group_sizes: list[int] = []
+    for batch_result in batch_results:
+        for word, group_count, max_group_size in batch_result:
+            words.append(word)
+            group_counts.append(group_count)
+            max_group_sizes.append(max_group_size)
+
+    # Same order as sorting AnswerPossibility objects with reverse=True: more groups first, then smaller groups
+    def key(i: int) -> tuple[int, int]:
+        return -group_counts[i], max_group_sizes[i]
+
+    if limit is None:
+        order = sorted(range(len(words)), key=key)
+    else:
+        # Same as sorting and keeping the first `limit`, ties included, without sorting the rest
+        order = heapq.nsmallest(limit, range(len(words)), key=key)
+    return RankedAnswers(
+        [words[i] for i in order],
+        [group_counts[i] for i in order],
+        [max_group_sizes[i] for i in order],
+        remaining_words,
+    )
+
+
+def prioritize_guesses(remaining_words: Sequence[str], valid_guesses: Sequence[str]) -> list[str]:
+    """Order candidate guesses so the likely best ones are scored first.
+
+    Remaining words come first, since they can win outright. The other guesses follow by coverage: the number of
+    remaining words containing each of their distinct letters, summed.
+
+    Args:
+        remaining_words (Sequence[str]): Words still possible given the game state.
+        valid_guesses (Sequence[str]): Valid guesses to rank after the remaining words.
 
-    all_possibilities.sort(reverse=True)
+    Returns:
+        list[str]: Every distinct candidate, remaining words first.
+    """
+    letter_counts = Counter(letter for word in remaining_words for letter in set(word))
+    remaining = set(remaining_words)
+    others = [word for word in dict.fromkeys(valid_guesses) if word not in remaining]
+    others.sort(key=lambda word: -sum(letter_counts[letter] for letter in set(word)))
+    return list(dict.fromkeys(remaining_words)) + others
+
+
+def iter_all_answers(
+    remaining_words: list[str],
+    valid_guesses: Optional[list[str]] = None,
+    limit: Optional[int] = None,
+    num_workers: Optional[int] = None,
+    deadline: Optional[float] = None,
+    executor: Optional["Executor"] = None,
+    cancel: Optional[CancelToken] = None,
+    progress: Optional[ProgressCallback] = None,
+) -> Iterator[RankedAnswers]:
+    """Rank the candidate guesses, yielding a ranking of the guesses scored so far each time a batch completes.
+
+    Guesses are scored in `prioritize_guesses` order, so the early rankings usually already contain the best guesses.
+    The last ranking yielded is complete and identical to `get_all_answers`, ties included, unless the deadline
+    passed first. Interim rankings, and a last one cut short by the deadline, have `exact` set to False.
 
-    return all_possibilities
+    Args:
+        remaining_words (list[str]): Words still possible given the game state.
+        valid_guesses (list[str], optional): Valid guesses to use. If not provided, will use dictionary.valid_guesses.
+        limit (int, optional): Keep only the best `limit` guesses in the interim rankings; 0 leaves them empty without
+            ranking. The last one is complete.
+        num_workers (int, optional): Worker processes. Defaults to the CPU count.
+        deadline (float, optional): `time.monotonic()` value after which no more batches are waited for. The last
+            ranking then covers the batches completed so far, and at least the first one.
+        executor (Executor, optional): Process pool to score on instead of starting one. It is left running.
+        cancel (CancelToken, optional): Checked every CANCEL_POLL_INTERVAL seconds while waiting for batches. Worker
+            processes started here also stop scoring once it is set; batches already running on `executor` finish.
+        progress (ProgressCallback, optional): Called with no candidates scored once the batches are submitted, then
+            with the number of candidates scored each time batches complete.
+
+    Yields:
+        (RankedAnswers): Rankings of the guesses scored so far.
+
+    Raises:
+        Cancelled: If `cancel` was set before ranking finished.
+    """
+    if not remaining_words:
+        return
+    if len(remaining_words) == 1:
+        yield RankedAnswers(remaining_words, [1], [1], remaining_words)
+        return
 
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from threading import TIMEOUT_MAX
 
-def get_best_guess_multiple_puzzles(puzzles: list[Puzzle]) -> str:
+    valid_guesses = valid_guesses or dictionary.valid_guesses
+    # Results are ranked in get_all_answers' candidate order, so ties break the same way
+    positions = {word: i for i, word in enumerate(dict.fromkeys(remaining_words + valid_guesses))}
+    guesses = prioritize_guesses(remaining_words, valid_guesses)
+    num_workers = num_workers or os.cpu_count() or 1
+    chunk_size = max(1, len(guesses) // (num_workers * ANYTIME_BATCHES_PER_WORKER))
+    scored: list[Optional[tuple[str, int, int]]] = [None] * len(positions)
+
+    def ranking(exact: bool, ranking_limit: Optional[int]) -> RankedAnswers:
+        if ranking_limit == 0:
+            # Nothing to keep, e.g. get_all_answers only reads the last ranking
+            answers = RankedAnswers([], [], [], remaining_words)
+        else:
+            results = [[result for result in scored if result is not None]]
+            answers = rank_batch_results(results, remaining_words, ranking_limit)
+        answers.exact = exact
+        return answers
+
+    worker_cancel = None
+    pool = executor
+    if pool is None:
+        # Shared with the workers, which check it between words; set when the generator stops early
+        pool, worker_cancel = start_cancellable_pool(num_workers)
+    batches = create_chunks(guesses, chunk_size)
+    futures = [pool.submit(process_word_batch, (batch, remaining_words)) for batch in batches]
+    done = 0
+    try:
+        if progress is not None:
+            progress(done, len(guesses))
+        pending = set(futures)
+        while pending:
+            if cancel is not None and cancel.is_set():
+                raise Cancelled
+            timeout = None
+            # The first batch is always waited for, so a ranking is never empty
+            waited_for_first = len(pending) < len(futures)
+            if deadline is not None and waited_for_first:
+                # A deadline too far off to wait for, e.g. an infinite budget, is the same as none
+                timeout = min(max(0.0, deadline - time.monotonic()), TIMEOUT_MAX)
+            if cancel is not None:
+                timeout = CANCEL_POLL_INTERVAL if timeout is None else min(timeout, CANCEL_POLL_INTERVAL)
+            finished, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not finished:
+                if deadline is not None and waited_for_first and time.monotonic() >= deadline:
+                    break
+                continue
+            for future in finished:
+                for result in future.result():
+                    scored[positions[result[0]]] = result
+                    done += 1
+            if progress is not None:
+                progress(done, len(guesses))
+            if pending:
+                yield ranking(False, limit)
+        yield ranking(not pending, None)
+    finally:
+        # Closing the generator early, running out of time or being cancelled drops the batches that have not
+        # started, and stops the ones running in our own workers
+        for future in futures:
+            future.cancel()
+        if worker_cancel is not None:
+            worker_cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_best_guess_multiple_puzzles(
+    puzzles: list[Puzzle], cancel: Optional[CancelToken] = None, progress: Optional[ProgressCallback] = None
+) -> str:
     """Get the best guess for a list of Puzzles.
 
     Args:
         puzzles (list[Puzzle]): List of Puzzles.
+        cancel (CancelToken, optional): Checked before scoring each word.
+        progress (ProgressCallback, optional): Called with the number of words scored, at most every
+            PROGRESS_INTERVAL seconds and once scoring finishes.
 
     Returns:
         (str): Best guess.
+
+    Raises:
+        Cancelled: If `cancel` was set before scoring finished.
     """
     # If only 1 puzzle remains, return its best guess
     if len(puzzles) == 1:
@@ -447,7 +1158,13 @@ def get_best_guess_multiple_puzzles(puzzles: list[Puzzle]) -> str:
     weights = {
         puzzle: (total_remaining_words - len(puzzle.remaining_words)) / total_remaining_words for puzzle in puzzles
     }
-    for word in all_words:
+    last_report = time.monotonic()
+    for done, word in enumerate(all_words):
+        if cancel is not None and cancel.is_set():
+            raise Cancelled
+        if progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            progress(done, len(all_words))
+            last_report = time.monotonic()
         total_score = 0.0
         for puzzle in puzzles:
             answer_possibility = puzzle.all_answers_dict.get(word)
@@ -458,5 +1175,7 @@ def get_best_guess_multiple_puzzles(puzzles: list[Puzzle]) -> str:
             total_score += fitness_score * weight
 
         scored_guesses.append((total_score, word))
+    if progress is not None:
+        progress(len(all_words), len(all_words))
     best_guess = max(scored_guesses)[1]
     return best_guess
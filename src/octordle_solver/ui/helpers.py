@@ -3,10 +3,10 @@
 from enum import Enum
 import darkdetect
 
-from PySide6 import QtWidgets, QtCore
+from PySide6 import QtGui, QtWidgets, QtCore
 from PySide6.QtCore import Qt
 
-from typing import Union
+from typing import Optional, Union
 from ..solver import PossibilityState
 
 LIGHT_TILE_BORDER_COLOR = "#D3D6DA"
@@ -132,9 +132,73 @@ def style_text(text: str, colors: list[Color]) -> str:
     return styled_text
 
 
+def progress_text(done: int, total: int, elapsed: float) -> str:
+    """Describe the progress of a computation, with the time left estimated from its rate so far.
+
+    Args:
+        done (int): Work items completed, e.g. candidate guesses scored.
+        total (int): Work items in all.
+        elapsed (float): Seconds since the computation started.
+
+    Returns:
+        str: e.g. "40% (about 3 s left)", or just the percentage until the rate is known.
+    """
+    if total <= 0:
+        return ""
+    text = f"{100 * done // total}%"
+    if 0 < done < total and elapsed > 0:
+        remaining = round(elapsed * (total - done) / done)
+        text += f" (about {remaining} s left)" if remaining < 60 else f" (about {round(remaining / 60)} min left)"
+    return text
+
+
 def create_colored_label(text: str, colors: list[Color]) -> QtWidgets.QLabel:
     """Create a QLabel with colored letters."""
     label = QtWidgets.QLabel()
     label.setText(style_text(text, colors))
     label.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter)
     return label
+
+
+class ColoredWordDelegate(QtWidgets.QStyledItemDelegate):
+    """Item delegate painting a word with its letters colored by the result in `pattern_role`.
+
+    Items without a result are painted as usual.
+    """
+
+    def __init__(self, pattern_role: int, parent: Optional[QtCore.QObject] = None):
+        """Initialize the delegate.
+
+        Args:
+            pattern_role (int): Item data role holding the result, e.g. "NNYMY".
+        """
+        super().__init__(parent)
+        self.pattern_role = pattern_role
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        """Paint the item."""
+        pattern = index.data(self.pattern_role)
+        if pattern is None:
+            super().paint(painter, option, index)
+            return
+
+        option = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(option, index)
+        text = option.text
+        option.text = ""
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        # Background, selection and focus, without the text
+        style.drawControl(QtWidgets.QStyle.ControlElement.CE_ItemViewItem, option, painter, option.widget)
+
+        painter.save()
+        font = QtGui.QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        metrics = QtGui.QFontMetrics(font)
+        rect = style.subElementRect(QtWidgets.QStyle.SubElement.SE_ItemViewItemText, option, option.widget)
+        x = rect.left()
+        for letter, color in zip(text, get_word_colors(pattern)):
+            painter.setPen(QtGui.QColor(f"#{color.value}"))
+            painter.drawText(x, rect.top(), rect.width(), rect.height(), Qt.AlignLeft | Qt.AlignVCenter, letter)
+            x += metrics.horizontalAdvance(letter)
+        painter.restore()
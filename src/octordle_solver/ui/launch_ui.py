@@ -2,12 +2,11 @@
 
 from PySide6 import QtWidgets
 
-from .octordle_solver_ui import OctordleSolver
-from .wordle_solver_ui import WordleSolver
-
 
 def wordle():
     """Launch the Wordle Solver UI."""
+    from .wordle_solver_ui import WordleSolver
+
     app = QtWidgets.QApplication([])
     window = WordleSolver()
     window.show()
@@ -16,6 +15,8 @@ def wordle():
 
 def octordle():
     """Launch the Octordle Solver UI."""
+    from .octordle_solver_ui import OctordleSolver
+
     app = QtWidgets.QApplication([])
     window = OctordleSolver()
     window.show()
@@ -0,0 +1,278 @@
+"""Qt item models over solver results."""
+
+from collections.abc import Callable, Container, Mapping, Sequence
+from typing import Any, Optional
+
+from PySide6 import QtCore
+from PySide6.QtCore import Qt
+
+# Rows handed to a view at a time; more are fetched as it scrolls to the end
+FETCH_BATCH_SIZE = 256
+# Item data role holding a group's result, e.g. "NNYMY"
+PATTERN_ROLE = Qt.UserRole + 1
+
+
+class LazyListModel(QtCore.QAbstractListModel):
+    """List model that exposes its rows to views in batches as they scroll.
+
+    Subclasses hold a sequence and pass a function reading one row of it. Only the rows a view displays are read, so
+    replacing the sequence takes constant time however long it is.
+    """
+
+    def __init__(self, read_word: Callable[[int], str], parent: Optional[QtCore.QObject] = None) -> None:
+        """Initialize the model.
+
+        Args:
+            read_word (Callable[[int], str]): Return the word in a row.
+            parent (QtCore.QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self._read_word = read_word
+        self._size = 0
+        self._loaded = 0
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """Return the number of rows fetched so far."""
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """Return whether some rows have not been fetched yet."""
+        return not parent.isValid() and self._loaded < self._size
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """Fetch the next FETCH_BATCH_SIZE rows."""
+        if not self.canFetchMore(parent):
+            return
+        count = min(FETCH_BATCH_SIZE, self._size - self._loaded)
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def data(self, index: QtCore.QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """Return the word shown in a row."""
+        if role == Qt.DisplayRole and index.isValid():
+            return self.word(index.row())
+        return None
+
+    @property
+    def total_rows(self) -> int:
+        """Return the number of rows, fetched or not."""
+        return self._size
+
+    def word(self, row: int) -> str:
+        """Return the word in `row`."""
+        return self._read_word(row)
+
+    def _reset(self, size: int) -> None:
+        """Replace every row with `size` new ones and fetch the first batch."""
+        self.beginResetModel()
+        self._size = size
+        self._loaded = min(size, FETCH_BATCH_SIZE)
+        self.endResetModel()
+
+
+class WordListModel(LazyListModel):
+    """Model over a list of words, e.g. the remaining words."""
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        """Initialize the model."""
+        super().__init__(self._word_at, parent)
+        self._words: Sequence[str] = ()
+
+    @property
+    def words(self) -> Sequence[str]:
+        """Return the words shown, in order."""
+        return self._words
+
+    def set_words(self, words: Sequence[str]) -> None:
+        """Show `words`. The sequence is used as is, not copied."""
+        self._words = words
+        self._reset(len(words))
+
+    def _word_at(self, row: int) -> str:
+        return self._words[row]
+
+
+class RankedGuessModel(LazyListModel):
+    """Model for the best guess list: pinned words, then a ranking of guesses, best first.
+
+    Pinned words, such as the starting guess or a cached second guess, stay at the top unless the ranking holds them.
+    Ranked answers are read one row at a time, so the ranking is never copied or converted as a whole.
+    """
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        """Initialize the model."""
+        super().__init__(self._word_at, parent)
+        self._pinned: list[str] = []
+        # Pinned words that are not in the ranking
+        self._shown_pinned: list[str] = []
+        self._answers: Sequence[Any] = ()
+        self._index: Optional[Container[str]] = None
+
+    @property
+    def answers(self) -> Sequence[Any]:
+        """Return the ranked answers shown after the pinned words."""
+        return self._answers
+
+    def clear(self) -> None:
+        """Remove every pinned word and the ranking."""
+        self._pinned = []
+        self.set_ranking(())
+
+    def pin(self, word: str) -> None:
+        """Show `word` at the top, after the words already pinned."""
+        if word not in self._pinned:
+            self._pinned.append(word)
+            self._update()
+
+    def set_ranking(self, answers: Sequence[Any], index: Optional[Container[str]] = None) -> None:
+        """Show `answers` after the pinned words.
+
+        Args:
+            answers (Sequence[AnswerPossibility]): Ranked answers of either backend, e.g. `Puzzle.all_answers`.
+            index (Container[str], optional): The words of `answers`, e.g. `Puzzle.all_answers_dict`, used to hide
+                pinned words the ranking holds. Defaults to scanning `answers`, which is only meant for short rankings.
+        """
+        self._answers = answers
+        self._index = index
+        self._update()
+
+    def _word_at(self, row: int) -> str:
+        if row < len(self._shown_pinned):
+            return self._shown_pinned[row]
+        return self._answers[row - len(self._shown_pinned)].word
+
+    def answer(self, row: int) -> Optional[Any]:
+        """Return the ranked answer in `row`, or None for a pinned word."""
+        if row < len(self._shown_pinned):
+            return None
+        return self._answers[row - len(self._shown_pinned)]
+
+    def _update(self) -> None:
+        if self._index is None and self._pinned:
+            self._index = {answer.word for answer in self._answers}
+        index = () if self._index is None else self._index
+        self._shown_pinned = [word for word in self._pinned if word not in index]
+        self._reset(len(self._shown_pinned) + len(self._answers))
+
+
+class GroupTreeModel(QtCore.QAbstractItemModel):
+    """Tree of the groups a guess splits the remaining words into, with each group's words as its children.
+
+    Only the group sizes are needed up front. A group's words are fetched when its node is first expanded, and its
+    child rows are then added FETCH_BATCH_SIZE at a time as the view scrolls.
+    """
+
+    def __init__(self, parent: Optional[QtCore.QObject] = None) -> None:
+        """Initialize the model."""
+        super().__init__(parent)
+        self._word = ""
+        self._patterns: list[str] = []
+        self._sizes: list[int] = []
+        self._fetch_words: Optional[Callable[[str], Sequence[str]]] = None
+        # Words of each group, once fetched, and the number of child rows added so far
+        self._words: list[Optional[Sequence[str]]] = []
+        self._loaded: list[int] = []
+
+    @property
+    def word(self) -> str:
+        """Return the guess whose groups are shown."""
+        return self._word
+
+    @property
+    def group_sizes(self) -> list[int]:
+        """Return the number of words in each group, in row order."""
+        return self._sizes
+
+    def set_partition(self, word: str, sizes: Mapping[str, int], fetch_words: Callable[[str], Sequence[str]]) -> None:
+        """Show the groups of `word`.
+
+        Args:
+            word (str): The guess.
+            sizes (Mapping[str, int]): Size of each group by its result, e.g. from `solver.group_sizes`.
+            fetch_words (Callable[[str], Sequence[str]]): Return the words of the group with a given result. Called
+                when the group is first expanded.
+        """
+        self.beginResetModel()
+        self._word = word
+        self._patterns = list(sizes)
+        self._sizes = list(sizes.values())
+        self._fetch_words = fetch_words
+        self._words = [None] * len(self._patterns)
+        self._loaded = [0] * len(self._patterns)
+        self.endResetModel()
+
+    def clear(self) -> None:
+        """Remove every group."""
+        self.set_partition("", {}, lambda pattern: ())
+
+    def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        """Return the index of an item. Children carry their group's row plus one as their internal id."""
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column, parent.row() + 1 if parent.isValid() else 0)
+
+    def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:  # type: ignore[override]
+        """Return the group of a word, or an invalid index for a group."""
+        if not index.isValid() or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """Return the number of groups, or of the words of a group added so far."""
+        if not parent.isValid():
+            return len(self._patterns)
+        return self._loaded[parent.row()] if self._is_group(parent) else 0
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        """Return the number of columns."""
+        return 1
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        """Return whether an item has children, without fetching a group's words."""
+        if not parent.isValid():
+            return bool(self._patterns)
+        return self._is_group(parent) and self._sizes[parent.row()] > 0
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """Return whether a group has words that have not been added yet."""
+        return self._is_group(parent) and self._loaded[parent.row()] < self._sizes[parent.row()]
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """Add the next FETCH_BATCH_SIZE words of a group, fetching its words first if needed."""
+        if not self.canFetchMore(parent):
+            return
+        row = parent.row()
+        words = self._words[row]
+        if words is None:
+            assert self._fetch_words is not None
+            words = self._words[row] = self._fetch_words(self._patterns[row])
+            # Trust the words over the size given up front, so a short group does not stay fetchable forever
+            self._sizes[row] = min(self._sizes[row], len(words))
+        loaded = self._loaded[row]
+        count = min(FETCH_BATCH_SIZE, len(words) - loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, loaded, loaded + count - 1)
+        self._loaded[row] += count
+        self.endInsertRows()
+
+    def data(self, index: QtCore.QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """Return the guess for a group, with its result as PATTERN_ROLE, or a word of a group."""
+        if not index.isValid():
+            return None
+        if self._is_group(index):
+            if role == Qt.DisplayRole:
+                return self._word
+            if role == PATTERN_ROLE:
+                return self._patterns[index.row()]
+            if role == Qt.ToolTipRole:
+                return f"{self._sizes[index.row()]} word(s)"
+            return None
+        if role == Qt.DisplayRole:
+            words = self._words[index.internalId() - 1]
+            return None if words is None else words[index.row()]
+        return None
+
+    def _is_group(self, index: QtCore.QModelIndex) -> bool:
+        return index.isValid() and index.internalId() == 0
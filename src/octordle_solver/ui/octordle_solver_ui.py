@@ -1,6 +1,7 @@
 """UI for solving Octordle puzzles."""
 
-import threading
+import time
+from functools import partial
 from typing import Any, Optional
 
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -8,22 +9,13 @@ from PySide6.QtCore import Qt
 
 from ..constants import STARTING_GUESS
 from ..solver import PossibilityState
-from ..backend import make_puzzle
-
-
-try:
-    import octordle_solver_rs as rs
-
-    get_best_guess_multiple_puzzles = rs.get_best_guess_multiple_puzzles
-except ImportError:
-    # Import Python version as fallback
-    from ..solver import get_best_guess_multiple_puzzles as get_best_guess_multiple_puzzles_py
-
-    get_best_guess_multiple_puzzles = get_best_guess_multiple_puzzles_py
-
-from .helpers import Color, LetterWidget
+from ..backend import get_best_guess_multiple_puzzles, make_cancel_token, make_puzzle
+from .helpers import Color, LetterWidget, progress_text
 from .threads import ThreadWorker
 
+# Steps of the progress dialog, shared evenly between the puzzles' rankings and the final multi-puzzle scoring
+PROGRESS_STEPS = 1000
+
 
 class WordleGridWidget(QtWidgets.QWidget):
     """Widget representing a single Wordle grid."""
@@ -179,8 +171,11 @@ class OctordleSolver(QtWidgets.QMainWindow):
         self.best_guess = STARTING_GUESS
 
         self.threadpool = QtCore.QThreadPool()
-        self.cancel_flag = threading.Event()
+        self.cancel_flag = make_cancel_token()
         self.remaining_tasks = 0
+        # Fraction done of each puzzle's ranking, then of the multi-puzzle scoring, and when they started
+        self.task_progress: list[float] = []
+        self._progress_started = 0.0
 
         self.letters_typed = 0
         self.is_first_word_guessed = False
@@ -349,14 +344,17 @@ class OctordleSolver(QtWidgets.QMainWindow):
         if self.letters_typed != 0 or not self.is_first_word_guessed:
             return
 
-        self.cancel_flag.clear()
+        # A new token, so workers of a cancelled run that have not stopped yet stay cancelled
+        self.cancel_flag = make_cancel_token()
 
         self.remaining_tasks = self.num_puzzles
+        self.task_progress = [0.0] * (self.num_puzzles + 1)
+        self._progress_started = time.monotonic()
         self.progress_dialog = QtWidgets.QProgressDialog(
             "",
             "Cancel",
             0,
-            self.remaining_tasks + 1,
+            PROGRESS_STEPS,
             self,
         )
         self.progress_dialog.setWindowTitle("Getting best guess...")
@@ -372,8 +370,10 @@ class OctordleSolver(QtWidgets.QMainWindow):
                 fn=puzzle.make_guess,
                 word=puzzle_widget.word,
                 result=puzzle_widget.result,
+                cancel=self.cancel_flag,
                 cancel_flag=self.cancel_flag,
             )
+            self._track_progress(thread_worker, i)
             thread_worker.signals.result.connect(self._on_make_guess_done)
             self.threadpool.start(thread_worker)
 
@@ -386,13 +386,8 @@ class OctordleSolver(QtWidgets.QMainWindow):
             return
 
         self.remaining_tasks -= 1
-        done = self.num_puzzles - self.remaining_tasks
-        if self.progress_dialog:
-            self.progress_dialog.setValue(done)
 
         if self.remaining_tasks == 0:
-            if self.progress_dialog:
-                self.progress_dialog.setValue(self.num_puzzles)
             for i in range(self.num_puzzles):
                 puzzle = self.puzzles[i]
                 puzzle_widget = self.puzzle_widgets[i]
@@ -402,7 +397,10 @@ class OctordleSolver(QtWidgets.QMainWindow):
             thread_worker = ThreadWorker(
                 fn=get_best_guess_multiple_puzzles,
                 puzzles=puzzles,
+                cancel=self.cancel_flag,
+                cancel_flag=self.cancel_flag,
             )
+            self._track_progress(thread_worker, self.num_puzzles)
             thread_worker.signals.result.connect(self._on_get_best_guess_done)
             self.threadpool.start(thread_worker)
 
@@ -422,6 +420,30 @@ class OctordleSolver(QtWidgets.QMainWindow):
 
         self.update_puzzle_widgets()
 
+    def _track_progress(self, thread_worker: ThreadWorker, task: int) -> None:
+        """Pass a `progress` callback to a worker's function and show its reports as task number `task`."""
+        thread_worker.kwargs["progress"] = thread_worker.signals.progress.emit
+        thread_worker.signals.progress.connect(partial(self._on_task_progress, task))
+        # Some computations finish without reporting, e.g. when one word remains
+        thread_worker.signals.finished.connect(partial(self._on_task_progress, task, 1, 1))
+
+    def _on_task_progress(self, task: int, done: int, total: int) -> None:
+        """Update the progress dialog with a task's progress and the estimated time left.
+
+        Args:
+            task (int): Index of the task in `task_progress`.
+            done (int): Work items the task has completed.
+            total (int): Work items of the task.
+        """
+        if self.cancel_flag.is_set() or not self.progress_dialog or task >= len(self.task_progress) or total <= 0:
+            return
+        self.task_progress[task] = done / total
+        value = round(PROGRESS_STEPS * sum(self.task_progress) / len(self.task_progress))
+        # Reaching the maximum would close the dialog before the best guess is shown
+        self.progress_dialog.setValue(min(value, PROGRESS_STEPS - 1))
+        elapsed = time.monotonic() - self._progress_started
+        self.progress_dialog.setLabelText(progress_text(value, PROGRESS_STEPS, elapsed))
+
     def cancel_tasks(self):
         """Cancel any running tasks."""
         self.cancel_flag.set()
@@ -0,0 +1,161 @@
+"""Rank likely next game states in the background while the UI is idle."""
+
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Optional
+
+from PySide6 import QtCore
+
+from ..backend import make_cancel_token
+from ..solver import group_sizes
+from .threads import ThreadWorker
+
+# Ranked states kept for instant answers
+SPECULATION_CACHE_SIZE = 16
+# Results ranked ahead for each entered word, most likely first
+SPECULATION_PATTERNS = 4
+# Thread pool priority of speculative rankings; explicit requests run at the default priority of 0
+SPECULATION_PRIORITY = -1
+
+# The guesses made so far, as (word, result) pairs
+GameState = tuple[tuple[str, str], ...]
+
+
+def game_state(puzzle: Any) -> GameState:
+    """Return the guesses made on a puzzle of either backend as a hashable key."""
+    return tuple((guess.word, guess.result) for guess in puzzle.guesses)
+
+
+class SpeculativeRanker(QtCore.QObject):
+    """Rank a puzzle after the most likely results of a word before the user asks for them.
+
+    `start` guesses the word with each result on a copy of the puzzle, largest group of remaining words first, one
+    ranking at a time at a low thread pool priority. Ranked copies go into an LRU cache, from which `take` serves
+    matching requests without ranking. `stop` cancels the running ranking and drops the queued ones; call it whenever
+    the game state changes and before ranking explicitly, so speculation never delays an explicit request.
+    """
+
+    # Emitted with the word and result of each state ranked
+    ranked = QtCore.Signal(str, str)
+
+    def __init__(
+        self,
+        threadpool: QtCore.QThreadPool,
+        cache_size: int = SPECULATION_CACHE_SIZE,
+        max_patterns: int = SPECULATION_PATTERNS,
+        parent: Optional[QtCore.QObject] = None,
+    ) -> None:
+        """Initialize the ranker.
+
+        Args:
+            threadpool (QtCore.QThreadPool): Pool the rankings run on.
+            cache_size (int, optional): Number of ranked states to keep. Defaults to SPECULATION_CACHE_SIZE.
+            max_patterns (int, optional): Results ranked for each word. Defaults to SPECULATION_PATTERNS.
+            parent (QtCore.QObject, optional): Parent object.
+        """
+        super().__init__(parent)
+        self.threadpool = threadpool
+        self.cache_size = cache_size
+        self.max_patterns = max_patterns
+        self._cache: OrderedDict[tuple[GameState, str, str], Any] = OrderedDict()
+        # Puzzle copies waiting to be ranked, with the guess to make on each
+        self._queue: list[tuple[Any, str, str]] = []
+        # A new token per run, so a cancelled ranking that has not stopped yet stays cancelled
+        self._cancel = make_cancel_token()
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether a speculative ranking is running or queued."""
+        return self._running or bool(self._queue)
+
+    @property
+    def cached_states(self) -> list[tuple[GameState, str, str]]:
+        """Keys of the ranked states, least recently used first."""
+        return list(self._cache)
+
+    def start(self, puzzle: Any, word: str) -> None:
+        """Rank `puzzle` after the most likely results of guessing `word`, stopping any earlier speculation.
+
+        Args:
+            puzzle (Any): Puzzle of either backend, before `word` is guessed. It is copied, not modified.
+            word (str): The word entered.
+        """
+        self.stop()
+        remaining_words = puzzle.remaining_words
+        if len(remaining_words) <= 1:
+            return
+        state = game_state(puzzle)
+        sizes = group_sizes(word, remaining_words)
+        # A solved puzzle has nothing left to rank
+        sizes.pop("YYYYY", None)
+        patterns = sorted(sizes, key=sizes.__getitem__, reverse=True)[: self.max_patterns]
+        self._queue = [
+            (puzzle.copy(), word, pattern) for pattern in patterns if (state, word, pattern) not in self._cache
+        ]
+        self._run_next()
+
+    def stop(self) -> None:
+        """Cancel the running ranking and drop the queued ones."""
+        self._queue = []
+        if self._running:
+            self._cancel.set()
+            self._cancel = make_cancel_token()
+            self._running = False
+
+    def take(self, puzzle: Any, word: str, result: str) -> Optional[Any]:
+        """Return a copy of `puzzle` with `word` guessed and ranked, if that state was ranked ahead.
+
+        Args:
+            puzzle (Any): Puzzle before `word` is guessed.
+            word (str): The word guessed.
+            result (str): Its result, e.g. "NNYMY".
+
+        Returns:
+            Any: A new puzzle to use instead of `puzzle`, or None if the state has not been ranked.
+        """
+        key = (game_state(puzzle), word, result)
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        self._cache.move_to_end(key)
+        # The cached puzzle stays unchanged for later requests
+        return cached.copy()
+
+    def _run_next(self) -> None:
+        if not self._queue:
+            return
+        puzzle, word, result = self._queue.pop(0)
+        key = (game_state(puzzle), word, result)
+        thread_worker = ThreadWorker(
+            fn=self._rank,
+            cancel_flag=self._cancel,
+            puzzle=puzzle,
+            word=word,
+            result=result,
+            cancel=self._cancel,
+        )
+        thread_worker.signals.result.connect(partial(self._on_ranked, key))
+        thread_worker.signals.finished.connect(partial(self._on_finished, self._cancel))
+        self._running = True
+        self.threadpool.start(thread_worker, SPECULATION_PRIORITY)
+
+    @staticmethod
+    def _rank(puzzle: Any, word: str, result: str, cancel: Any) -> Any:
+        puzzle.make_guess(word, result, cancel=cancel)
+        return puzzle
+
+    def _on_ranked(self, key: tuple[GameState, str, str], puzzle: Any) -> None:
+        # A ranking that finished just as it was cancelled is still correct for its state
+        self._cache[key] = puzzle
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        self.ranked.emit(key[1], key[2])
+
+    def _on_finished(self, cancel: Any) -> None:
+        if cancel is not self._cancel:
+            # Finished after being stopped; a newer run may be going
+            return
+        self._running = False
+        self._run_next()
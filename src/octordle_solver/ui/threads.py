@@ -15,7 +15,9 @@ class WorkerSignals(QtCore.QObject):
     finished = QtCore.Signal()
     error = QtCore.Signal(tuple)
     result = QtCore.Signal(object)
-    progress = QtCore.Signal(int)
+    # Work items done and in all, e.g. from a solver `progress` callback
+    progress = QtCore.Signal(int, int)
+    interim = QtCore.Signal(object)
     canceled = QtCore.Signal()
 
 
@@ -43,6 +45,10 @@ class ThreadWorker(QtCore.QRunnable):
             result = self.fn(*self.args, **self.kwargs)
 
         except Exception:
+            if self.cancel_flag and self.cancel_flag.is_set():
+                # The function was given the flag too and stopped because it was set
+                self.signals.canceled.emit()
+                return
             if "PYTEST_CURRENT_TEST" not in os.environ:  # pragma: no cover
                 # Don't print if running tests
                 traceback.print_exc()
@@ -1,5 +1,6 @@
 """UI for solving Wordle puzzles."""
 
+import time
 from functools import partial
 from typing import Iterable, Optional
 
@@ -9,12 +10,18 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import Qt
 
 from ..constants import STARTING_GUESS
-from ..solver import PossibilityState, get_cached_best_second_guess
+from ..solver import PossibilityState, get_cached_best_second_guess, group_sizes, group_words
 from ..utils import sanitize_words
 from ..backend import make_puzzle
-from .helpers import Color, LetterWidget, get_word_colors, create_colored_label
+from .helpers import Color, ColoredWordDelegate, LetterWidget, progress_text
+from .models import FETCH_BATCH_SIZE, PATTERN_ROLE, GroupTreeModel, RankedGuessModel, WordListModel
+from .speculation import SpeculativeRanker
 from .threads import ThreadWorker
 
+# Guesses shown while the ranking is still running
+INTERIM_GUESS_LIMIT = 20
+# Milliseconds without input after a word is entered before its likely results are ranked ahead
+SPECULATION_DELAY_MS = 500
 
 WORDLE_SOLVER_DARK_STYLE_SHEET = """
 QMainWindow, QWidget {
@@ -22,7 +29,7 @@ QMainWindow, QWidget {
     color: #f2f2f2;
 }
 
-QListWidget, QTreeWidget, QTextEdit {
+QListView, QTreeView, QTextEdit {
     background-color: #2b2b2b;
     color: #f2f2f2;
 }
@@ -39,7 +46,7 @@ QMainWindow, QWidget {
     color: #111111;
 }
 
-QListWidget, QTreeWidget, QTextEdit {
+QListView, QTreeView, QTextEdit {
     background-color: #ffffff;
     color: #111111;
 }
@@ -194,12 +201,17 @@ class WordleSolver(QtWidgets.QMainWindow):
 
         self.best_guess_widget.layout().addWidget(QtWidgets.QLabel("Best guesses"))
 
-        self.best_guess_list = QtWidgets.QListWidget()
-        self.best_guess_list.addItem(STARTING_GUESS)
-        self.best_guess_list.itemSelectionChanged.connect(self.update_groups_widgets)
+        # The list views read rows from their models on demand, so showing every ranked guess stays cheap
+        self.best_guess_model = RankedGuessModel(self)
+        self.best_guess_model.pin(STARTING_GUESS)
+        self.best_guess_list = QtWidgets.QListView()
+        self.best_guess_list.setUniformItemSizes(True)
+        self.best_guess_list.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.best_guess_list.setModel(self.best_guess_model)
+        self.best_guess_list.selectionModel().currentRowChanged.connect(self.update_groups_widgets)
         self.best_guess_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.best_guess_list.customContextMenuRequested.connect(self.show_best_guess_context_menu)
-        self.best_guess_list.itemDoubleClicked.connect(self.handle_best_guess_double_click)
+        self.best_guess_list.doubleClicked.connect(self.handle_best_guess_double_click)
         self.best_guess_widget.layout().addWidget(self.best_guess_list)
 
         # Groups
@@ -216,9 +228,15 @@ class WordleSolver(QtWidgets.QMainWindow):
         self.average_group_label = QtWidgets.QLabel("Average Group Size: 0")
         self.groups_widget.layout().addWidget(self.average_group_label)
 
-        self.groups_tree_widget = QtWidgets.QTreeWidget()
-        self.groups_tree_widget.header().hide()
-        self.groups_widget.layout().addWidget(self.groups_tree_widget)
+        # Groups list their words only once expanded
+        self.groups_model = GroupTreeModel(self)
+        self.groups_tree_view = QtWidgets.QTreeView()
+        self.groups_tree_view.header().hide()
+        self.groups_tree_view.setUniformRowHeights(True)
+        self.groups_tree_view.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.groups_tree_view.setModel(self.groups_model)
+        self.groups_tree_view.setItemDelegate(ColoredWordDelegate(PATTERN_ROLE, self.groups_tree_view))
+        self.groups_widget.layout().addWidget(self.groups_tree_view)
 
         # Remaining words
         self.remaining_words_widget = QtWidgets.QWidget()
@@ -228,7 +246,11 @@ class WordleSolver(QtWidgets.QMainWindow):
         self.remaining_words_label = QtWidgets.QLabel("(0) Remaining Word(s)")
         self.remaining_words_widget.layout().addWidget(self.remaining_words_label)
 
-        self.remaining_words_list = QtWidgets.QListWidget()
+        self.remaining_words_model = WordListModel(self)
+        self.remaining_words_list = QtWidgets.QListView()
+        self.remaining_words_list.setUniformItemSizes(True)
+        self.remaining_words_list.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.remaining_words_list.setModel(self.remaining_words_model)
         self.remaining_words_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.remaining_words_list.customContextMenuRequested.connect(self.show_remaining_words_context_menu)
         self.remaining_words_widget.layout().addWidget(self.remaining_words_list)
@@ -263,6 +285,15 @@ class WordleSolver(QtWidgets.QMainWindow):
         self.update_remaining_words_widget()
 
         self.threadpool = QtCore.QThreadPool()
+        # time.monotonic() when the running calculation started, for estimating the time left
+        self._calculation_started = 0.0
+
+        # Rank the likely results of an entered word while the user colors its tiles
+        self.speculative_ranker = SpeculativeRanker(self.threadpool, parent=self)
+        self.speculation_timer = QtCore.QTimer(self)
+        self.speculation_timer.setSingleShot(True)
+        self.speculation_timer.setInterval(SPECULATION_DELAY_MS)
+        self.speculation_timer.timeout.connect(self.start_speculation)
         self.original_style_sheet = self.styleSheet()
         self._apply_dark_mode(self._dark_mode_enabled)
 
@@ -275,6 +306,7 @@ class WordleSolver(QtWidgets.QMainWindow):
 
     def reset_game(self):
         """Reset the game back to its initial state."""
+        self.stop_speculation()
         self.puzzle.reset()
 
         self._current_row = 0
@@ -286,9 +318,9 @@ class WordleSolver(QtWidgets.QMainWindow):
                 item.widget().deleteLater()
         self._create_grid()
 
-        self.best_guess_list.clear()
-        self.best_guess_list.addItem(STARTING_GUESS)
-        self.groups_tree_widget.clear()
+        self.best_guess_model.clear()
+        self.best_guess_model.pin(STARTING_GUESS)
+        self.groups_model.clear()
 
         self.update_remaining_words_widget()
         self.setFocus()
@@ -364,6 +396,19 @@ class WordleSolver(QtWidgets.QMainWindow):
 
         self._current_row += 1
         self._current_col = 0
+        self.speculation_timer.start()
+
+    def start_speculation(self) -> None:
+        """Rank the puzzle after the most likely results of the entered word, in the background."""
+        # Only when the entered word is the next guess for the puzzle and nothing else is being ranked
+        if len(self.puzzle.guesses) != self._current_row - 1 or not self.get_best_guess_button.isEnabled():
+            return
+        self.speculative_ranker.start(self.puzzle, self.word)
+
+    def stop_speculation(self) -> None:
+        """Stop ranking ahead, e.g. because the game state is about to change."""
+        self.speculation_timer.stop()
+        self.speculative_ranker.stop()
 
     @property
     def word(self) -> str:
@@ -394,9 +439,9 @@ class WordleSolver(QtWidgets.QMainWindow):
 
     def update_remaining_words_widget(self):
         """Update the widgets with the remaining words."""
-        self.remaining_words_list.clear()
-        self.remaining_words_list.addItems(self.puzzle.remaining_words)
-        self.remaining_words_label.setText(f"{len(self.puzzle.remaining_words)} Remaining Word(s)")
+        remaining_words = self.puzzle.remaining_words
+        self.remaining_words_model.set_words(remaining_words)
+        self.remaining_words_label.setText(f"{len(remaining_words)} Remaining Word(s)")
 
     def get_best_guesses(self) -> None:
         """Get the best guesses for the given game state.
@@ -406,24 +451,58 @@ class WordleSolver(QtWidgets.QMainWindow):
         if self._current_row == 0:
             return
 
-        self.best_guess_list.clear()
-        self.groups_tree_widget.clear()
+        self.best_guess_model.clear()
+        self.groups_model.clear()
 
         self._get_cached_second_guess()
 
+        self.stop_speculation()
+        ranked_puzzle = self.speculative_ranker.take(self.puzzle, self.word, self.result)
+        if ranked_puzzle is not None:
+            # This result was ranked while the tiles were being colored
+            self.puzzle = ranked_puzzle
+            self._on_get_answer_possibilities_finished()
+            return
+
         thread_worker = ThreadWorker(
-            fn=self.puzzle.make_guess,
+            fn=self._make_guess,
             word=self.word,
             result=self.result,
         )
+        thread_worker.kwargs["on_interim"] = thread_worker.signals.interim.emit
+        thread_worker.kwargs["progress"] = thread_worker.signals.progress.emit
+        thread_worker.signals.interim.connect(self._on_interim_answer_possibilities)
+        thread_worker.signals.progress.connect(self._on_progress)
         thread_worker.signals.result.connect(self._on_get_answer_possibilities_finished)
 
+        self._calculation_started = time.monotonic()
         self.get_best_guess_button.setText("Calculating best guesses...")
         self.get_best_guess_button.setDisabled(True)
         self.original_style_sheet = self.styleSheet()
 
         self.threadpool.start(thread_worker)
 
+    def _make_guess(self, word: str, result: str, on_interim, progress) -> None:
+        """Make a guess on the puzzle, passing interim rankings to `on_interim` when the backend yields them.
+
+        `progress` is called with the number of candidate guesses scored while ranking.
+        """
+        if not hasattr(self.puzzle, "make_guess_iter"):
+            # The Rust backend ranks in one step
+            self.puzzle.make_guess(word, result, progress=progress)
+            return
+        for answers in self.puzzle.make_guess_iter(word, result, limit=INTERIM_GUESS_LIMIT, progress=progress):
+            on_interim(answers)
+
+    def _on_progress(self, done: int, total: int) -> None:
+        """Show how far the ranking has got and the time it should still take."""
+        text = progress_text(done, total, time.monotonic() - self._calculation_started)
+        self.get_best_guess_button.setText(f"Calculating best guesses... {text}")
+
+    def _on_interim_answer_possibilities(self, answers) -> None:
+        """Show the best guesses found so far while the ranking runs."""
+        self.best_guess_model.set_ranking(answers[:INTERIM_GUESS_LIMIT])
+
     def _get_cached_second_guess(self) -> None:
         """Get the cached second guess if available."""
         if not self._can_get_cached_second_guess():
@@ -431,7 +510,7 @@ class WordleSolver(QtWidgets.QMainWindow):
         answer_possibility = [self.letter_boxes[0][i].state.value for i in range(5)]
         best_second_guess = get_cached_best_second_guess(answer_possibility)
         if best_second_guess:
-            self.best_guess_list.addItem(best_second_guess)
+            self.best_guess_model.pin(best_second_guess)
 
     def _can_get_cached_second_guess(self) -> bool:
         """Check if we can get a cached second guess based on the current game state."""
@@ -442,34 +521,31 @@ class WordleSolver(QtWidgets.QMainWindow):
         self.get_best_guess_button.setText("Get best guesses")
         self.get_best_guess_button.setDisabled(False)
         self.update_remaining_words_widget()
-
-        for possibility in self.puzzle.all_answers:
-            if not self.best_guess_list.findItems(possibility.word, Qt.MatchFlag.MatchExactly):
-                self.best_guess_list.addItem(possibility.word)
+        answers_dict = self.puzzle.all_answers_dict
+        if callable(answers_dict):
+            # The Rust backend returns the mapping from a method
+            answers_dict = answers_dict()
+        self.best_guess_model.set_ranking(self.puzzle.all_answers, answers_dict)
 
     def update_groups_widgets(self):
-        """Update the group widgets when the user picks an answer possibility."""
-        if not self.puzzle.all_answers:
+        """Update the group widgets when the user picks a guess.
+
+        The groups are counted from the remaining words for the selected word, so any guess in the list can be
+        inspected, whatever the ranking holds. A group's words are only listed when it is expanded.
+        """
+        index = self.best_guess_list.currentIndex()
+        remaining_words = self.puzzle.remaining_words
+        if not index.isValid() or not remaining_words:
             return
-        word = self.best_guess_list.currentItem().text()
-        index = self.best_guess_list.currentRow()
-        groups = self.puzzle.all_answers[index].groups
-        self.groups_tree_widget.clear()
-        for group in groups:
-            item = QtWidgets.QTreeWidgetItem(self.groups_tree_widget)
-            colors = get_word_colors(group.possibility)
-            self.groups_tree_widget.setItemWidget(item, 0, create_colored_label(word, colors))
-            self.groups_tree_widget.addTopLevelItem(item)
-            for sorted_word in group.words:
-                child_item = QtWidgets.QTreeWidgetItem()
-                child_item.setText(0, sorted_word)
-                item.addChild(child_item)
-            item.setExpanded(True)
-
-        total_groups = len(groups)
-        largest_group = max(len(group.words) for group in groups)
-        sum_groups = sum(len(group.words) for group in groups)
-        average_size = sum_groups / total_groups
+        word = index.data()
+        sizes = group_sizes(word, remaining_words)
+        self.groups_model.set_partition(word, sizes, partial(group_words, word, remaining_words=remaining_words))
+        if len(remaining_words) <= FETCH_BATCH_SIZE:
+            self.groups_tree_view.expandAll()
+
+        total_groups = len(sizes)
+        largest_group = max(sizes.values())
+        average_size = len(remaining_words) / total_groups
 
         self.total_groups_label.setText(f"Total Groups: {total_groups}")
         self.largest_group_label.setText(f"Largest Group Size: {largest_group}")
@@ -481,7 +557,7 @@ class WordleSolver(QtWidgets.QMainWindow):
         """Show a context menu for the remaining words list widget."""
         menu = QtWidgets.QMenu(self)
 
-        if self.remaining_words_list.count():
+        if self.remaining_words_model.total_rows:
             copy_words_action = QtGui.QAction("Copy remaining words")
             copy_words_action.triggered.connect(self.copy_remaining_words)
             menu.addAction(copy_words_action)
@@ -513,9 +589,11 @@ class WordleSolver(QtWidgets.QMainWindow):
 
     def show_best_guess_context_menu(self, point):
         """Show a context menu for the best guess list widget."""
+        if not self.best_guess_list.currentIndex().isValid():
+            return
         menu = QtWidgets.QMenu(self)
 
-        current_word = self.best_guess_list.currentItem().text()
+        current_word = self.best_guess_list.currentIndex().data()
 
         use_guess_action = QtGui.QAction(f"Use {current_word} as next guess")
         use_guess_action.triggered.connect(partial(self.use_selected_guess, current_word))
@@ -523,9 +601,9 @@ class WordleSolver(QtWidgets.QMainWindow):
 
         menu.exec(self.best_guess_list.mapToGlobal(point))
 
-    def handle_best_guess_double_click(self, item):
+    def handle_best_guess_double_click(self, index: QtCore.QModelIndex):
         """Handle the best guess double click action."""
-        self.use_selected_guess(item.text())
+        self.use_selected_guess(index.data())
 
     def use_selected_guess(self, guess):
         """Use the selected word from the best guess list as the next guess."""
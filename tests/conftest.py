@@ -0,0 +1,33 @@
+from concurrent.futures import Future
+
+import pytest
+
+
+class InlineExecutor:
+    """Process pool stand-in that runs each call in the calling thread."""
+
+    def __init__(self, max_workers=None, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def map(self, func, iterable):
+        return map(func, iterable)
+
+    def submit(self, func, *args):
+        future = Future()
+        future.set_result(func(*args))
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def inline_executor():
+    """The `InlineExecutor` class, to patch in for a process pool."""
+    return InlineExecutor
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from octordle_solver.aio import AsyncSolver, normalize_state
+from octordle_solver.solver import get_all_answers
+
+
+STATE = [("SLATE", "NNYMY"), ("CRONY", "MYNNN")]
+
+
+def test_normalize_state():
+    assert normalize_state([("slate", "nnymy")]) == (("SLATE", "NNYMY"),)
+
+
+def test_python_backend_matches_get_all_answers(mocker, inline_executor):
+    async def rank():
+        async with AsyncSolver(max_workers=2, use_rust=False) as solver:
+            return await solver.best_guesses(STATE)
+
+    answers = asyncio.run(rank())
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+    expected = get_all_answers(list(answers.remaining_words))
+    assert answers.words == expected.words
+    assert list(answers.group_counts) == list(expected.group_counts)
+
+
+@pytest.mark.parametrize(
+    "state, expected",
+    [
+        ([("TRACE", "NNNNN"), ("CRANE", "YYYYN")], None),
+        ([("SLATE", "NNNNN"), ("CRONY", "YYYYY")], "CRONY"),
+    ],
+)
+def test_best_guess_edge_states(state, expected):
+    async def rank():
+        async with AsyncSolver(max_workers=2, use_rust=False) as solver:
+            return await solver.best_guess(state)
+
+    assert asyncio.run(rank()) == expected
+
+
+class TestCoalescing:
+    def _solver(self, mocker, release):
+        solver = AsyncSolver(max_workers=1, use_rust=False)
+        calls = []
+
+        async def fake_rank(state, limit, hard_mode, cancel):
+            calls.append(state)
+            await release.wait()
+            return [state]
+
+        mocker.patch.object(solver, "_rank", side_effect=fake_rank)
+        return solver, calls
+
+    def test_identical_requests_share_one_computation(self, mocker):
+        async def run():
+            release = asyncio.Event()
+            solver, calls = self._solver(mocker, release)
+            first = asyncio.ensure_future(solver.best_guesses(STATE))
+            second = asyncio.ensure_future(solver.best_guesses([("slate", "nnymy"), ("crony", "mynnn")]))
+            other = asyncio.ensure_future(solver.best_guesses(STATE[:1]))
+            await asyncio.sleep(0)
+            assert solver.pending == 2
+            release.set()
+            results = await asyncio.gather(first, second, other)
+            assert results[0] is results[1]
+            assert len(calls) == 2
+            assert solver.pending == 0
+
+        asyncio.run(run())
+
+    def test_cancelling_one_waiter_keeps_the_computation(self, mocker):
+        async def run():
+            release = asyncio.Event()
+            solver, calls = self._solver(mocker, release)
+            first = asyncio.ensure_future(solver.best_guesses(STATE))
+            second = asyncio.ensure_future(solver.best_guesses(STATE))
+            await asyncio.sleep(0)
+            first.cancel()
+            await asyncio.sleep(0)
+            release.set()
+            assert await second == [normalize_state(STATE)]
+            assert first.cancelled()
+
+        asyncio.run(run())
+
+    def test_cancelling_every_waiter_cancels_the_computation(self, mocker):
+        async def run():
+            release = asyncio.Event()
+            solver, calls = self._solver(mocker, release)
+            waiter = asyncio.ensure_future(solver.best_guesses(STATE))
+            await asyncio.sleep(0)
+            computation = next(iter(solver._inflight.values()))
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            await asyncio.sleep(0)
+            assert computation.task.cancelled()
+            assert solver.pending == 0
+
+        asyncio.run(run())
+
+    def test_cancelling_stops_the_worker_batches_once_idle(self, mocker):
+        async def run():
+            release = asyncio.Event()
+            solver, calls = self._solver(mocker, release)
+            solver._worker_cancel = threading.Event()
+            first = asyncio.ensure_future(solver.best_guesses(STATE))
+            other = asyncio.ensure_future(solver.best_guesses(STATE[:1]))
+            await asyncio.sleep(0)
+            # Another computation may still need the workers
+            first.cancel()
+            await asyncio.sleep(0)
+            assert not solver._worker_cancel.is_set()
+            other.cancel()
+            await asyncio.sleep(0)
+            assert solver._worker_cancel.is_set()
+
+        asyncio.run(run())
+
+
+def test_cancelling_stops_a_running_rust_ranking(mocker):
+    started = threading.Event()
+    stopped = threading.Event()
+
+    def fake_rank_rust(state, limit, hard_mode, cancel):
+        started.set()
+        while not cancel.is_set():
+            time.sleep(0.01)
+        stopped.set()
+
+    mocker.patch("octordle_solver.aio.rank_rust", side_effect=fake_rank_rust)
+    mocker.patch("octordle_solver.aio.backend.make_cancel_token", side_effect=threading.Event)
+
+    async def run():
+        async with AsyncSolver(max_workers=1, use_rust=True) as solver:
+            waiter = asyncio.ensure_future(solver.best_guesses(STATE))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+    asyncio.run(run())
+    assert stopped.wait(5)
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+from octordle_solver import batch
+from octordle_solver.batch import BatchStats, PrefixFilter, PrefixReplay, main, parse_record, rank_states
+from octordle_solver.solver import Puzzle
+
+STATE = [["SLATE", "NNYMY"], ["CRONY", "MYNNN"]]
+
+
+def replay(state, hard_mode=False):
+    puzzle = Puzzle(get_best_answer=False, hard_mode=hard_mode)
+    for word, result in state:
+        puzzle.make_guess(word, result)
+    return puzzle
+
+
+def test_parse_record():
+    assert parse_record(json.dumps(STATE), 3) == (3, (("SLATE", "NNYMY"), ("CRONY", "MYNNN")), False)
+    record = {"id": "a", "guesses": [["slate", "nnymy"]], "hard_mode": True}
+    assert parse_record(json.dumps(record), 3) == ("a", (("SLATE", "NNYMY"),), True)
+
+
+@pytest.mark.parametrize("line", ["not json", "1", '{"guesses": "SLATE"}', '[["SLATE", "NNYMX"]]'])
+def test_parse_record_rejects_invalid_lines(line):
+    with pytest.raises(ValueError):
+        parse_record(line, 0)
+
+
+def test_prefix_filter_matches_puzzle():
+    prefixes = PrefixFilter()
+    state = tuple(map(tuple, STATE))
+    assert prefixes.remaining(state) == replay(STATE).remaining_words
+    assert prefixes.guesses(prefixes.legal_guesses(state)) == replay(STATE, hard_mode=True).valid_guesses
+    # The shared prefix was filtered once and is reused
+    assert prefixes.remaining(state[:1]) is prefixes.remaining(state[:1])
+
+
+def test_prefix_replay_copies_prefix_puzzles(monkeypatch):
+    replayed = []
+
+    def replay_root(state, hard_mode):
+        replayed.append((state, hard_mode))
+        return replay(state, hard_mode)
+
+    monkeypatch.setattr(batch, "replay_rust", replay_root)
+    prefixes = PrefixReplay()
+    state = tuple(map(tuple, STATE))
+    puzzle = prefixes.puzzle(state, False)
+    assert puzzle.remaining_words == replay(STATE).remaining_words
+    assert prefixes.puzzle(state[:1], False).remaining_words == replay(STATE[:1]).remaining_words
+    assert prefixes.puzzle(state, True).valid_guesses == replay(STATE, hard_mode=True).valid_guesses
+    # Only the empty state is replayed from scratch; longer states extend a copy of their prefix
+    assert replayed == [((), False), ((), True)]
+
+    # Each state gets its own puzzle
+    puzzle.make_guess("PIOUS", "NNNNN")
+    assert prefixes.puzzle(state, False).remaining_words == replay(STATE).remaining_words
+
+
+def test_rank_states_matches_puzzle():
+    lines = [
+        json.dumps(STATE),
+        "",
+        json.dumps({"id": "hard", "guesses": STATE, "hard_mode": True}),
+        json.dumps(STATE),
+        "oops",
+        json.dumps([["SLATE", "YYYYY"], ["CRANE", "YYYYY"]]),
+    ]
+    stats = BatchStats()
+    outputs = list(rank_states(lines, limit=3, chunk_size=2, workers=1, use_rust=False, stats=stats))
+
+    assert [output["id"] for output in outputs] == [0, "hard", 3, 4, 5]
+    answers = replay(STATE).get_all_answers()
+    assert outputs[0] == {
+        "id": 0,
+        "remaining": len(answers.remaining_words),
+        "best_guess": answers[0].word,
+        "group_count": answers[0].group_count,
+        "max_group_size": answers[0].max_group_size,
+        "answers": answers.words[:3],
+    }
+    assert outputs[1]["answers"] == replay(STATE, hard_mode=True).get_all_answers().words[:3]
+    assert outputs[2] == {**outputs[0], "id": 3}
+    assert "error" in outputs[3]
+    assert outputs[4]["remaining"] == 0 and outputs[4]["best_guess"] is None
+
+    assert (stats.states, stats.errors) == (5, 1)
+    # Chunks of two lines: the duplicate state is in a different chunk from the first one
+    assert stats.rankings == 4
+
+
+def test_main(tmp_path, capsys):
+    source = tmp_path / "states.jsonl"
+    source.write_text(json.dumps(STATE[:1]) + "\n")
+    output = tmp_path / "ranked.jsonl"
+    main([str(source), "-o", str(output), "--workers", "1", "--limit", "2"])
+
+    (line,) = output.read_text().splitlines()
+    record = json.loads(line)
+    assert record["id"] == 0
+    assert record["remaining"] == len(replay(STATE[:1]).remaining_words)
+    assert len(record["answers"]) == 2
+    assert "1 states" in capsys.readouterr().err
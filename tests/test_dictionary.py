@@ -1,7 +1,92 @@
-from octordle_solver.dictionary import dictionary
+import pytest
+
+from octordle_solver.dictionary import (
+    COMPILED_DICTIONARY_FILE_PATH,
+    Dictionary,
+    DictionaryFormatError,
+    Vocabulary,
+    compile_dictionary,
+    dictionary,
+    load_compiled_dictionary,
+    parse_text_files,
+)
 
 
 def test_dictionary():
     assert isinstance(dictionary.words, list)
     assert isinstance(dictionary.valid_guesses, list)
     assert isinstance(dictionary.valid_answers, list)
+
+
+class TestCompiledDictionary:
+    def test_compiled_file_is_up_to_date(self):
+        text = parse_text_files()
+        compiled = load_compiled_dictionary(COMPILED_DICTIONARY_FILE_PATH)
+        assert compiled.content_hash == text.content_hash
+        assert compiled.words == text.words
+        assert compiled.valid_guesses == text.valid_guesses
+        assert compiled.valid_answers == text.valid_answers
+        assert compiled.unique_words == text.unique_words
+
+    def test_answers_are_numbered_first(self):
+        assert dictionary.unique_words[: len(dictionary.valid_answers)] == dictionary.valid_answers
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "dictionary.bin"
+        content_hash = compile_dictionary(path)
+        assert load_compiled_dictionary(path).content_hash == content_hash
+
+    def test_equal_words_share_one_string(self):
+        compiled = load_compiled_dictionary(COMPILED_DICTIONARY_FILE_PATH)
+        word = compiled.valid_answers[0]
+        assert compiled.valid_guesses[compiled.valid_guesses.index(word)] is word
+
+    def test_loads_on_first_access(self, mocker):
+        load = mocker.patch("octordle_solver.dictionary.load_compiled_dictionary", wraps=load_compiled_dictionary)
+        lazy = Dictionary()
+        load.assert_not_called()
+        assert lazy.words == dictionary.words
+        assert lazy.valid_answers == dictionary.valid_answers
+        load.assert_called_once()
+
+    def test_falls_back_to_text_files(self, tmp_path):
+        assert Dictionary(tmp_path / "missing.bin").words == dictionary.words
+        assert Dictionary(None).content_hash == dictionary.content_hash
+
+    def test_rejects_invalid_file(self, tmp_path):
+        path = tmp_path / "dictionary.bin"
+        path.write_bytes(b"not a dictionary" * 10)
+        with pytest.raises(DictionaryFormatError):
+            load_compiled_dictionary(path)
+
+
+class TestVocabulary:
+    def test_ids_follow_unique_words(self):
+        vocabulary = dictionary.vocabulary
+        assert list(vocabulary.words) == dictionary.unique_words
+        assert len(vocabulary) == len(dictionary.unique_words)
+        assert [vocabulary.id_of(word) for word in dictionary.valid_answers] == list(
+            range(len(dictionary.valid_answers))
+        )
+
+    def test_word_lists_share_vocabulary_strings(self):
+        vocabulary = dictionary.vocabulary
+        for word_list in (dictionary.words, dictionary.valid_guesses, dictionary.valid_answers):
+            word = word_list[len(word_list) // 2]
+            assert vocabulary.word(vocabulary.id_of(word)) is word
+
+    def test_text_fallback_shares_strings(self, tmp_path):
+        text = Dictionary(tmp_path / "missing.bin")
+        word = text.valid_answers[0]
+        assert text.valid_guesses[text.valid_guesses.index(word)] is word
+        assert text.vocabulary.word(0) is word
+
+    def test_conversions(self):
+        vocabulary = Vocabulary(["CRANE", "SLATE", "TRACE"])
+        assert vocabulary.ids(["TRACE", "CRANE"]).tolist() == [2, 0]
+        assert vocabulary.words_for([1, 2]) == ["SLATE", "TRACE"]
+        assert vocabulary.get("ZZZZZ") is None
+        assert "CRANE" in vocabulary
+        assert vocabulary.intern("ZZZZZ") == "ZZZZZ"
+        with pytest.raises(ValueError):
+            vocabulary.id_of("ZZZZZ")
@@ -0,0 +1,80 @@
+from functools import partial
+
+from octordle_solver.dictionary import dictionary
+from octordle_solver.engine import (
+    EngineReport,
+    FixedGuesser,
+    GameResult,
+    RandomGuesser,
+    SolverGuesser,
+    best_guess,
+    play_game,
+    run_games,
+)
+from octordle_solver.solver import get_all_answers
+
+
+class TestPlayGame:
+    def test_fixed_guesser(self):
+        result = play_game(FixedGuesser(["SLATE", "CRANE"]), "CRANE")
+        assert result == GameResult("CRANE", ("SLATE", "CRANE"), True)
+        assert result.num_guesses == 2
+
+    def test_fixed_guesser_falls_back_to_remaining_answers(self):
+        result = play_game(FixedGuesser(["SLATE"]), "CRANE")
+        assert result.solved
+        assert result.guesses[0] == "SLATE"
+
+    def test_turn_limit(self):
+        result = play_game(FixedGuesser(["XYLYL"] * 10), "CRANE", max_turns=3)
+        assert result == GameResult("CRANE", ("XYLYL", "XYLYL", "XYLYL"), False)
+
+    def test_random_guesser_is_reproducible(self):
+        assert play_game(RandomGuesser(seed=3), "CRANE") == play_game(RandomGuesser(seed=3), "CRANE")
+
+    def test_solver_guesser_uses_opener(self):
+        result = play_game(SolverGuesser(), "CRANE")
+        assert result.solved
+        assert result.guesses[0] == "SLATE"
+
+
+def test_best_guess_matches_puzzle_ranking(mocker, inline_executor):
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+    remaining = ("BAKER", "CATER", "EATER", "HATER", "LATER", "WATER")
+    assert best_guess(remaining) == get_all_answers(list(remaining), dictionary.valid_guesses)[0].word
+
+
+class TestRunGames:
+    def test_report(self):
+        answers = ["CRANE", "SLATE", "TRACE"]
+        report = run_games(partial(FixedGuesser, ["SLATE", "CRANE"]), answers, workers=1)
+        assert [result.answer for result in report.results] == answers
+        assert report.win_rate == 1.0
+        assert report.distribution[1] == 1
+        assert report.max_guesses >= 2
+        assert report.failures == []
+        assert report.games_per_second > 0
+        assert "3 games" in repr(report)
+
+    def test_failures(self):
+        report = run_games(partial(FixedGuesser, ["XYLYL"] * 6), ["CRANE"], max_turns=2, workers=1)
+        assert report.failures == ["CRANE"]
+        assert report.win_rate == 0.0
+        assert report.mean_guesses == 0.0
+
+    def test_worker_processes_match_inline(self):
+        answers = dictionary.valid_answers[:20]
+        factory = partial(RandomGuesser, seed=7)
+        assert run_games(factory, answers, workers=2).results == run_games(factory, answers, workers=1).results
+
+    def test_empty_report(self):
+        report = EngineReport([], 0.0)
+        assert len(report) == 0
+        assert report.win_rate == 0.0
+        assert report.max_guesses == 0
+
+    def test_defaults_to_every_answer(self, mocker):
+        mock_dictionary = mocker.patch("octordle_solver.engine.dictionary")
+        mock_dictionary.valid_answers = ["CRANE", "SLATE"]
+        report = run_games(partial(FixedGuesser, ["CRANE"]), workers=1)
+        assert [result.answer for result in report.results] == ["CRANE", "SLATE"]
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from octordle_solver import backend, solver
+from octordle_solver.importtime import IMPORT_TIME_BUDGETS, deferred_imports, profile_import
+
+
+@pytest.mark.parametrize("module, budget", IMPORT_TIME_BUDGETS.items())
+def test_import_time_budget(module, budget):
+    profile = profile_import(module)
+    assert module in profile.modules
+    assert deferred_imports(profile) == []
+    assert profile.seconds <= budget
+
+
+def test_import_does_not_load_data():
+    code = (
+        "import octordle_solver.backend, octordle_solver.solver as solver; "
+        "from octordle_solver.dictionary import dictionary; "
+        "assert dictionary._word_lists is None; "
+        "assert solver.load_best_second_guesses.cache_info().currsize == 0"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_backend_does_not_import_solver():
+    code = "import sys, octordle_solver.backend; assert 'octordle_solver.solver' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+class TestLazyAttributes:
+    def test_best_second_guesses(self):
+        assert solver.BEST_SECOND_GUESSES is solver.load_best_second_guesses()
+        assert solver.get_cached_best_second_guess([2, 2, 2, 2, 2]) == solver.BEST_SECOND_GUESSES.get("22222")
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            solver.NOT_AN_ATTRIBUTE
+        with pytest.raises(AttributeError):
+            backend.NOT_AN_ATTRIBUTE
+
+    def test_backend_references(self):
+        assert isinstance(backend._use_rust, bool)
+        assert backend.use_rust() is backend._use_rust
+        assert backend._python_puzzle_cls is solver.Puzzle
+
+    def test_forced_python_backend(self, monkeypatch):
+        monkeypatch.setattr(backend, "_use_rust", False)
+        assert not backend.use_rust()
+        assert isinstance(backend.make_puzzle(), solver.Puzzle)
+        assert isinstance(backend.make_cancel_token(), threading.Event)
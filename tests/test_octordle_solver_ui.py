@@ -1,5 +1,9 @@
+from PySide6 import QtWidgets
+
 from octordle_solver.ui.helpers import Color
 from octordle_solver.ui.octordle_solver_ui import (
+    PROGRESS_STEPS,
+    OctordleSolver,
     PuzzleSettingsDialog,
     RemainingWordsDialog,
     WordleGridWidget,
@@ -210,7 +214,25 @@ class TestWordleGridWidget:
             assert box.current_color == Color.WHITE
 
 
-class TestOctordleSolver: ...
+class TestOctordleSolver:
+    def test_task_progress(self, qtbot):
+        window = OctordleSolver()
+        qtbot.addWidget(window)
+        window.task_progress = [0.0, 0.0]
+        window.progress_dialog = QtWidgets.QProgressDialog("", "Cancel", 0, PROGRESS_STEPS, window)
+
+        window._on_task_progress(0, 1, 2)
+        assert window.progress_dialog.value() == PROGRESS_STEPS // 4
+        assert window.progress_dialog.labelText().startswith("25%")
+
+        # The dialog stays open until the best guess is shown
+        window._on_task_progress(0, 2, 2)
+        window._on_task_progress(1, 1, 1)
+        assert window.progress_dialog.value() == PROGRESS_STEPS - 1
+
+        window.cancel_flag.set()
+        window._on_task_progress(0, 0, 2)
+        assert window.task_progress[0] == 1.0
 
 
 class TestRemainingWordsDialog:
@@ -1,12 +1,14 @@
 """Integration tests verifying the Rust solver produces identical results to the Python solver."""
 
 import pytest
+import threading
 import time
 
 import octordle_solver_rs as rs
 from octordle_solver.dictionary import dictionary
 from octordle_solver.solver import (
     AnswerPossibility as PyAnswerPossibility,
+    Puzzle as PyPuzzle,
     calculate_fitness_score as py_calculate_fitness_score,
     generate_groups as py_generate_groups,
     get_all_answers as py_get_all_answers,
@@ -68,6 +70,10 @@ class TestGenerateGroups:
         assert len(yyyyy) == 1
         assert yyyyy[0].words == ["SLATE"]
 
+    def test_too_many_words_raises(self):
+        with pytest.raises(ValueError):
+            rs.generate_groups("SLATE", self.WORDS * 20000)
+
     def test_matches_python_group_sizes(self):
         """Rust and Python generate_groups must produce the same partition sizes."""
         py_groups = py_generate_groups("SLATE", self.WORDS)
@@ -87,6 +93,13 @@ class TestGenerateGroups:
         rs_map = {g.possibility: sorted(g.words) for g in rs_groups}
         assert py_map == rs_map
 
+    @pytest.mark.parametrize("guess", ["EERIE", "SPEED", "LLAMA", "MAMMA", "ABBEY"])
+    def test_duplicate_letters_match_python(self, guess):
+        """The batched scoring kernel must agree with Python on repeated letters."""
+        py_map = {g.possibility: sorted(g.words) for g in py_generate_groups(guess, dictionary.valid_answers)}
+        rs_map = {g.possibility: sorted(g.words) for g in rs.generate_groups(guess, dictionary.valid_answers)}
+        assert py_map == rs_map
+
     def test_group_bool(self):
         groups = rs.generate_groups("SLATE", ["SLATE"])
         assert bool(groups[0]) is True
@@ -95,6 +108,11 @@ class TestGenerateGroups:
         groups = rs.generate_groups("SLATE", [])
         assert groups == []
 
+    def test_groups_ordered_by_pattern(self):
+        groups = rs.generate_groups("ABCDE", ["EDCBA", "ABCED", "ABCDE"])
+        assert [g.possibility for g in groups] == ["YYYYY", "YYYMM", "MMYMM"]
+        assert [g.words for g in groups] == [["ABCDE"], ["ABCED"], ["EDCBA"]]
+
     def test_single_word(self):
         groups = rs.generate_groups("CRANE", ["CRANE"])
         assert len(groups) == 1
@@ -181,6 +199,12 @@ class TestGetAllAnswers:
         assert len(result) == 1
         assert result[0].word == "CRANE"
 
+    def test_limit_returns_top_of_full_ranking(self):
+        full = rs.get_all_answers(SMALL_WORDS, dictionary.valid_guesses)
+        top = rs.get_all_answers(SMALL_WORDS, dictionary.valid_guesses, limit=25)
+        assert [ap.word for ap in top] == [ap.word for ap in full[:25]]
+        assert rs.get_all_answers(SMALL_WORDS, dictionary.valid_guesses, limit=0) == []
+
     def test_matches_python_order_small(self):
         """Rust and Python must rank the same word #1 for a small word set."""
         remaining = SMALL_WORDS
@@ -191,6 +215,15 @@ class TestGetAllAnswers:
             f"Best guess mismatch: Python={py_result[0].word}, Rust={rs_result[0].word}"
         )
 
+    def test_groups_match_python(self):
+        """Groups exported from a ranking must match Python's partition of the same guess."""
+        rs_result = rs.get_all_answers(SMALL_WORDS, dictionary.valid_guesses)
+        for ap in rs_result[:20]:
+            py_map = {g.possibility: sorted(g.words) for g in py_generate_groups(ap.word, SMALL_WORDS)}
+            rs_map = {g.possibility: sorted(g.words) for g in ap.groups}
+            assert py_map == rs_map
+            assert ap.max_group_size == max(len(words) for words in py_map.values())
+
     def test_result_covers_all_guesses(self):
         """Every word in remaining + valid_guesses must appear in the result."""
         remaining = SMALL_WORDS[:4]
@@ -200,6 +233,23 @@ class TestGetAllAnswers:
         expected = set(remaining) | set(dictionary.valid_guesses)
         assert expected == result_words
 
+    def test_releases_gil(self):
+        """Other Python threads must keep running while Rust ranks candidates."""
+        done = threading.Event()
+        ticks = 0
+
+        def rank():
+            rs.get_all_answers(dictionary.valid_answers[:500], dictionary.valid_guesses)
+            done.set()
+
+        thread = threading.Thread(target=rank)
+        thread.start()
+        while not done.is_set():
+            ticks += 1
+            time.sleep(0.001)
+        thread.join()
+        assert ticks > 1
+
     def test_rust_faster_than_python(self):
         """Rust get_all_answers should be faster than the Python version."""
         remaining = SMALL_WORDS
@@ -233,6 +283,53 @@ class TestGuess:
         assert rs.Guess("CRANE", "MYYNY") != rs.Guess("CRANE", "NNNNN")
 
 
+# ---------------------------------------------------------------------------
+# Dictionary
+# ---------------------------------------------------------------------------
+
+
+class TestDictionary:
+    def test_word_lists_round_trip(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        assert d.valid_answers == dictionary.valid_answers
+        assert d.valid_guesses == dictionary.valid_guesses
+        assert len(d) == len(set(dictionary.valid_answers) | set(dictionary.valid_guesses))
+
+    def test_contains(self):
+        d = rs.Dictionary(["CRANE"], ["SLATE"])
+        assert "CRANE" in d
+        assert "slate" in d
+        assert "ZZZZZ" not in d
+
+    def test_invalid_word_raises(self):
+        with pytest.raises(ValueError):
+            rs.Dictionary(["ABCD"], [])
+
+    def test_ids_match_python_vocabulary(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        vocabulary = dictionary.vocabulary
+        assert d.words == list(vocabulary.words[: len(d)])
+        for word in ["CRANE", "SLATE", "AAHED"]:
+            assert d.id_of(word) == vocabulary.id_of(word)
+            assert d.word(d.id_of(word)) == word
+        assert memoryview(d.ids(["CRANE", "SLATE"])).tolist() == vocabulary.ids(["CRANE", "SLATE"]).tolist()
+
+    def test_unknown_ids_raise(self):
+        d = rs.Dictionary(["CRANE"], ["SLATE"])
+        with pytest.raises(ValueError):
+            d.id_of("ZZZZZ")
+        with pytest.raises(IndexError):
+            d.word(2)
+
+    def test_puzzle_remaining_ids(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        p = rs.Puzzle.from_dictionary(d, get_best_answer=False)
+        p.make_guess("SLATE", "NNNNN")
+        ids = memoryview(p.remaining_ids())
+        assert ids.format == "H"
+        assert [d.word(i) for i in ids] == p.remaining_words
+
+
 # ---------------------------------------------------------------------------
 # Puzzle
 # ---------------------------------------------------------------------------
@@ -258,6 +355,29 @@ class TestPuzzle:
         assert p.guesses[0].word == "SLATE"
         assert p.guesses[0].result == "NNNNN"
 
+    @pytest.mark.parametrize(
+        "guesses",
+        [
+            [("SLATE", "NNYMY"), ("CRONY", "MYNNN")],
+            [("EERIE", "MNNNY"), ("STEEL", "NMMNN")],
+        ],
+    )
+    def test_hard_mode_matches_python(self, guesses):
+        p = rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, False, hard_mode=True)
+        py = PyPuzzle(get_best_answer=False, hard_mode=True)
+        assert p.hard_mode
+        for guess, result in guesses:
+            p.make_guess(guess, result)
+            py.make_guess(guess, result)
+            assert p.valid_guesses == py.valid_guesses
+        p.reset()
+        assert p.valid_guesses == dictionary.valid_guesses
+
+    def test_hard_mode_ranks_only_legal_guesses(self):
+        p = rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, True, hard_mode=True)
+        p.make_guess("SLATE", "NNYMY")
+        assert set(p.all_answers.words()) == set(p.remaining_words) | set(p.valid_guesses)
+
     def test_make_guess_int_result(self):
         """Result as list[int]: 0=correct, 1=misplaced, 2=incorrect."""
         p = self._make_puzzle()
@@ -307,6 +427,123 @@ class TestPuzzle:
         # Dict keys should match all_answers words.
         assert set(d.keys()) == {ap.word for ap in p.all_answers}
 
+    def test_all_answers_view(self):
+        p = self._make_puzzle(get_best_answer=False)
+        p.remaining_words = SMALL_WORDS
+        assert len(p.all_answers) == 0
+        assert p.best_word is None
+
+        p.get_all_answers()
+        answers = p.all_answers
+        assert len(answers) > 0
+        assert answers[0].word == p.best_word == answers.best_word
+        assert answers[-1].word == answers[len(answers) - 1].word
+        assert [ap.word for ap in answers[:3]] == answers.words()[:3]
+        assert [ap.word for ap in answers] == answers.words()
+        with pytest.raises(IndexError):
+            answers[len(answers)]
+
+    def test_all_answers_empty_when_no_words_remain(self):
+        p = self._make_puzzle()
+        p.remaining_words = SMALL_WORDS
+        assert len(p.get_all_answers()) > 0
+        p.make_guess("SLATE", "NNNNN")
+        assert p.remaining_words == []
+        assert len(p.get_all_answers()) == 0
+        assert len(p.all_answers) == 0
+
+    def test_answer_limit(self):
+        full = self._make_puzzle()
+        limited = self._make_puzzle()
+        limited.answer_limit = 10
+        full.remaining_words = limited.remaining_words = SMALL_WORDS
+        expected = full.get_all_answers().words()
+
+        assert limited.get_all_answers().words() == expected[:10]
+        assert limited.get_all_answers(limit=3).words() == expected[:3]
+        limited.make_guess("CRANE", "NYYNM")
+        assert len(limited.all_answers) <= 10
+
+    def test_time_budget(self):
+        p = self._make_puzzle()
+        full = p.get_all_answers()
+        assert full.exact is True
+
+        # An expired budget still scores the first block, drawn from the remaining words
+        partial = p.get_all_answers(time_budget_ms=0)
+        assert partial.exact is False
+        assert 0 < len(partial) < len(full)
+        assert set(partial.words()) <= set(dictionary.valid_answers)
+
+        p.time_budget_ms = 0
+        assert p.time_budget_ms == 0
+        assert p.get_all_answers().exact is False
+        assert p.get_all_answers(time_budget_ms=60_000).exact is True
+
+    def test_cancel(self):
+        p = self._make_puzzle()
+        p.make_guess("SLATE", "NNNNN")
+        p.get_all_answers()
+        cancel = rs.CancelToken()
+        cancel.set()
+        assert cancel.is_set()
+        with pytest.raises(rs.Cancelled):
+            p.get_all_answers(cancel=cancel)
+        # The ranking of the earlier state is not left behind
+        assert len(p.all_answers) == 0
+
+        cancel.clear()
+        assert len(p.get_all_answers(cancel=cancel)) > 0
+
+    def test_progress(self):
+        p = self._make_puzzle()
+        calls = []
+        p.make_guess("SLATE", "NNNNN", progress=lambda done, total: calls.append((done, total)))
+        total = len(p.all_answers)
+        assert calls[-1] == (total, total)
+        assert all(0 <= done <= total for done, _ in calls)
+
+    def test_puzzle_is_readable_while_ranking(self):
+        p = self._make_puzzle(get_best_answer=True)
+        seen = []
+
+        def progress(done, total):
+            # Runs while the ranking is in progress, as another thread reading the puzzle would
+            seen.append((len(p.remaining_words), len(p.guesses)))
+
+        p.make_guess("SLATE", "NNNNN", progress=progress)
+        p.get_all_answers(progress=progress)
+        remaining = len(p.remaining_words)
+        assert seen and all(entry == (remaining, 1) for entry in seen)
+
+    def test_progress_error_is_raised(self):
+        p = self._make_puzzle()
+
+        def progress(done, total):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            p.get_all_answers(progress=progress)
+
+    def test_lazy_groups_match_python(self):
+        p = self._make_puzzle()
+        p.remaining_words = SMALL_WORDS
+        ap = p.get_all_answers(limit=1)[0]
+        py_map = {g.possibility: sorted(g.words) for g in py_generate_groups(ap.word, p.remaining_words)}
+        assert {g.possibility: sorted(g.words) for g in ap.groups} == py_map
+        assert len(ap.groups) == len(py_map)
+
+    def test_all_answers_dict_lookup(self):
+        p = self._make_puzzle(get_best_answer=False)
+        p.remaining_words = SMALL_WORDS
+        p.get_all_answers()
+        d = p.all_answers_dict()
+        assert d["CRANE"].word == "CRANE"
+        assert "CRANE" in d
+        assert d.get("ZZZZZ") is None
+        with pytest.raises(KeyError):
+            d["ZZZZZ"]
+
     def test_filter_narrows_to_answer(self):
         """Feeding the correct score for each guess should narrow to exactly 1 word."""
         from octordle_solver.solver import score_guess as py_score
@@ -320,6 +557,42 @@ class TestPuzzle:
                 break
         assert target in p.remaining_words
 
+    def test_from_dictionary_shares_dictionary(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        p1 = rs.Puzzle.from_dictionary(d, get_best_answer=False)
+        p2 = rs.Puzzle.from_dictionary(d, get_best_answer=False)
+        p1.make_guess("SLATE", "NNNNN")
+        assert len(p2.remaining_words) == len(dictionary.valid_answers)
+        assert p1.valid_guesses == p2.valid_guesses == dictionary.valid_guesses
+
+    def test_from_dictionary_matches_list_constructor(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        p1 = rs.Puzzle.from_dictionary(d, get_best_answer=False)
+        p2 = self._make_puzzle()
+        p1.make_guess("CRANE", "MYYNY")
+        p2.make_guess("CRANE", "MYYNY")
+        assert p1.remaining_words == p2.remaining_words
+
+    def test_remaining_guess_only_words_match_direct_scoring(self):
+        """Words outside the answer list are scored directly, not via the pattern table."""
+        guess_only = [w for w in dictionary.valid_guesses if w not in set(dictionary.valid_answers)]
+        remaining = ["CRANE", "TRACE"] + guess_only[:20]
+        p = self._make_puzzle()
+        p.remaining_words = remaining
+        expected = rs.get_all_answers(p.remaining_words, dictionary.valid_guesses)
+        ranked = p.get_all_answers()
+        assert [(ap.word, ap.max_group_size) for ap in ranked[:10]] == [
+            (ap.word, ap.max_group_size) for ap in expected[:10]
+        ]
+
+        p.make_guess("CRANE", py_score_guess("CRANE", guess_only[0]))
+        assert guess_only[0] in p.remaining_words
+
+    def test_set_remaining_words_unknown_word_raises(self):
+        p = self._make_puzzle()
+        with pytest.raises(ValueError):
+            p.remaining_words = ["ZZZZZ"]
+
     def test_matches_python_remaining_words(self):
         """Rust Puzzle filter must produce the same remaining_words as Python Puzzle."""
         from octordle_solver.solver import (
@@ -341,6 +614,106 @@ class TestPuzzle:
         assert sorted(py_puzzle.remaining_words) == sorted(rs_puzzle.remaining_words)
 
 
+class TestArrayBuffers:
+    def test_pattern_row_matches_score_guess(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        row = memoryview(d.pattern_row("SPEED"))
+        assert row.readonly
+        assert row.format == "B"
+        assert len(row) == len(dictionary.valid_answers)
+        codes = {"Y": 0, "M": 1, "N": 2}
+        for answer, code in list(zip(dictionary.valid_answers, row))[:200]:
+            feedback = py_score_guess("SPEED", answer)
+            assert code == sum(codes[c] * 3 ** (4 - i) for i, c in enumerate(feedback))
+
+    def test_pattern_table_rows_follow_words(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        table = memoryview(d.pattern_table())
+        assert table.shape == (len(d.words), len(dictionary.valid_answers))
+        assert d.words[: len(dictionary.valid_answers)] == dictionary.valid_answers
+        index = d.words.index("CRANE")
+        assert table[index, 0] == memoryview(d.pattern_row("CRANE"))[0]
+
+    def test_unknown_word_raises(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        with pytest.raises(ValueError):
+            d.pattern_row("ZZZZZ")
+
+    def test_ranking_statistics(self):
+        p = rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, False)
+        p.remaining_words = SMALL_WORDS
+        answers = p.get_all_answers()
+
+        counts = memoryview(answers.group_counts())
+        sizes = memoryview(answers.max_group_sizes())
+        scores = memoryview(p.fitness_scores())
+        assert (counts.format, sizes.format, scores.format) == ("I", "q", "d")
+        assert len(counts) == len(sizes) == len(scores) == len(answers)
+        for i in range(10):
+            ap = answers[i]
+            assert counts[i] == len(ap.groups)
+            assert sizes[i] == ap.max_group_size
+            assert scores[i] == pytest.approx(rs.calculate_fitness_score(ap, p.remaining_words))
+
+    def test_buffers_are_read_only(self):
+        p = rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, False)
+        p.remaining_words = SMALL_WORDS
+        view = memoryview(p.get_all_answers().group_counts())
+        with pytest.raises(TypeError):
+            view[0] = 1
+
+
+class TestSimulateGames:
+    ANSWERS = ["CRANE", "ABACK", "MAMMA", "EERIE", "SLATE", "ZESTY"]
+
+    @staticmethod
+    def _play_with_puzzle(d, answer, opener):
+        puzzle = rs.Puzzle.from_dictionary(d)
+        guess = opener
+        path = [guess]
+        while guess != answer:
+            puzzle.make_guess(guess, py_score_guess(guess, answer))
+            guess = puzzle.best_word
+            path.append(guess)
+        return path
+
+    def test_matches_puzzle_games(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        result = rs.simulate_games(d, "SLATE", self.ANSWERS)
+        assert result.answers == self.ANSWERS
+        counts = memoryview(result.guess_counts()).tolist()
+        for i, answer in enumerate(self.ANSWERS):
+            expected = self._play_with_puzzle(d, answer, "SLATE")
+            assert result.path(i) == expected
+            assert counts[i] == len(expected)
+
+    def test_paths_buffer(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        result = rs.simulate_games(d, "CRANE", self.ANSWERS)
+        paths = memoryview(result.paths())
+        assert paths.format == "H"
+        assert paths.shape == (len(self.ANSWERS), result.max_guesses)
+        words = d.words
+        for i in range(len(self.ANSWERS)):
+            ids = [paths[i, j] for j in range(result.max_guesses) if paths[i, j] != 65535]
+            assert [words[j] for j in ids] == result.path(i)
+        assert result.path(0) == ["CRANE"]
+
+    def test_all_answers(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        result = rs.simulate_games(d, "SLATE")
+        assert len(result) == len(dictionary.valid_answers)
+        counts = memoryview(result.guess_counts()).tolist()
+        assert min(counts) == 1
+        assert result.mean_guesses == pytest.approx(sum(counts) / len(counts))
+        assert all(result.path(i)[-1] == answer for i, answer in enumerate(result.answers))
+
+    def test_invalid_answer_raises(self):
+        d = rs.Dictionary(dictionary.valid_answers, dictionary.valid_guesses)
+        with pytest.raises(ValueError):
+            rs.simulate_games(d, "SLATE", ["ZZZZZ"])
+
+
 # ---------------------------------------------------------------------------
 # get_best_guess_multiple_puzzles
 # ---------------------------------------------------------------------------
@@ -364,9 +737,60 @@ class TestGetBestGuessMultiplePuzzles:
         result = rs.get_best_guess_multiple_puzzles([p1, p2])
         assert result == "CRIMP"
 
+    def test_concurrent_make_guess_matches_sequential(self):
+        """Puzzles ranked from several threads at once give the same results as sequential runs."""
+        guesses = [("SLATE", "NNNNN"), ("CRANE", "NNYNN"), ("PIOUS", "NNNNM"), ("AUDIO", "NNNNN")]
+        puzzles = [rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, True) for _ in guesses]
+        threads = [threading.Thread(target=p.make_guess, args=guess) for p, guess in zip(puzzles, guesses)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for p, (word, result) in zip(puzzles, guesses):
+            expected = rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, True)
+            expected.make_guess(word, result)
+            assert p.all_answers.words() == expected.all_answers.words()
+
+    def test_cancel(self):
+        puzzles = [rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, True) for _ in range(2)]
+        puzzles[0].make_guess("SLATE", "NNNNN")
+        puzzles[1].make_guess("CRANE", "NNNNN")
+        cancel = rs.CancelToken()
+        assert rs.get_best_guess_multiple_puzzles(puzzles, cancel) == rs.get_best_guess_multiple_puzzles(puzzles)
+        cancel.set()
+        with pytest.raises(rs.Cancelled):
+            rs.get_best_guess_multiple_puzzles(puzzles, cancel)
+
+    def test_progress(self):
+        puzzles = [rs.Puzzle(dictionary.valid_answers, dictionary.valid_guesses, True) for _ in range(2)]
+        puzzles[0].make_guess("SLATE", "NNNNN")
+        puzzles[1].make_guess("CRANE", "NNNNN")
+        calls = []
+        result = rs.get_best_guess_multiple_puzzles(puzzles, None, lambda done, total: calls.append((done, total)))
+        assert result == rs.get_best_guess_multiple_puzzles(puzzles)
+        assert calls[-1][0] == calls[-1][1] > 0
+
     def test_result_is_a_word(self):
         p1 = self._solved_puzzle(["CRANE", "SLATE", "TRACE"])
         p2 = self._solved_puzzle(["STALE", "LEAST", "TALES"])
         result = rs.get_best_guess_multiple_puzzles([p1, p2])
         assert isinstance(result, str)
         assert len(result) == 5
+
+
+class TestAsyncSolver:
+    def test_rust_backend_matches_python(self):
+        import asyncio
+
+        from octordle_solver.aio import AsyncSolver
+
+        state = [("SLATE", "NNYMY"), ("CRONY", "MYNNN")]
+
+        async def rank(use_rust):
+            async with AsyncSolver(max_workers=2, use_rust=use_rust) as solver:
+                return await solver.best_guesses(state, hard_mode=True)
+
+        rust_answers = asyncio.run(rank(True))
+        python_answers = asyncio.run(rank(False))
+        assert rust_answers.words() == list(python_answers.words)
@@ -0,0 +1,169 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from octordle_solver.server import BadRequest, SolverHTTPServer, SolverService, parse_state
+from octordle_solver.solver import Puzzle, get_best_guess_multiple_puzzles
+
+
+STATE = [["SLATE", "NNYMY"], ["CRONY", "MYNNN"]]
+
+
+@pytest.fixture
+def service(mocker, inline_executor):
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+    service = SolverService(cache_size=2, max_workers=1, use_rust=False)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def server(service):
+    server = SolverHTTPServer(("127.0.0.1", 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, path, payload=None):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    data = None if payload is None else json.dumps(payload).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data)) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def replay(state):
+    puzzle = Puzzle(get_best_answer=False)
+    for word, result in state:
+        puzzle.make_guess(word, result)
+    return puzzle
+
+
+def test_parse_state():
+    assert parse_state([["slate", "nnymy"]]) == (("SLATE", "NNYMY"),)
+
+
+@pytest.mark.parametrize("guesses", [{"SLATE": "NNYMY"}, [["SLATE"]], [["SLATE", 1]], [["SLATE", "NNYMX"]]])
+def test_parse_state_rejects_malformed_guesses(guesses):
+    with pytest.raises(BadRequest):
+        parse_state(guesses)
+
+
+def test_health(server):
+    assert request(server, "/health") == (200, {"status": "ok"})
+
+
+def test_best_guess(server):
+    status, body = request(server, "/best-guess", {"guesses": STATE, "limit": 3})
+    assert status == 200
+    puzzle = replay(STATE)
+    assert body["remaining"] == len(puzzle.remaining_words)
+    assert [answer["word"] for answer in body["answers"]] == puzzle.get_all_answers().words[:3]
+
+
+def test_best_guess_time_budget(server, service):
+    status, body = request(server, "/best-guess", {"guesses": STATE, "limit": 3, "time_budget_ms": 1000})
+    assert status == 200
+    assert body["exact"] is True
+    assert [answer["word"] for answer in body["answers"]] == replay(STATE).get_all_answers().words[:3]
+    assert service.metrics()["cache"]["size"] == 1
+
+
+def test_inexact_rankings_are_not_cached(service, mocker):
+    ranking = mocker.Mock(exact=False)
+    mocker.patch("octordle_solver.server.iter_all_answers", return_value=iter([ranking]))
+    _, answers = service.ranked_puzzle(parse_state(STATE[:1]), time_budget_ms=0)
+    assert answers is ranking
+    assert service.metrics()["cache"]["size"] == 0
+
+
+def test_budgeted_ranking_stops_the_workers(service, mocker):
+    ranking = mocker.Mock(exact=False)
+    seen = {}
+
+    def fake_iter_all_answers(*args, **kwargs):
+        seen.update(kwargs, cancelled=service._worker_cancel.is_set())
+        yield ranking
+
+    mocker.patch("octordle_solver.server.iter_all_answers", side_effect=fake_iter_all_answers)
+    service._rank_python(replay(STATE[:1]), time_budget_ms=0)
+    # Batches are sized for the service's own pool, and left running only while the ranking is in progress
+    assert seen["num_workers"] == service.max_workers
+    assert seen["executor"] is service._processes
+    assert not seen["cancelled"]
+    assert service._worker_cancel.is_set()
+
+
+def test_filter(server):
+    status, body = request(server, "/filter", {"guesses": STATE})
+    assert status == 200
+    assert body["remaining_words"] == replay(STATE).remaining_words
+
+
+def test_multi_board(server):
+    boards = [STATE, [["SLATE", "YNNNN"]], [["SLATE", "YYYYY"]]]
+    status, body = request(server, "/multi-board", {"boards": boards})
+    assert status == 200
+    puzzles = [replay(board) for board in boards[:2]]
+    for puzzle in puzzles:
+        puzzle.get_all_answers()
+    assert body["best_guess"] == get_best_guess_multiple_puzzles(puzzles)
+
+
+def test_multi_board_all_solved(server):
+    assert request(server, "/multi-board", {"boards": [[["SLATE", "YYYYY"]]]}) == (200, {"best_guess": None})
+
+
+@pytest.mark.parametrize(
+    "path, payload",
+    [
+        ("/best-guess", {"guesses": "SLATE"}),
+        ("/best-guess", {"guesses": STATE, "limit": -1}),
+        ("/best-guess", {"guesses": STATE, "time_budget_ms": "soon"}),
+        ("/best-guess", {"guesses": STATE, "time_budget_ms": float("inf")}),
+        ("/filter", {"guesses": [["SLAT", "NNYMY"]]}),
+        ("/multi-board", {"boards": []}),
+        ("/multi-board", [1, 2]),
+    ],
+)
+def test_bad_request(server, path, payload):
+    status, body = request(server, path, payload)
+    assert status == 400
+    assert "error" in body
+
+
+def test_unknown_endpoint(server):
+    assert request(server, "/nope")[0] == 404
+    assert request(server, "/nope", {})[0] == 404
+
+
+def test_ranking_cache(service):
+    state = parse_state(STATE)
+    first = service.ranked_puzzle(state)
+    assert service.ranked_puzzle(state) is first
+    service.ranked_puzzle(parse_state(STATE[:1]))
+    service.ranked_puzzle(parse_state([["SLATE", "YNNNN"]]))
+    # The cache holds two states, so the first one was evicted
+    assert service.ranked_puzzle(state) is not first
+    assert service.metrics()["cache"] == {"size": 2, "hits": 1, "misses": 4}
+
+
+def test_metrics(server):
+    request(server, "/filter", {"guesses": STATE})
+    request(server, "/filter", {"guesses": "SLATE"})
+    status, body = request(server, "/metrics")
+    assert status == 200
+    assert body["backend"] == "python"
+    metrics = body["endpoints"]["/filter"]
+    assert metrics["requests"] == 2
+    assert metrics["errors"] == 1
+    assert 0 <= metrics["p50_ms"] <= metrics["p95_ms"] <= metrics["max_ms"]
+    assert metrics["requests_per_second"] > 0
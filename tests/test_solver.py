@@ -1,18 +1,33 @@
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+
 import pytest
 
+from octordle_solver.dictionary import dictionary
 from octordle_solver.solver import (
     AnswerPossibility,
+    Cancelled,
     Group,
     Guess,
     Puzzle,
+    RankedAnswers,
     calculate_fitness_score,
     create_chunks,
     generate_groups,
     get_all_answers,
     get_best_guess_multiple_puzzles,
+    group_sizes,
+    group_words,
+    iter_all_answers,
+    prioritize_guesses,
+    process_word_batch,
+    rank_batch_results,
     score_guess,
 )
 
+
 GROUP_1 = Group(["DATER"], (2, 2, 2, 0, 1))
 GROUP_2 = Group(["EATER"], (2, 1, 2, 0, 2))
 GROUP_3 = Group(["HATER"], (0, 2, 2, 0, 2))
@@ -70,6 +85,23 @@ class TestAnswerPossibility:
         answer_possibility = AnswerPossibility("CRANE", [])
         assert answer_possibility.max_group_size == -1
 
+    def test_from_stats_generates_groups_lazily(self):
+        remaining_words = ("ABCDE", "ABCED", "EDCBA")
+        answer_possibility = AnswerPossibility.from_stats("ABCDE", 3, 1, remaining_words)
+        assert answer_possibility._groups is None
+        assert answer_possibility.group_count == 3
+        assert answer_possibility.max_group_size == 1
+        assert answer_possibility._groups is None
+
+        assert answer_possibility.groups == generate_groups("ABCDE", remaining_words)
+
+    def test_slots(self):
+        answer_possibility = AnswerPossibility("CRANE", self.demo_groups)
+        with pytest.raises(AttributeError):
+            answer_possibility.extra = 1
+        with pytest.raises(AttributeError):
+            GROUP_1.extra = 1
+
     @pytest.mark.parametrize(
         "p1, p2",
         [
@@ -139,6 +171,32 @@ def test_calculate_fitness_score(p1, p2):
     assert score_1 > score_2
 
 
+class TestRankedAnswers:
+    remaining_words = ["ABCDE", "ABCED", "EDCBA"]
+
+    def make_answers(self):
+        return RankedAnswers(["ABCDE", "EDCBA", "VWXYZ"], [3, 2, 1], [1, 2, 3], self.remaining_words)
+
+    def test_indexing(self):
+        answers = self.make_answers()
+        assert len(answers) == 3
+        assert answers[0].word == "ABCDE"
+        assert answers[-1].word == "VWXYZ"
+        assert [answer.word for answer in answers[1:]] == ["EDCBA", "VWXYZ"]
+        assert [answer.max_group_size for answer in answers] == [1, 2, 3]
+        assert answers[0].groups == generate_groups("ABCDE", self.remaining_words)
+
+    def test_by_word(self):
+        answers_by_word = self.make_answers().by_word()
+        assert list(answers_by_word) == ["ABCDE", "EDCBA", "VWXYZ"]
+        assert "EDCBA" in answers_by_word
+        assert "AAAAA" not in answers_by_word
+        assert answers_by_word["EDCBA"].group_count == 2
+        assert answers_by_word.get("AAAAA") is None
+        with pytest.raises(KeyError):
+            answers_by_word["AAAAA"]
+
+
 class TestPuzzle:
     def test_init(self):
         puzzle = Puzzle()
@@ -187,6 +245,13 @@ class TestPuzzle:
         assert puzzle.all_answers_dict == {}
         assert puzzle.remaining_words != []
 
+    def test_best_word(self):
+        puzzle = Puzzle(get_best_answer=False)
+        assert puzzle.best_word is None
+
+        puzzle.all_answers = [AnswerPossibility("CRANE", []), AnswerPossibility("SLATE", [])]
+        assert puzzle.best_word == "CRANE"
+
     def test_is_solved(self, mocker):
         puzzle = Puzzle()
 
@@ -207,6 +272,58 @@ class TestPuzzle:
         puzzle.make_guess("CRAFT", "YYYYY")
         assert puzzle.is_solved
 
+    @pytest.mark.parametrize(
+        "guesses",
+        [
+            [("SLATE", "NNYMY"), ("CRONY", "MYNNN")],
+            [("EERIE", "MNNNY"), ("STEEL", "NMMNN")],
+            [("XXXXX", "NNNNN")],
+        ],
+    )
+    def test_hard_mode_filters_guesses(self, guesses):
+        def reuses_hints(word, guess, result):
+            revealed = Counter()
+            for i, (letter, letter_result) in enumerate(zip(guess, result)):
+                if letter_result == "Y" and word[i] != letter:
+                    return False
+                if letter_result != "N":
+                    revealed[letter] += 1
+            return all(word.count(letter) >= count for letter, count in revealed.items())
+
+        puzzle = Puzzle(get_best_answer=False, hard_mode=True)
+        expected = dictionary.valid_guesses
+        for guess, result in guesses:
+            expected = [word for word in expected if reuses_hints(word, guess, result)]
+            puzzle.make_guess(guess, result)
+            assert puzzle.valid_guesses == expected
+
+    def test_hard_mode_off_keeps_guesses(self):
+        puzzle = Puzzle(get_best_answer=False)
+        puzzle.make_guess("SLATE", "NNYMY")
+        assert puzzle.valid_guesses == dictionary.valid_guesses
+
+    def test_hard_mode_restarts_after_valid_guesses_change(self):
+        puzzle = Puzzle(get_best_answer=False, hard_mode=True)
+        puzzle.make_guess("SLATE", "NNYNN")
+        puzzle.valid_guesses = ["CRANE", "CRONY", "TRACE"]
+        puzzle.make_guess("CRONY", "YNNNN")
+        assert puzzle.valid_guesses == ["CRANE", "CRONY"]
+        puzzle.reset()
+        assert puzzle.valid_guesses == dictionary.valid_guesses
+
+    def test_hard_mode_ranks_only_legal_guesses(self, mocker, inline_executor):
+        mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+        puzzle = Puzzle(hard_mode=True)
+        puzzle.make_guess("SLATE", "NNYMY")
+        ranked = set(puzzle.all_answers.words)
+        assert ranked == set(puzzle.remaining_words) | set(puzzle.valid_guesses)
+        assert len(ranked) < 100
+
+    def test_remaining_ids(self):
+        puzzle = Puzzle(get_best_answer=False)
+        puzzle.remaining_words = ["CRANE", "SLATE"]
+        assert dictionary.vocabulary.words_for(puzzle.remaining_ids()) == ["CRANE", "SLATE"]
+
     def test_reset(self, mocker):
         puzzle = Puzzle()
         puzzle.remaining_words = [
@@ -299,6 +416,14 @@ def test_generate_groups(given_word, remaining_words, expected):
     assert generate_groups(given_word, remaining_words) == expected
 
 
+def test_group_sizes_and_words_match_generate_groups():
+    remaining_words = ["ABCDE", "ABCED", "EDCBA", "ABCDZ", "ABCDY"]
+    groups = generate_groups("ABCDE", remaining_words)
+    assert group_sizes("ABCDE", remaining_words) == {group.possibility: len(group.words) for group in groups}
+    for group in groups:
+        assert group_words("ABCDE", group.possibility, remaining_words) == group.words
+
+
 def test_create_chunks():
     in_list = [f"{i:02d}" for i in range(23)]
     chunks = list(create_chunks(in_list, 10))
@@ -307,22 +432,12 @@ def test_create_chunks():
     assert chunks[2] == ["20", "21", "22"]
 
 
-def test_get_all_answers_uses_valid_guesses_parameter(mocker):
-    class InlineExecutor:
-        def __enter__(self):
-            return self
-
-        def __exit__(self, exc_type, exc, tb):
-            return False
-
-        def map(self, func, iterable):
-            return map(func, iterable)
-
+def test_get_all_answers_uses_valid_guesses_parameter(mocker, inline_executor):
     mock_dictionary = mocker.patch("octordle_solver.solver.dictionary")
     mock_dictionary.words = ["XXXXX"]
     mock_dictionary.valid_guesses = ["YYYYY"]
 
-    mocker.patch("octordle_solver.solver.concurrent.futures.ProcessPoolExecutor", InlineExecutor)
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
 
     remaining_words = ["CRANE", "SLATE"]
     valid_guesses = ["ADIEU"]
@@ -335,6 +450,250 @@ def test_get_all_answers_uses_valid_guesses_parameter(mocker):
     assert "YYYYY" not in answer_words
 
 
+def test_get_all_answers_order_matches_sorted_possibilities(mocker, inline_executor):
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    valid_guesses = ["ADIEU", "AAAAA", "CARTS", "TRACE", "EEEEE"]
+
+    all_answers = get_all_answers(remaining_words, valid_guesses)
+    expected = [
+        AnswerPossibility(word, generate_groups(word, remaining_words))
+        for word in dict.fromkeys(remaining_words + valid_guesses)
+    ]
+    expected.sort(reverse=True)
+
+    assert [answer.word for answer in all_answers] == [answer.word for answer in expected]
+    assert [answer.max_group_size for answer in all_answers] == [answer.max_group_size for answer in expected]
+
+
+def test_prioritize_guesses():
+    remaining_words = ["CRANE", "TRACE"]
+    guesses = prioritize_guesses(remaining_words, ["ZZZZZ", "CRATE", "CRANE", "RACET"])
+    # Remaining words first, then by coverage of the remaining words' letters; ties keep their order
+    assert guesses == ["CRANE", "TRACE", "CRATE", "RACET", "ZZZZZ"]
+
+
+def test_iter_all_answers_ends_with_get_all_answers(mocker, inline_executor):
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    valid_guesses = ["ADIEU", "AAAAA", "CARTS", "TRACE", "EEEEE", "SALET", "ROATE"]
+
+    rankings = list(iter_all_answers(remaining_words, valid_guesses, limit=2, num_workers=2))
+
+    assert len(rankings) > 1
+    assert all(len(ranking) <= 2 for ranking in rankings[:-1])
+    # The first batch scores the remaining words
+    assert rankings[0].words[0] in remaining_words
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+    expected = get_all_answers(remaining_words, valid_guesses)
+    assert rankings[-1].words == expected.words
+    assert list(rankings[-1].max_group_sizes) == list(expected.max_group_sizes)
+
+
+def test_rank_batch_results_limit():
+    batch_results = [[("AAAAA", 2, 3), ("BBBBB", 3, 2)], [("CCCCC", 3, 2), ("DDDDD", 3, 1)]]
+    answers = rank_batch_results(batch_results, ["AAAAA"])
+    assert list(answers.words) == ["DDDDD", "BBBBB", "CCCCC", "AAAAA"]
+    # Ties keep their batch order
+    assert list(rank_batch_results(batch_results, ["AAAAA"], limit=2).words) == ["DDDDD", "BBBBB"]
+    assert list(rank_batch_results(batch_results, ["AAAAA"], limit=0).words) == []
+
+
+@pytest.mark.parametrize("remaining_words, expected", [([], []), (["CRANE"], [["CRANE"]])])
+def test_iter_all_answers_trivial(remaining_words, expected):
+    assert [ranking.words for ranking in iter_all_answers(remaining_words)] == expected
+
+
+class FirstBatchExecutor:
+    """Runs the first submitted batch and leaves the others pending forever."""
+
+    def __init__(self, max_workers=None, **kwargs):
+        self.futures = []
+
+    def submit(self, func, *args):
+        future = Future()
+        if not self.futures:
+            future.set_result(func(*args))
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+def test_iter_all_answers_stops_at_deadline():
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    valid_guesses = ["ADIEU", "AAAAA", "CARTS", "TRACE", "EEEEE", "SALET", "ROATE"]
+    executor = FirstBatchExecutor()
+
+    rankings = list(iter_all_answers(remaining_words, valid_guesses, num_workers=2, deadline=0, executor=executor))
+
+    # One interim ranking after the first batch, then the last ranking once the deadline has passed
+    assert len(rankings) == 2
+    ranking = rankings[-1]
+    assert not ranking.exact
+    # Only the first batch, the highest-priority guesses, was scored
+    assert set(ranking.words) == set(prioritize_guesses(remaining_words, valid_guesses)[: len(ranking)])
+    assert 0 < len(ranking) < len(set(remaining_words + valid_guesses))
+    assert all(future.cancelled() for future in executor.futures[1:])
+
+
+class DelayedExecutor(FirstBatchExecutor):
+    """Runs the first submitted batch at once and the others shortly after, from a timer thread."""
+
+    def submit(self, func, *args):
+        if not self.futures:
+            return super().submit(func, *args)
+        future = Future()
+        threading.Timer(0.05, lambda: future.set_result(func(*args))).start()
+        self.futures.append(future)
+        return future
+
+
+@pytest.mark.parametrize("time_budget_s", [float("inf"), 1e300])
+def test_iter_all_answers_with_unbounded_deadline(time_budget_s):
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    valid_guesses = ["ADIEU", "AAAAA", "CARTS", "TRACE", "EEEEE", "SALET", "ROATE"]
+    deadline = time.monotonic() + time_budget_s
+
+    rankings = list(
+        iter_all_answers(remaining_words, valid_guesses, num_workers=2, deadline=deadline, executor=DelayedExecutor())
+    )
+
+    # Too far off to wait for, so every batch is waited for instead
+    assert rankings[-1].exact
+
+
+def test_iter_all_answers_without_interim_rankings():
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    valid_guesses = ["ADIEU", "AAAAA", "CARTS", "TRACE", "EEEEE", "SALET", "ROATE"]
+
+    rankings = list(
+        iter_all_answers(remaining_words, valid_guesses, limit=0, num_workers=2, executor=DelayedExecutor())
+    )
+
+    assert len(rankings) > 1
+    assert all(len(ranking) == 0 and not ranking.exact for ranking in rankings[:-1])
+    assert rankings[-1].exact
+    assert len(rankings[-1]) == len(set(remaining_words + valid_guesses))
+
+
+def test_get_all_answers_time_budget(mocker, inline_executor):
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", FirstBatchExecutor)
+    answers = get_all_answers(remaining_words, ["ADIEU", "CARTS", "SALET"], time_budget_ms=0)
+    assert not answers.exact
+    assert len(answers) > 0
+
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", inline_executor)
+    assert get_all_answers(remaining_words, ["ADIEU"]).exact
+
+
+def test_puzzle_time_budget(mocker):
+    get_all_answers_mock = mocker.patch("octordle_solver.solver.get_all_answers")
+    puzzle = Puzzle()
+    puzzle.time_budget_ms = 50
+    puzzle.make_guess("SLATE", "NNYMY")
+    assert get_all_answers_mock.call_args.kwargs == {"time_budget_ms": 50, "cancel": None, "progress": None}
+    puzzle.get_all_answers(time_budget_ms=10)
+    assert get_all_answers_mock.call_args.kwargs == {"time_budget_ms": 10, "cancel": None, "progress": None}
+
+
+def test_get_all_answers_cancel(mocker):
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    executor = FirstBatchExecutor()
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", return_value=executor)
+    cancel = threading.Event()
+    # The other batches never finish, so only the cancel token ends the wait
+    timer = threading.Timer(0.05, cancel.set)
+    timer.start()
+    with pytest.raises(Cancelled):
+        get_all_answers(remaining_words, ["ADIEU", "CARTS", "SALET"], cancel=cancel)
+    timer.join()
+    assert all(future.cancelled() for future in executor.futures[1:])
+
+
+def test_process_word_batch_stops_when_cancelled(mocker):
+    event = threading.Event()
+    mocker.patch("octordle_solver.solver._worker_cancel_event", event)
+    args = (["CRANE", "SLATE"], ["TRACE", "CRATE"])
+    assert len(process_word_batch(args)) == 2
+    event.set()
+    assert process_word_batch(args) == []
+
+
+def test_puzzle_make_guess_cancel(mocker):
+    mocker.patch("concurrent.futures.ProcessPoolExecutor", FirstBatchExecutor)
+    puzzle = Puzzle()
+    puzzle.all_answers = puzzle.all_answers_dict = mocker.sentinel.stale
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(Cancelled):
+        puzzle.make_guess("SLATE", "NNYMY", cancel=cancel)
+    assert puzzle.guesses == [Guess("SLATE", "NNYMY")]
+    assert puzzle.all_answers == [] and puzzle.all_answers_dict == {}
+
+
+def test_puzzle_make_guess_iter():
+    puzzle = Puzzle(get_best_answer=False)
+    puzzle.valid_guesses = ["ADIEU", "CARTS", "SALET"]
+    rankings = list(puzzle.make_guess_iter("SLATE", "NNYMY", limit=1))
+    assert puzzle.guesses == [Guess("SLATE", "NNYMY")]
+    assert puzzle.all_answers is rankings[-1]
+    assert puzzle.best_word == rankings[-1][0].word
+    assert set(puzzle.all_answers_dict) == set(puzzle.remaining_words + puzzle.valid_guesses)
+
+
+def test_get_best_guess_multiple_puzzles_cancel():
+    puzzles = []
+    for remaining_words in (["CRANE", "TRACE", "CRATE"], ["SLATE", "STALE", "LEAST"]):
+        puzzle = Puzzle(get_best_answer=False)
+        puzzle.remaining_words = remaining_words
+        puzzle.all_answers = RankedAnswers(remaining_words[:1], [1], [3], remaining_words)
+        puzzle.all_answers_dict = puzzle.all_answers.by_word()
+        puzzles.append(puzzle)
+    cancel = threading.Event()
+    assert get_best_guess_multiple_puzzles(puzzles, cancel) in ("CRANE", "SLATE")
+    cancel.set()
+    with pytest.raises(Cancelled):
+        get_best_guess_multiple_puzzles(puzzles, cancel)
+
+
+def test_iter_all_answers_progress():
+    remaining_words = ["CRANE", "SLATE", "TRACE", "STALE", "LEAST", "CRATE"]
+    valid_guesses = ["ADIEU", "CARTS", "SALET"]
+    executor = FirstBatchExecutor()
+    calls = []
+
+    def progress(done, total):
+        calls.append((done, total))
+        # Let every later batch finish too
+        for future in executor.futures:
+            if not future.done():
+                future.set_result([])
+
+    rankings = list(
+        iter_all_answers(remaining_words, valid_guesses, num_workers=2, executor=executor, progress=progress)
+    )
+    total = len(set(remaining_words + valid_guesses))
+    assert calls[0] == (0, total)
+    assert calls[1][0] == len(rankings[0]) > 0
+    assert all(call[1] == total for call in calls)
+
+
+def test_get_best_guess_multiple_puzzles_progress(mocker):
+    puzzles = []
+    for remaining_words in (["CRANE", "TRACE", "CRATE"], ["SLATE", "STALE", "LEAST"]):
+        puzzle = Puzzle(get_best_answer=False)
+        puzzle.remaining_words = remaining_words
+        puzzle.all_answers = RankedAnswers(remaining_words, [1, 1, 1], [3, 3, 3], remaining_words)
+        puzzle.all_answers_dict = puzzle.all_answers.by_word()
+        puzzles.append(puzzle)
+    progress = mocker.Mock()
+    get_best_guess_multiple_puzzles(puzzles, progress=progress)
+    progress.assert_called_with(6, 6)
+
+
 class TestGetBestGuessMultiplePuzzles:
     # TODO: Figure out what takes so long
 
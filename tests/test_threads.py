@@ -34,3 +34,15 @@ class TestThreadWorker:
 
         with qtbot.waitSignal(worker.signals.canceled):
             worker.run()
+
+    def test_run_cancelled_while_running(self, qtbot):
+        cancel_flag = threading.Event()
+
+        def cancelled_func():
+            cancel_flag.set()
+            raise RuntimeError("Cancelled")
+
+        worker = ThreadWorker(cancelled_func, cancel_flag=cancel_flag)
+        with qtbot.assertNotEmitted(worker.signals.error):
+            with qtbot.waitSignals([worker.signals.canceled, worker.signals.finished]):
+                worker.run()
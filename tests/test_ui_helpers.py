@@ -10,6 +10,7 @@ from octordle_solver.ui.helpers import (
     DARK_TILE_WHITE_BACKGROUND_COLOR,
     LIGHT_TILE_WHITE_TEXT_COLOR,
     DARK_TILE_WHITE_TEXT_COLOR,
+    progress_text,
 )
 
 
@@ -110,3 +111,17 @@ class TestLetterWidget:
         assert widget.text() == ""
         assert widget.current_color == Color.WHITE
         assert not widget.letter_is_set
+
+
+@pytest.mark.parametrize(
+    "done, total, elapsed, expected",
+    [
+        (0, 100, 1.0, "0%"),
+        (40, 100, 2.0, "40% (about 3 s left)"),
+        (10, 100, 10.0, "10% (about 2 min left)"),
+        (100, 100, 5.0, "100%"),
+        (0, 0, 0.0, ""),
+    ],
+)
+def test_progress_text(done, total, elapsed, expected):
+    assert progress_text(done, total, elapsed) == expected
@@ -0,0 +1,126 @@
+from collections.abc import Sequence
+
+from octordle_solver.solver import RankedAnswers
+from octordle_solver.ui.models import (
+    FETCH_BATCH_SIZE,
+    PATTERN_ROLE,
+    GroupTreeModel,
+    LazyListModel,
+    RankedGuessModel,
+    WordListModel,
+)
+from PySide6 import QtCore
+
+
+class CountingAnswers(Sequence):
+    """Ranking that counts how many entries were read."""
+
+    def __init__(self, size):
+        self.size = size
+        self.reads = 0
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return RankedAnswers([f"W{index:04d}"], [1], [1], [])[0]
+
+
+def test_lazy_list_model_reads_words_through_function(qtbot):
+    model = LazyListModel(lambda row: f"W{row:04d}")
+    assert model.rowCount() == 0
+    assert model.word(3) == "W0003"
+
+
+def test_word_list_model_fetches_in_batches(qtbot):
+    model = WordListModel()
+    words = [f"W{i:04d}" for i in range(FETCH_BATCH_SIZE * 2 + 1)]
+    model.set_words(words)
+    assert model.total_rows == len(words)
+    assert model.rowCount() == FETCH_BATCH_SIZE
+    assert model.data(model.index(1)) == "W0001"
+
+    root = QtCore.QModelIndex()
+    while model.canFetchMore(root):
+        model.fetchMore(root)
+    assert model.rowCount() == len(words)
+    assert model.word(len(words) - 1) == words[-1]
+
+
+def test_ranked_guess_model_reads_rows_on_demand(qtbot):
+    model = RankedGuessModel()
+    answers = CountingAnswers(13000)
+    model.set_ranking(answers, index=())
+    assert model.total_rows == 13000
+    assert answers.reads == 0
+    assert model.word(5) == "W0005"
+    assert answers.reads == 1
+
+
+def test_ranked_guess_model_pins_words(qtbot):
+    model = RankedGuessModel()
+    model.pin("SLATE")
+    model.pin("CRANE")
+    model.pin("SLATE")
+    assert [model.word(row) for row in range(model.rowCount())] == ["SLATE", "CRANE"]
+
+    answers = RankedAnswers(["TRACE", "CRANE"], [2, 1], [1, 2], ["TRACE", "CRANE"])
+    model.set_ranking(answers, answers.by_word())
+    # CRANE is ranked, so it is shown in its ranked place only
+    assert [model.word(row) for row in range(model.rowCount())] == ["SLATE", "TRACE", "CRANE"]
+    assert model.answer(0) is None
+    assert model.answer(1).word == "TRACE"
+
+    # Without an index the ranking is scanned
+    model.set_ranking(answers[:1])
+    assert [model.word(row) for row in range(model.rowCount())] == ["SLATE", "CRANE", "TRACE"]
+
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_group_tree_model_fetches_words_on_expand(qtbot):
+    fetched = []
+    words = {"NNNNN": [f"W{i:04d}" for i in range(FETCH_BATCH_SIZE + 1)], "YYYYY": ["SLATE"]}
+
+    def fetch_words(pattern):
+        fetched.append(pattern)
+        return words[pattern]
+
+    model = GroupTreeModel()
+    model.set_partition("SLATE", {pattern: len(group) for pattern, group in words.items()}, fetch_words)
+    assert model.rowCount() == 2
+    group = model.index(0, 0)
+    assert model.data(group) == "SLATE"
+    assert model.data(group, PATTERN_ROLE) == "NNNNN"
+    assert model.hasChildren(group)
+    assert model.rowCount(group) == 0
+    assert fetched == []
+
+    model.fetchMore(group)
+    assert fetched == ["NNNNN"]
+    assert model.rowCount(group) == FETCH_BATCH_SIZE
+    child = model.index(1, 0, group)
+    assert model.data(child) == "W0001"
+    assert model.parent(child) == group
+    assert not model.hasChildren(child)
+
+    model.fetchMore(group)
+    assert model.rowCount(group) == FETCH_BATCH_SIZE + 1
+    assert not model.canFetchMore(group)
+    assert fetched == ["NNNNN"]
+
+    model.clear()
+    assert model.rowCount() == 0
+
+
+def test_group_tree_model_stops_at_the_words_fetched(qtbot):
+    model = GroupTreeModel()
+    # The group promises more words than it has
+    model.set_partition("SLATE", {"NNNNN": 3}, lambda pattern: ["CRONY"])
+    group = model.index(0, 0)
+    model.fetchMore(group)
+    assert model.rowCount(group) == 1
+    assert not model.canFetchMore(group)
+    assert model.group_sizes == [1]
@@ -0,0 +1,105 @@
+from octordle_solver.solver import Guess, Puzzle, group_sizes
+from octordle_solver.ui.speculation import SpeculativeRanker, game_state
+
+REMAINING_WORDS = ["CRANE", "TRACE", "CRATE", "SLATE", "STALE", "LEAST", "BRINK"]
+
+
+class InlineThreadPool:
+    """Runs each worker as soon as it is started."""
+
+    def __init__(self):
+        self.priorities = []
+
+    def start(self, runnable, priority=0):
+        self.priorities.append(priority)
+        runnable.run()
+
+
+class HeldThreadPool:
+    """Keeps the started workers until they are run explicitly."""
+
+    def __init__(self):
+        self.runnables = []
+
+    def start(self, runnable, priority=0):
+        self.runnables.append(runnable)
+
+
+def make_puzzle():
+    puzzle = Puzzle(get_best_answer=False)
+    puzzle.remaining_words = REMAINING_WORDS
+    return puzzle
+
+
+def test_ranks_largest_groups_first(qtbot):
+    threadpool = InlineThreadPool()
+    ranker = SpeculativeRanker(threadpool, max_patterns=2)
+    puzzle = make_puzzle()
+    ranker.start(puzzle, "SLATE")
+
+    sizes = group_sizes("SLATE", REMAINING_WORDS)
+    sizes.pop("YYYYY")
+    expected = sorted(sizes, key=sizes.__getitem__, reverse=True)[:2]
+    assert ranker.cached_states == [((), "SLATE", pattern) for pattern in expected]
+    assert threadpool.priorities == [-1, -1]
+    assert not ranker.is_running
+    # Speculation works on copies
+    assert puzzle.guesses == []
+    assert puzzle.remaining_words == REMAINING_WORDS
+
+
+def test_take_returns_a_ranked_copy(qtbot):
+    ranker = SpeculativeRanker(InlineThreadPool())
+    puzzle = make_puzzle()
+    ranker.start(puzzle, "SLATE")
+    result = ranker.cached_states[0][2]
+
+    assert ranker.take(puzzle, "SLATE", "YYYYY") is None
+    taken = ranker.take(puzzle, "SLATE", result)
+    assert taken.guesses == [Guess("SLATE", result)]
+    expected = make_puzzle()
+    expected.make_guess("SLATE", result)
+    assert taken.remaining_words == expected.remaining_words
+
+    # Guessing on the puzzle taken leaves the cached one as it was
+    taken.make_guess("CRANE", "NNNNN")
+    assert ranker.take(puzzle, "SLATE", result).guesses == [Guess("SLATE", result)]
+
+
+def test_cache_is_bounded(qtbot):
+    ranker = SpeculativeRanker(InlineThreadPool(), cache_size=2)
+    ranker.start(make_puzzle(), "SLATE")
+    assert len(ranker.cached_states) == 2
+
+
+def test_known_states_are_not_ranked_again(qtbot):
+    threadpool = InlineThreadPool()
+    ranker = SpeculativeRanker(threadpool, max_patterns=2)
+    ranker.start(make_puzzle(), "SLATE")
+    ranker.start(make_puzzle(), "SLATE")
+    assert len(threadpool.priorities) == 2
+
+
+def test_stop_cancels_speculation(qtbot):
+    threadpool = HeldThreadPool()
+    ranker = SpeculativeRanker(threadpool)
+    puzzle = make_puzzle()
+    ranker.start(puzzle, "SLATE")
+    assert ranker.is_running
+    assert len(threadpool.runnables) == 1
+
+    running = threadpool.runnables[0]
+    ranker.stop()
+    assert running.cancel_flag.is_set()
+    assert not ranker.is_running
+
+    # The stopped ranking does not start the ones that were queued
+    running.run()
+    assert len(threadpool.runnables) == 1
+    assert ranker.cached_states == []
+
+
+def test_game_state():
+    puzzle = make_puzzle()
+    puzzle.make_guess("SLATE", "NNYMY")
+    assert game_state(puzzle) == (("SLATE", "NNYMY"),)
@@ -2,16 +2,16 @@ from octordle_solver.ui.wordle_solver_ui import (
     CompareToWordleBotDialog,
     DiffDialog,
     HelpDialog,
+    INTERIM_GUESS_LIMIT,
     WordleSolver,
     WORDLE_SOLVER_DARK_STYLE_SHEET,
     WORDLE_SOLVER_LIGHT_STYLE_SHEET,
 )
 from octordle_solver.ui.helpers import Color, DARK_TILE_BORDER_COLOR, LIGHT_TILE_BORDER_COLOR
-from octordle_solver.solver import get_cached_best_second_guess, AnswerPossibility, Group
+from octordle_solver.solver import get_cached_best_second_guess, group_sizes, group_words, AnswerPossibility, Group
 from octordle_solver.constants import STARTING_GUESS
-from octordle_solver.ui.helpers import get_word_colors, style_text
+from octordle_solver.ui.models import PATTERN_ROLE
 from PySide6.QtCore import Qt
-from PySide6 import QtWidgets
 import pytest
 
 
@@ -153,28 +153,107 @@ class TestWordleSolverUI:
         widget.puzzle.remaining_words = self.FAKE_REMAINING_WORDS
         widget._on_get_answer_possibilities_finished()
         # The best guess list should now contain the words from the all_answers
-        assert widget.best_guess_list.count() == 2
-        assert widget.best_guess_list.item(0).text() == "WORD1"
-        assert widget.best_guess_list.item(1).text() == "WORD2"
+        assert widget.best_guess_model.rowCount() == 2
+        assert widget.best_guess_model.word(0) == "WORD1"
+        assert widget.best_guess_model.word(1) == "WORD2"
 
         # The remaining words label should show the correct count
         assert widget.remaining_words_label.text() == "6 Remaining Word(s)"
-        assert widget.remaining_words_list.count() == 6
+        assert widget.remaining_words_model.rowCount() == 6
         remaining_words_in_list = [
-            widget.remaining_words_list.item(i).text() for i in range(widget.remaining_words_list.count())
+            widget.remaining_words_model.word(i) for i in range(widget.remaining_words_model.rowCount())
         ]
         assert set(remaining_words_in_list) == set(["AAAAA", "BBBBB", "CCCCC", "XXXXX", "YYYYY", "ZZZZZ"])
 
+    def test_entering_a_word_starts_speculation(self, qtbot, mocker):
+        widget = WordleSolver()
+        qtbot.addWidget(widget)
+        start = mocker.patch.object(widget.speculative_ranker, "start")
+        widget.use_selected_guess("CRANE")
+        qtbot.keyClick(widget, Qt.Key_Return)
+        assert widget.speculation_timer.isActive()
+        widget.speculation_timer.timeout.emit()
+        start.assert_called_once_with(widget.puzzle, "CRANE")
+
+        widget.reset_game()
+        assert not widget.speculation_timer.isActive()
+
+    def test_get_best_guesses_uses_speculative_ranking(self, qtbot, mocker):
+        widget = WordleSolver()
+        qtbot.addWidget(widget)
+        mock_threadpool = mocker.patch.object(widget, "threadpool")
+        widget.use_selected_guess("CRANE")
+        qtbot.keyClick(widget, Qt.Key_Return)
+        ranked_puzzle = mocker.Mock(
+            all_answers=self.FAKE_ANSWER_POSSIBILITIES,
+            all_answers_dict={},
+            remaining_words=self.FAKE_REMAINING_WORDS,
+        )
+        take = mocker.patch.object(widget.speculative_ranker, "take", return_value=ranked_puzzle)
+        widget.get_best_guesses()
+        take.assert_called_once_with(mocker.ANY, "CRANE", "NNNNN")
+        mock_threadpool.start.assert_not_called()
+        assert widget.puzzle is ranked_puzzle
+        assert [widget.best_guess_model.word(i) for i in range(2)] == ["WORD1", "WORD2"]
+        assert widget.get_best_guess_button.isEnabled()
+
+    def test_finished_ranking_reads_rust_answers_dict(self, qtbot, mocker):
+        widget = WordleSolver()
+        qtbot.addWidget(widget)
+        answers_dict = {answer.word: answer for answer in self.FAKE_ANSWER_POSSIBILITIES}
+        # Like the Rust Puzzle, whose all_answers_dict is a method
+        widget.puzzle = mocker.Mock(
+            spec=["all_answers", "all_answers_dict", "remaining_words"],
+            all_answers=self.FAKE_ANSWER_POSSIBILITIES,
+            all_answers_dict=lambda: answers_dict,
+            remaining_words=self.FAKE_REMAINING_WORDS,
+        )
+        widget.best_guess_model.pin("WORD2")
+        widget._on_get_answer_possibilities_finished()
+        texts = [widget.best_guess_model.word(i) for i in range(widget.best_guess_model.rowCount())]
+        assert texts == [STARTING_GUESS, "WORD1", "WORD2"]
+
+    def test_make_guess_reports_interim_answers(self, qtbot, mocker):
+        widget = WordleSolver()
+        qtbot.addWidget(widget)
+        rankings = [self.FAKE_ANSWER_POSSIBILITIES[1:], self.FAKE_ANSWER_POSSIBILITIES]
+        make_guess_iter = mocker.patch.object(widget.puzzle, "make_guess_iter", return_value=iter(rankings))
+        on_interim = mocker.Mock()
+        progress = mocker.Mock()
+        widget._make_guess("CRANE", "NNNNN", on_interim, progress)
+        make_guess_iter.assert_called_once_with("CRANE", "NNNNN", limit=INTERIM_GUESS_LIMIT, progress=progress)
+        assert on_interim.call_args_list == [mocker.call(ranking) for ranking in rankings]
+
+    def test_progress_is_shown(self, qtbot, mocker):
+        widget = WordleSolver()
+        qtbot.addWidget(widget)
+        mocker.patch("octordle_solver.ui.wordle_solver_ui.time.monotonic", return_value=2.0)
+        widget._calculation_started = 0.0
+        widget._on_progress(40, 100)
+        assert widget.get_best_guess_button.text() == "Calculating best guesses... 40% (about 3 s left)"
+
+    def test_interim_answers_are_replaced(self, qtbot):
+        widget = WordleSolver()
+        qtbot.addWidget(widget)
+        widget._on_interim_answer_possibilities(self.FAKE_ANSWER_POSSIBILITIES[1:])
+        assert [widget.best_guess_model.word(i) for i in range(2)] == [STARTING_GUESS, "WORD2"]
+
+        widget.puzzle.all_answers = self.FAKE_ANSWER_POSSIBILITIES
+        widget.puzzle.remaining_words = self.FAKE_REMAINING_WORDS
+        widget._on_get_answer_possibilities_finished()
+        texts = [widget.best_guess_model.word(i) for i in range(widget.best_guess_model.rowCount())]
+        assert texts == [STARTING_GUESS, "WORD1", "WORD2"]
+
     def test_get_cached_second_guess(self, qtbot):
         widget = WordleSolver()
         qtbot.addWidget(widget)
         widget.use_selected_guess(STARTING_GUESS)
         qtbot.keyClick(widget, Qt.Key_Return)
-        widget.best_guess_list.clear()
+        widget.best_guess_model.clear()
         widget._get_cached_second_guess()
         # The cached second guess for the starting guess should be in the best guess list
-        assert widget.best_guess_list.count() == 1
-        assert widget.best_guess_list.item(0).text() == get_cached_best_second_guess([2, 2, 2, 2, 2])
+        assert widget.best_guess_model.rowCount() == 1
+        assert widget.best_guess_model.word(0) == get_cached_best_second_guess([2, 2, 2, 2, 2])
 
     def test_display_groups(self, qtbot):
         widget = WordleSolver()
@@ -183,13 +262,21 @@ class TestWordleSolverUI:
         widget.puzzle.remaining_words = self.FAKE_REMAINING_WORDS
         widget._on_get_answer_possibilities_finished()
         # Select the first item in the best guess list to display its groups
-        widget.best_guess_list.setCurrentItem(widget.best_guess_list.item(0))
-        # The groups list should now show the groups for the first answer possibility
-        assert widget.groups_tree_widget.topLevelItemCount() == 2
-        item_1 = widget.groups_tree_widget.topLevelItem(0)
-        item_widget = widget.groups_tree_widget.itemWidget(item_1, 0)
-        assert isinstance(item_widget, QtWidgets.QLabel)
-        assert item_widget.text() == style_text("SLATE", get_word_colors("YNMYN"))
+        widget.best_guess_list.setCurrentIndex(widget.best_guess_model.index(0))
+        # The groups of the selected word are counted from the remaining words
+        model = widget.groups_model
+        sizes = group_sizes("SLATE", self.FAKE_REMAINING_WORDS)
+        assert model.word == "SLATE"
+        assert model.rowCount() == len(sizes)
+        group = model.index(0, 0)
+        assert model.data(group) == "SLATE"
+        pattern = model.data(group, PATTERN_ROLE)
+        assert model.group_sizes[0] == sizes[pattern]
+        # Few words remain, so every group was expanded
+        assert [model.data(model.index(row, 0, group)) for row in range(model.rowCount(group))] == group_words(
+            "SLATE", pattern, self.FAKE_REMAINING_WORDS
+        )
+        assert widget.total_groups_label.text() == f"Total Groups: {len(sizes)}"
 
     def test_reset(self, qtbot):
         widget = WordleSolver()